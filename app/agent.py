@@ -1,8 +1,6 @@
-import yaml
 import logging
 from collections.abc import AsyncGenerator
 from typing import Literal, Optional
-from pathlib import Path
 from google.adk.agents import BaseAgent, LlmAgent, SequentialAgent
 from google.adk.agents.callback_context import CallbackContext
 from google.adk.agents.invocation_context import InvocationContext
@@ -12,9 +10,7 @@ from google.genai import types as genai_types
 from pydantic import BaseModel, Field
 
 from .config import config
-
-# --- Constants ---
-PERSONAS_DIR = Path(__file__).parent / "personas"
+from .core.data_catalog import PERSONAS_DIR, load_persona_data
 
 # --- Structured Output Models ---
 class ProblemSummary(BaseModel):
@@ -161,14 +157,9 @@ class PhaseController(BaseAgent):
 
 # --- Persona Loading Utility ---
 def load_persona_agent(persona_name: str) -> LlmAgent:
-    """Loads a persona from a YAML file and creates an LlmAgent."""
-    persona_file = PERSONAS_DIR / f"{persona_name}.yaml"
-    if not persona_file.exists():
-        raise FileNotFoundError(f"Persona file not found: {persona_file}")
-    
-    with open(persona_file, "r") as f:
-        persona_data = yaml.safe_load(f)
-    
+    """Loads a persona from the data catalog or its YAML file and creates an LlmAgent."""
+    persona_data = load_persona_data(persona_name)
+
     return LlmAgent(
         name=persona_data["name"],
         description=persona_data["description"],
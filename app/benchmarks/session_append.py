@@ -0,0 +1,116 @@
+# benchmarks/session_append.py
+# Compares session event append latency across session service backends.
+#
+# Each backend gets the same stream of events a live conversation produces:
+# runs of transcription events without state changes, each ending with a
+# turn-complete event. Latency is what the caller of append_event waits for;
+# the time to write out anything still buffered is reported separately.
+#
+# Usage:
+#   python -m app.benchmarks.session_append [--sessions 4] [--turns 20]
+#       [--events-per-turn 10] [--db-url sqlite+aiosqlite:///bench.db]
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from google.adk.events.event import Event
+from google.adk.sessions import BaseSessionService, InMemorySessionService
+from google.adk.sessions.database_session_service import DatabaseSessionService
+from google.genai import types
+
+from app.core.session_service import BatchingSessionService
+
+APP_NAME = "session-append-benchmark"
+
+
+def _event(turn: int, index: int, turn_complete: bool) -> Event:
+    return Event(
+        author="agent",
+        invocation_id=f"turn-{turn}",
+        content=types.Content(
+            role="model", parts=[types.Part(text=f"transcript chunk {index} of turn {turn}")]),
+        turn_complete=turn_complete or None,
+    )
+
+
+async def _run_session(
+    service: BaseSessionService, user_id: str, turns: int, events_per_turn: int
+) -> list[float]:
+    session = await service.create_session(app_name=APP_NAME, user_id=user_id)
+    latencies = []
+    for turn in range(turns):
+        for index in range(events_per_turn):
+            event = _event(turn, index, turn_complete=index == events_per_turn - 1)
+            started = time.perf_counter()
+            await service.append_event(session, event)
+            latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+async def benchmark(
+    name: str,
+    service: BaseSessionService,
+    sessions: int,
+    turns: int,
+    events_per_turn: int,
+) -> None:
+    started = time.perf_counter()
+    results = await asyncio.gather(*(
+        _run_session(service, f"user-{n}", turns, events_per_turn)
+        for n in range(sessions)))
+    elapsed = time.perf_counter() - started
+
+    flush_started = time.perf_counter()
+    await service.flush()
+    flush_time = time.perf_counter() - flush_started
+
+    latencies = sorted(latency for result in results for latency in result)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{name:<18} events={len(latencies):<6} "
+          f"mean={statistics.mean(latencies) * 1000:8.3f}ms "
+          f"p50={statistics.median(latencies) * 1000:8.3f}ms "
+          f"p95={p95 * 1000:8.3f}ms "
+          f"max={latencies[-1] * 1000:8.3f}ms "
+          f"total={elapsed:6.2f}s final_flush={flush_time * 1000:.1f}ms")
+
+
+async def main(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        def db_url(name: str) -> str:
+            return args.db_url or f"sqlite+aiosqlite:///{Path(tmp) / name}"
+
+        await benchmark("in-memory", InMemorySessionService(),
+                        args.sessions, args.turns, args.events_per_turn)
+
+        database = DatabaseSessionService(db_url=db_url("direct.db"))
+        await database.prepare_tables()
+        await benchmark("database", database,
+                        args.sessions, args.turns, args.events_per_turn)
+        await database.close()
+
+        batched = BatchingSessionService(
+            DatabaseSessionService(db_url=db_url("batched.db")),
+            batch_size=args.batch_size,
+            flush_interval=args.flush_interval,
+        )
+        await batched.inner.prepare_tables()
+        await benchmark("database+batching", batched,
+                        args.sessions, args.turns, args.events_per_turn)
+        await batched.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=4,
+                        help="Concurrent sessions appending events")
+    parser.add_argument("--turns", type=int, default=20, help="Turns per session")
+    parser.add_argument("--events-per-turn", type=int, default=10,
+                        help="Events per turn, the last one completing the turn")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--flush-interval", type=float, default=0.25)
+    parser.add_argument("--db-url", default=None,
+                        help="Database to benchmark instead of a temporary SQLite file")
+    asyncio.run(main(parser.parse_args()))
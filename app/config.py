@@ -1,5 +1,6 @@
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from pathlib import Path
 
 import google.auth
 
@@ -42,4 +43,107 @@ class MeetingConfiguration:
     max_conversation_turns: int = 10
 
 
-config = MeetingConfiguration() 
\ No newline at end of file
+config = MeetingConfiguration()
+
+
+@dataclass
+class StreamingConfiguration:
+    """Configuration for the live streaming WebSocket endpoint.
+
+    Attributes:
+        input_sample_rate (int): Sample rate of client microphone PCM in Hz.
+        preferred_audio_frame_ms (int): Audio frame duration advertised to clients.
+        min_audio_frame_ms (int): Shortest audio frame duration a client may request.
+        max_audio_frame_ms (int): Longest audio frame duration accepted from a client; longer frames are split.
+        outbound_high_water (int): Maximum messages queued for one client.
+        outbound_overflow_policy (str): "drop_audio" to discard the oldest queued
+            audio when the queue is full, or "disconnect" to drop the client.
+        text_coalesce_window_ms (int): How long partial text deltas are held to be
+            merged before sending; 0 sends each delta as soon as possible.
+        text_coalesce_max_bytes (int): Held partial text is sent once it reaches this size.
+        audio_log_sample_every (int): Log one in this many audio frames per session.
+        text_log_sample_every (int): Log one in this many text messages per session.
+        session_log_buffer_size (int): Recent events kept per session for debugging.
+        resume_grace_period_s (float): Seconds a live stream is kept after its client
+            disconnects, so a reconnecting client can resume it.
+        resume_replay_buffer_size (int): Recent outgoing messages kept per live stream
+            for replay to a resuming client; may not exceed outbound_high_water.
+        max_live_sessions (int): Live sessions this process runs at once.
+        max_live_sessions_per_client (int): Live sessions one client address may hold at
+            once; 0 (the default) disables the limit. There is no authenticated
+            client identity, so the limit keys on the peer address: everyone
+            behind one NAT or office proxy shares it, and a reloaded page counts
+            again while its previous stream is in its grace period. Only enable
+            it where clients have their own addresses. Behind a reverse proxy,
+            run uvicorn with --proxy-headers so the address is the client's.
+        max_admission_queue (int): Connections allowed to wait for a live session slot.
+        admission_retry_after_s (int): Retry hint in seconds sent to rejected clients.
+        session_idle_ttl_s (float): Seconds a session is kept in memory after its live
+            stream ends.
+        session_memory_budget_mb (int): Memory budget for idle sessions; least recently
+            used ones are evicted beyond it. Sessions with a live stream are not
+            counted against it.
+        session_sweep_interval_s (float): How often idle sessions are checked for expiry.
+        session_spill_dir (str): Directory evicted sessions are written to so they can
+            be reloaded; empty to discard them. Files are removed when restored.
+        session_spill_ttl_s (float): Seconds a spilled session is kept before it is
+            deleted unrestored.
+        session_service_backend (str): "memory" keeps sessions in process; "database"
+            stores them in `session_db_url` so they survive restarts and can be
+            shared by several workers. Idle eviction only applies to "memory".
+            Read from SESSION_SERVICE_BACKEND when set.
+        session_db_url (str): SQLAlchemy async URL of the session database. Read
+            from SESSION_DB_URL when set.
+        session_db_pool_size (int): Database connections kept open per worker.
+        session_db_max_overflow (int): Extra connections allowed under load.
+        session_db_pool_recycle_s (int): Seconds after which a pooled connection is
+            replaced.
+        session_event_batch_size (int): Queued session events that trigger a database
+            write.
+        session_event_flush_interval_s (float): Longest time a session event is
+            queued before it is written.
+    """
+
+    input_sample_rate: int = 16000
+    preferred_audio_frame_ms: int = 40
+    min_audio_frame_ms: int = 20
+    max_audio_frame_ms: int = 100
+    outbound_high_water: int = 256
+    outbound_overflow_policy: str = "drop_audio"
+    text_coalesce_window_ms: int = 30
+    text_coalesce_max_bytes: int = 256
+    audio_log_sample_every: int = 100
+    text_log_sample_every: int = 20
+    session_log_buffer_size: int = 200
+    resume_grace_period_s: float = 30.0
+    resume_replay_buffer_size: int = 256
+    max_live_sessions: int = 100
+    max_live_sessions_per_client: int = 0
+    max_admission_queue: int = 50
+    admission_retry_after_s: int = 30
+    session_idle_ttl_s: float = 1800.0
+    session_memory_budget_mb: int = 256
+    session_sweep_interval_s: float = 60.0
+    session_spill_dir: str = str(Path(__file__).parent / "sessions" / "spill")
+    session_spill_ttl_s: float = 7 * 24 * 3600.0
+    session_service_backend: str = field(
+        default_factory=lambda: os.environ.get("SESSION_SERVICE_BACKEND", "memory"))
+    session_db_url: str = field(default_factory=lambda: os.environ.get(
+        "SESSION_DB_URL",
+        f"sqlite+aiosqlite:///{Path(__file__).parent / 'sessions' / 'adk_sessions.db'}"))
+    session_db_pool_size: int = 5
+    session_db_max_overflow: int = 10
+    session_db_pool_recycle_s: int = 1800
+    session_event_batch_size: int = 32
+    session_event_flush_interval_s: float = 0.25
+
+    def __post_init__(self):
+        # A resuming client's whole replay is queued at once; a larger buffer
+        # would overflow the new connection's queue before it could drain
+        if self.resume_replay_buffer_size > self.outbound_high_water:
+            raise ValueError(
+                f"resume_replay_buffer_size ({self.resume_replay_buffer_size}) "
+                f"exceeds outbound_high_water ({self.outbound_high_water})")
+
+
+streaming_config = StreamingConfiguration()
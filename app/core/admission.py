@@ -0,0 +1,136 @@
+# core/admission.py
+# Admission control for live streaming sessions.
+#
+# Caps how many run_live sessions this process runs at once, overall and per
+# client. Connections beyond the process cap wait in a first-come, first-served
+# queue and are told their position; when the queue is full they are turned
+# away immediately with a retry-after hint.
+import asyncio
+from collections import defaultdict, deque
+from typing import Awaitable, Callable
+
+
+class AdmissionRejected(Exception):
+    """Raised when a live session cannot be admitted."""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(f"Live session rejected: {reason}")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class _Waiter:
+    def __init__(self, client_id: str):
+        self.client_id = client_id
+        self.admitted = False
+        self.changed = asyncio.Event()
+
+
+class AdmissionController:
+    """
+    Per-process and per-client limits on concurrent live sessions.
+
+    Every successful acquire() must be paired with a release() for the same
+    client once the live session has been torn down.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int,
+        max_sessions_per_client: int,
+        max_waiting: int,
+        retry_after: int = 30,
+    ):
+        """
+        Args:
+            max_sessions: Live sessions allowed at once in this process.
+            max_sessions_per_client: Live sessions allowed at once per client;
+                0 for no per-client limit.
+            max_waiting: Connections allowed to wait for a slot.
+            retry_after: Seconds suggested to rejected clients before retrying.
+        """
+        self._max_sessions = max_sessions
+        self._max_sessions_per_client = max_sessions_per_client
+        self._max_waiting = max_waiting
+        self._retry_after = retry_after
+        self._active = 0
+        self._active_by_client: dict[str, int] = defaultdict(int)
+        self._waiting: deque[_Waiter] = deque()
+
+    @property
+    def active(self) -> int:
+        """Number of admitted live sessions."""
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        """Number of connections waiting for a slot."""
+        return len(self._waiting)
+
+    async def acquire(
+        self,
+        client_id: str,
+        on_position: Callable[[int], Awaitable] | None = None,
+    ) -> None:
+        """
+        Waits for a live session slot for `client_id`.
+
+        Args:
+            client_id: Server-derived identity of the connecting client.
+            on_position: Optional coroutine function called with the 1-based
+                queue position whenever it changes while waiting.
+
+        Raises:
+            AdmissionRejected: If the client is at its limit or the queue is full.
+        """
+        if self._max_sessions_per_client:
+            pending = self._active_by_client[client_id] + sum(
+                1 for waiter in self._waiting if waiter.client_id == client_id)
+            if pending >= self._max_sessions_per_client:
+                raise AdmissionRejected("client_limit", self._retry_after)
+
+        if self._active < self._max_sessions and not self._waiting:
+            self._admit(client_id)
+            return
+
+        if len(self._waiting) >= self._max_waiting:
+            raise AdmissionRejected("queue_full", self._retry_after)
+
+        waiter = _Waiter(client_id)
+        self._waiting.append(waiter)
+        try:
+            while not waiter.admitted:
+                waiter.changed.clear()
+                if on_position is not None:
+                    await on_position(self._waiting.index(waiter) + 1)
+                if not waiter.admitted:
+                    await waiter.changed.wait()
+        except BaseException:
+            if waiter.admitted:
+                self.release(client_id)
+            else:
+                self._waiting.remove(waiter)
+                self._notify_waiters()
+            raise
+
+    def release(self, client_id: str) -> None:
+        """Frees the slot held by one of `client_id`'s live sessions."""
+        self._active -= 1
+        self._active_by_client[client_id] -= 1
+        if not self._active_by_client[client_id]:
+            del self._active_by_client[client_id]
+
+        while self._waiting and self._active < self._max_sessions:
+            waiter = self._waiting.popleft()
+            self._admit(waiter.client_id)
+            waiter.admitted = True
+            waiter.changed.set()
+        self._notify_waiters()
+
+    def _admit(self, client_id: str) -> None:
+        self._active += 1
+        self._active_by_client[client_id] += 1
+
+    def _notify_waiters(self) -> None:
+        for waiter in self._waiting:
+            waiter.changed.set()
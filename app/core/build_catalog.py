@@ -0,0 +1,49 @@
+# core/build_catalog.py
+# Command line for the precompiled data catalog (see core/data_catalog.py).
+#
+# Kept out of data_catalog itself: the app's import chain already loads that
+# module, and running it with -m would execute a second copy of it.
+#
+# Usage:
+#   python -m app.core.build_catalog build [--output PATH]
+#   python -m app.core.build_catalog check [--output PATH]
+import argparse
+import sys
+from pathlib import Path
+
+from app.core.data_catalog import CATALOG_PATH, CatalogError, build_catalog, load_catalog
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.core.build_catalog",
+        description="Compile personas, the question bank and interview configuration into one artifact.")
+    parser.add_argument("command", choices=("build", "check"),
+                        help="build: compile the artifact; check: report whether it is current")
+    parser.add_argument("--output", type=Path, default=CATALOG_PATH,
+                        help=f"Artifact path (default: {CATALOG_PATH})")
+    args = parser.parse_args(argv)
+
+    if args.command == "check":
+        if load_catalog(args.output) is None:
+            print(f"{args.output}: missing or stale")
+            return 1
+        print(f"{args.output}: current")
+        return 0
+
+    try:
+        catalog = build_catalog(args.output)
+    except CatalogError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    for problem in catalog["question_bank_problems"]:
+        print(f"Question bank: {problem}")
+    question_count = sum(len(questions) for categories in catalog["question_bank"].values()
+                         for questions in categories.values())
+    print(f"Wrote {args.output}: {len(catalog['personas'])} personas, "
+          f"{question_count} questions, {len(catalog['sources'])} source files")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
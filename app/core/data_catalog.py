@@ -0,0 +1,232 @@
+# core/data_catalog.py
+# Compiles the app's static data into one versioned artifact.
+#
+# Personas (personas/*.yaml), the interview question bank and the interview
+# configuration (interview types, job roles, feedback criteria) are parsed,
+# validated and pickled together by a build step:
+#
+#   python -m app.core.build_catalog build
+#
+# At startup the artifact is unpickled in one read instead of parsing YAML
+# and JSON file by file. It records the size and content hash of every source
+# file, keyed by its path within the app, and is ignored whenever a source has
+# changed, been added or been removed since the build, in which case callers
+# fall back to the source files. Keys and hashes do not depend on where the app
+# is installed or on file times, so an artifact built in CI or another checkout
+# stays valid when deployed.
+#
+# The artifact is trusted build output: only load catalogs this app built.
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+APP_DIR = Path(__file__).parent.parent
+PERSONAS_DIR = APP_DIR / "personas"
+INTERVIEW_DATA_DIR = APP_DIR / "interview_agent" / "data"
+QUESTION_BANK_PATH = INTERVIEW_DATA_DIR / "question_bank.json"
+INTERVIEW_CONFIG_PATH = INTERVIEW_DATA_DIR / "interview_config.json"
+CATALOG_PATH = Path(os.environ.get("DATA_CATALOG_PATH", APP_DIR / "data_catalog.pickle"))
+
+# Bump when the layout of the compiled catalog or the validation rules change
+CATALOG_FORMAT_VERSION = 3
+
+PERSONA_FIELDS = ("name", "description", "instruction")
+INTERVIEW_CONFIG_SECTIONS = ("interview_types", "job_roles", "feedback_criteria")
+
+_lock = threading.Lock()
+_catalog: dict[str, Any] | None = None
+_catalog_key: tuple | None = None
+# Content hashes by source path, reused while the file's mtime and size are unchanged
+_source_hashes: dict[Path, tuple[int, int, str]] = {}
+
+
+class CatalogError(Exception):
+    """Raised when the static data cannot be compiled."""
+
+
+def source_files() -> list[Path]:
+    """Every file compiled into the catalog."""
+    return sorted(PERSONAS_DIR.glob("*.yaml")) + [QUESTION_BANK_PATH, INTERVIEW_CONFIG_PATH]
+
+
+def _content_hash(path: Path, stat: os.stat_result) -> str:
+    cached = _source_hashes.get(path)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+    with open(path, "rb") as f:
+        digest = hashlib.sha1(f.read()).hexdigest()
+    _source_hashes[path] = (stat.st_mtime_ns, stat.st_size, digest)
+    return digest
+
+
+def _fingerprint() -> dict[str, tuple[int, str]]:
+    sources = {}
+    for path in source_files():
+        try:
+            stat = path.stat()
+            digest = _content_hash(path, stat)
+        except FileNotFoundError:
+            continue
+        sources[path.relative_to(APP_DIR).as_posix()] = (stat.st_size, digest)
+    return sources
+
+
+def _read_persona(path: Path) -> dict[str, Any]:
+    import yaml
+
+    with open(path, "r") as f:
+        data = yaml.safe_load(f)
+    if not isinstance(data, dict):
+        raise CatalogError(f"{path.name}: expected a mapping")
+    missing = [field for field in PERSONA_FIELDS if not data.get(field)]
+    if missing:
+        raise CatalogError(f"{path.name}: missing {', '.join(missing)}")
+    return data
+
+
+def _read_interview_config(path: Path) -> dict[str, Any]:
+    with open(path, "r") as f:
+        config = json.load(f)
+    for section in INTERVIEW_CONFIG_SECTIONS:
+        if not isinstance(config.get(section), dict):
+            raise CatalogError(f"{path.name}: missing {section}")
+    for name, criterion in config["feedback_criteria"].items():
+        weight = criterion.get("weight") if isinstance(criterion, dict) else None
+        if not isinstance(weight, (int, float)):
+            raise CatalogError(f"{path.name}: feedback criterion {name} has no weight")
+    return config
+
+
+def compile_catalog() -> dict[str, Any]:
+    """
+    Parses and validates all static data.
+
+    Returns:
+        The catalog: personas by file stem, the normalized question bank with
+        its validation problems, the interview configuration, and the source
+        fingerprint it was compiled from.
+
+    Raises:
+        CatalogError: If a source file is missing or invalid.
+    """
+    from app.interview_agent.utils.question_bank import validate_question_bank
+
+    # Taken before parsing, so edits made during the build make it stale
+    sources = _fingerprint()
+    try:
+        personas = {path.stem: _read_persona(path) for path in sorted(PERSONAS_DIR.glob("*.yaml"))}
+        with open(QUESTION_BANK_PATH, "r") as f:
+            question_bank, problems = validate_question_bank(json.load(f))
+        interview_config = _read_interview_config(INTERVIEW_CONFIG_PATH)
+    except (OSError, ValueError) as e:
+        raise CatalogError(str(e)) from e
+
+    return {
+        "format_version": CATALOG_FORMAT_VERSION,
+        "built_at": time.time(),
+        "sources": sources,
+        "personas": personas,
+        "question_bank": question_bank,
+        "question_bank_problems": problems,
+        "interview_config": interview_config,
+    }
+
+
+def build_catalog(path: Path = CATALOG_PATH) -> dict[str, Any]:
+    """
+    Compiles the catalog and writes it to `path`, replacing any previous build atomically.
+
+    Returns:
+        The compiled catalog.
+    """
+    catalog = compile_catalog()
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        pickle.dump(catalog, f, protocol=pickle.HIGHEST_PROTOCOL)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return catalog
+
+
+def load_catalog(path: Path = CATALOG_PATH) -> dict[str, Any] | None:
+    """
+    Returns the compiled catalog if it is current.
+
+    The artifact is read once and kept; later calls only stat the source
+    files to confirm none changed.
+
+    Returns:
+        The catalog, or None if it is missing, unreadable, from another
+        format version, or stale.
+    """
+    global _catalog, _catalog_key
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    with _lock:
+        if _catalog_key != key:
+            try:
+                with open(path, "rb") as f:
+                    catalog = pickle.load(f)
+            except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+                return None
+            _catalog, _catalog_key = catalog, key
+        catalog = _catalog
+
+    if not isinstance(catalog, dict) or catalog.get("format_version") != CATALOG_FORMAT_VERSION:
+        return None
+    if catalog.get("sources") != _fingerprint():
+        return None
+    return catalog
+
+
+def load_persona_data(persona_name: str) -> dict[str, Any]:
+    """
+    Returns a persona's data from the catalog, or from its YAML file if the catalog is not current.
+
+    Raises:
+        FileNotFoundError: If there is no such persona.
+    """
+    catalog = load_catalog()
+    if catalog is not None and persona_name in catalog["personas"]:
+        return catalog["personas"][persona_name]
+
+    persona_file = PERSONAS_DIR / f"{persona_name}.yaml"
+    if not persona_file.exists():
+        raise FileNotFoundError(f"Persona file not found: {persona_file}")
+    import yaml
+
+    with open(persona_file, "r") as f:
+        return yaml.safe_load(f)
+
+
+def compiled_question_bank(path: Path) -> tuple[dict, list[str]] | None:
+    """
+    The validated question bank from the catalog, if it was compiled from `path` and is current.
+
+    Returns:
+        The normalized bank and its validation problems, or None.
+    """
+    catalog = load_catalog()
+    if catalog is None or str(Path(path).resolve()) != str(QUESTION_BANK_PATH.resolve()):
+        return None
+    return catalog["question_bank"], catalog["question_bank_problems"]
+
+
+def compiled_interview_config(path: Path) -> dict[str, Any] | None:
+    """The interview configuration from the catalog, if compiled from `path` and current."""
+    catalog = load_catalog()
+    if catalog is None or str(Path(path).resolve()) != str(INTERVIEW_CONFIG_PATH.resolve()):
+        return None
+    return catalog["interview_config"]
@@ -0,0 +1,272 @@
+# core/live_session.py
+# Live sessions that survive WebSocket reconnects.
+#
+# A LiveSession owns the run_live event stream and its LiveRequestQueue. It
+# numbers every outgoing message and keeps the most recent ones in a replay
+# buffer, so a client that drops its connection can reconnect within a grace
+# period, reattach to the same upstream live connection and receive only the
+# messages it missed.
+#
+# Closing a LiveSession is the single teardown path: it records why the
+# session ended, closes the LiveRequestQueue and the upstream event stream,
+# stops the pump and hands the ADK session back for release.
+import asyncio
+from collections import deque
+from typing import AsyncGenerator, Awaitable, Callable
+
+from google.adk.agents import LiveRequestQueue
+from google.adk.sessions import Session
+
+from .outbound_queue import AUDIO, CONTROL, TEXT, OutboundQueue, SlowConsumerError
+from .stream_logging import SessionLog
+
+
+class LiveSessionClosed(Exception):
+    """Raised to an attached connection when its live session ends."""
+
+
+class LiveSession:
+    """
+    One run_live stream plus the state needed to resume it.
+
+    The agent-to-client pump writes into the LiveSession through the same
+    put_* methods as an OutboundQueue; the LiveSession assigns sequence
+    numbers, records the message for replay and forwards it to whichever
+    connection is currently attached.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        client_id: str,
+        session: Session,
+        live_events: AsyncGenerator,
+        live_request_queue: LiveRequestQueue,
+        is_audio: bool,
+        session_log: SessionLog,
+        replay_size: int = 256,
+        grace_period: float = 30.0,
+    ):
+        """
+        Args:
+            session_id: Client-facing session id.
+            client_id: Client the live session was admitted for.
+            session: ADK session the stream runs in.
+            live_events: Event stream returned by run_live.
+            live_request_queue: Queue feeding client input into run_live.
+            is_audio: Response modality the stream was started with.
+            session_log: Structured log for this session.
+            replay_size: Number of recent messages kept for replay; at most
+                the outbound queue's high-water mark, so a full replay fits.
+            grace_period: Seconds the stream is kept alive without a client.
+        """
+        self.session_id = session_id
+        self.client_id = client_id
+        self.session = session
+        self.live_events = live_events
+        self.live_request_queue = live_request_queue
+        self.is_audio = is_audio
+        self.session_log = session_log
+        self.sequence = 0
+        self.closed = False
+        self.close_reason: str | None = None
+        self._replay: deque[tuple[int, str, dict | bytes]] = deque(maxlen=replay_size)
+        self._grace_period = grace_period
+        self._outbound: OutboundQueue | None = None
+        self._pump_task: asyncio.Task | None = None
+        self._expiry: asyncio.TimerHandle | None = None
+        self._teardown_task: asyncio.Task | None = None
+        self._on_close: Callable[["LiveSession"], Awaitable] | None = None
+
+    def start(
+        self,
+        pump: Awaitable,
+        on_close: Callable[["LiveSession"], Awaitable] | None = None,
+    ) -> None:
+        """
+        Starts consuming the live event stream.
+
+        Args:
+            pump: Coroutine that reads run_live events and writes them into this session.
+            on_close: Optional coroutine function awaited with this session during teardown.
+        """
+        self._on_close = on_close
+        self._pump_task = asyncio.create_task(pump)
+        self._pump_task.add_done_callback(self._pump_done)
+
+    def _pump_done(self, task: asyncio.Task) -> None:
+        # The stream ending (or failing) ends the live session
+        if task.cancelled():
+            self.close("cancelled")
+        elif task.exception() is not None:
+            self.close("stream_error")
+        else:
+            self.close("stream_ended")
+
+    def attach(self, outbound: OutboundQueue, resume_from: int | None = None) -> int:
+        """
+        Makes `outbound` the destination for new messages.
+
+        Args:
+            outbound: Queue of the newly connected client.
+            resume_from: Last sequence number the client received, if resuming.
+
+        If the replay overflows `outbound`, the client is not attached and
+        the grace period keeps running, so an abandoned session still expires.
+
+        Returns:
+            The number of buffered messages replayed to the client.
+        """
+        replayed = 0
+        if resume_from is not None:
+            for sequence, kind, message in self._replay:
+                if sequence > resume_from:
+                    self._deliver(outbound, sequence, kind, message)
+                    replayed += 1
+                    if outbound.failed:
+                        break
+
+        if outbound.failed:
+            self._start_grace_period()
+            return replayed
+
+        if self._expiry is not None:
+            self._expiry.cancel()
+            self._expiry = None
+        self._outbound = outbound
+        return replayed
+
+    def detach(self, outbound: OutboundQueue) -> None:
+        """Detaches a disconnected client and starts the grace period."""
+        if self._outbound is not outbound:
+            # A newer connection has already taken over
+            return
+        self._outbound = None
+        self._start_grace_period()
+
+    def _start_grace_period(self) -> None:
+        if self.closed or self._outbound is not None or self._expiry is not None:
+            return
+        loop = asyncio.get_running_loop()
+        self._expiry = loop.call_later(
+            self._grace_period, self.close, "grace_expired")
+
+    def close(self, reason: str) -> None:
+        """
+        Ends the live session and starts its teardown.
+
+        Safe to call more than once; only the first reason is recorded.
+
+        Args:
+            reason: Why the session ended, e.g. "grace_expired" or "stream_ended".
+        """
+        if self.closed:
+            return
+        self.closed = True
+        self.close_reason = reason
+        if self._expiry is not None:
+            self._expiry.cancel()
+            self._expiry = None
+        # Signal run_live to close the upstream live connection
+        self.live_request_queue.close()
+        if self._outbound is not None:
+            self._outbound.fail(LiveSessionClosed(self.session_id))
+            self._outbound = None
+        self._teardown_task = asyncio.create_task(self._teardown())
+
+    async def wait_closed(self) -> None:
+        """Waits until teardown started by close() has finished."""
+        if self._teardown_task is not None:
+            await self._teardown_task
+
+    async def _teardown(self) -> None:
+        pump_task = self._pump_task
+        if pump_task is not None and not pump_task.done():
+            pump_task.cancel()
+            await asyncio.gather(pump_task, return_exceptions=True)
+        try:
+            await self.live_events.aclose()
+        except Exception:
+            self.session_log.error("closing live event stream failed")
+        if self._on_close is not None:
+            try:
+                await self._on_close(self)
+            except Exception:
+                self.session_log.error("releasing live session failed")
+        self.session_log.info(
+            "live session closed", reason=self.close_reason, **self.session_log.summary())
+
+    def put_control(self, message: dict) -> None:
+        """Records and forwards a control message."""
+        self._record(CONTROL, message)
+
+    def put_text(self, message: dict) -> None:
+        """Records and forwards a partial text message."""
+        self._record(TEXT, message)
+
+    def put_audio(self, audio_data: bytes) -> None:
+        """Records and forwards a PCM chunk."""
+        self._record(AUDIO, audio_data)
+
+    def drop_audio(self) -> None:
+        """Discards audio that has not reached the client yet, e.g. on interruption."""
+        kept = [entry for entry in self._replay if entry[1] != AUDIO]
+        self._replay.clear()
+        self._replay.extend(kept)
+        if self._outbound is not None:
+            self._outbound.drop_audio()
+
+    def _record(self, kind: str, message: dict | bytes) -> None:
+        self.sequence += 1
+        self._replay.append((self.sequence, kind, message))
+        if self._outbound is not None:
+            self._deliver(self._outbound, self.sequence, kind, message)
+
+    def _deliver(
+        self, outbound: OutboundQueue, sequence: int, kind: str, message: dict | bytes
+    ) -> None:
+        try:
+            if kind == AUDIO:
+                outbound.put_audio(message, sequence)
+            elif kind == TEXT:
+                outbound.put_text({**message, "seq": sequence})
+            else:
+                outbound.put_control({**message, "seq": sequence})
+        except SlowConsumerError as e:
+            # Drop the slow client; it can reconnect and resume from the buffer
+            outbound.fail(e)
+            self.detach(outbound)
+
+
+class LiveSessionRegistry:
+    """Live sessions of this process, keyed by client session id."""
+
+    def __init__(self):
+        self._sessions: dict[str, LiveSession] = {}
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get(self, session_id: str) -> LiveSession | None:
+        """Returns the open live session for `session_id`, if any."""
+        live_session = self._sessions.get(session_id)
+        if live_session is not None and live_session.closed:
+            return None
+        return live_session
+
+    def add(self, live_session: LiveSession) -> None:
+        """Registers a live session, replacing any previous one with the same id."""
+        self._sessions[live_session.session_id] = live_session
+
+    def remove(self, live_session: LiveSession) -> None:
+        """Unregisters a live session if it is still the registered one."""
+        if self._sessions.get(live_session.session_id) is live_session:
+            del self._sessions[live_session.session_id]
+
+    async def close_all(self, reason: str) -> None:
+        """Closes every registered live session and waits for their teardown."""
+        live_sessions = list(self._sessions.values())
+        for live_session in live_sessions:
+            live_session.close(reason)
+        await asyncio.gather(
+            *(live_session.wait_closed() for live_session in live_sessions))
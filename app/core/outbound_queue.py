@@ -0,0 +1,193 @@
+# core/outbound_queue.py
+# Bounded per-connection send queue for the /ws/{session_id} endpoint.
+#
+# The agent side enqueues without awaiting the network, and a dedicated writer
+# task drains the queue into the WebSocket. A slow client therefore fills its
+# own queue instead of stalling consumption of the live event stream.
+#
+# Partial text is also held back for a short window so that the many small
+# deltas of a streaming response go out as a few larger messages.
+import asyncio
+import base64
+import json
+from collections import deque
+
+from fastapi import WebSocket
+
+from .ws_protocol import DIRECTION_AGENT_TO_CLIENT, encode_frame
+
+CONTROL = "control"
+TEXT = "text"
+AUDIO = "audio"
+
+OVERFLOW_DROP_AUDIO = "drop_audio"
+OVERFLOW_DISCONNECT = "disconnect"
+
+
+class SlowConsumerError(Exception):
+    """Raised when a client cannot keep up and the queue may not grow further."""
+
+
+class OutboundQueue:
+    """
+    Bounded queue of messages waiting to be written to one WebSocket.
+
+    Items are JSON-serializable dicts (sent as text frames) or bytes (sent as
+    binary frames). Every message carries the live session's sequence number,
+    as a "seq" field in JSON or in the binary frame header. Consecutive partial text messages from the same role are
+    merged while they wait, and a lone trailing text message is held for up to
+    text_window_ms (or until it reaches text_window_bytes) to collect more
+    deltas. The first text of a turn is never held, so time to first token is
+    unaffected, and any later message, such as turn_complete, releases held
+    text at once.
+    Queued audio is dropped on interruption, and the overflow policy decides
+    what happens at the high-water mark.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        binary_audio: bool = False,
+        high_water: int = 256,
+        overflow_policy: str = OVERFLOW_DROP_AUDIO,
+        text_window_ms: int = 30,
+        text_window_bytes: int = 256,
+    ):
+        """
+        Args:
+            websocket: The accepted WebSocket to write to.
+            binary_audio: Send audio as binary frames instead of base64 JSON.
+            high_water: Maximum number of queued messages.
+            overflow_policy: OVERFLOW_DROP_AUDIO to discard the oldest queued
+                audio when full, or OVERFLOW_DISCONNECT to give up on the client.
+            text_window_ms: How long to hold partial text for coalescing; 0 disables it.
+            text_window_bytes: Held text is released once it reaches this size.
+        """
+        if overflow_policy not in (OVERFLOW_DROP_AUDIO, OVERFLOW_DISCONNECT):
+            raise ValueError(f"Unknown overflow policy: {overflow_policy}")
+
+        self._websocket = websocket
+        self._binary_audio = binary_audio
+        self._error: Exception | None = None
+        self._high_water = high_water
+        self._overflow_policy = overflow_policy
+        self._text_window = text_window_ms / 1000
+        self._text_window_bytes = text_window_bytes
+        self._items: deque[list] = deque()
+        self._ready = asyncio.Event()
+        # Set once text has been sent in the current turn
+        self._hold_text = False
+        self.dropped_audio = 0
+        self.coalesced_text = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def put_control(self, message: dict) -> None:
+        """Queues a control message such as turn_complete or interrupted."""
+        self._push(CONTROL, message)
+
+    def put_text(self, message: dict) -> None:
+        """Queues a partial text message, merging it into a waiting one if possible."""
+        if self._items:
+            kind, queued, _ = self._items[-1]
+            if kind == TEXT and queued.get("role") == message.get("role"):
+                queued["data"] += message["data"]
+                # The merged message acknowledges the latest delta
+                queued["seq"] = message.get("seq")
+                self.coalesced_text += 1
+                # Let the writer re-check the size window
+                self._ready.set()
+                return
+        self._push(TEXT, message)
+
+    def put_audio(self, audio_data: bytes, sequence: int) -> None:
+        """Queues a PCM chunk, encoded for the connection's audio wire format."""
+        if self._binary_audio:
+            message = encode_frame(
+                DIRECTION_AGENT_TO_CLIENT, "audio/pcm", sequence, audio_data)
+        else:
+            message = {
+                "mime_type": "audio/pcm",
+                "data": base64.b64encode(audio_data).decode("ascii"),
+                "role": "model",
+                "seq": sequence,
+            }
+        self._push(AUDIO, message)
+
+    def drop_audio(self) -> int:
+        """
+        Discards all queued audio, e.g. after the model was interrupted.
+
+        Returns:
+            The number of audio messages dropped.
+        """
+        kept = deque(item for item in self._items if item[0] != AUDIO)
+        dropped = len(self._items) - len(kept)
+        self._items = kept
+        self.dropped_audio += dropped
+        return dropped
+
+    @property
+    def failed(self) -> bool:
+        """True once fail() has been called."""
+        return self._error is not None
+
+    def fail(self, error: Exception) -> None:
+        """Stops the writer loop, which raises `error` to its awaiter."""
+        self._error = error
+        self._ready.set()
+
+    def _push(self, kind: str, message: dict | bytes) -> None:
+        if len(self._items) >= self._high_water:
+            self._make_room()
+        self._items.append(
+            [kind, message, asyncio.get_running_loop().time()])
+        self._ready.set()
+
+    def _make_room(self) -> None:
+        if self._overflow_policy == OVERFLOW_DROP_AUDIO:
+            for index, (kind, _, _) in enumerate(self._items):
+                if kind == AUDIO:
+                    del self._items[index]
+                    self.dropped_audio += 1
+                    return
+        raise SlowConsumerError(
+            f"Outbound queue reached its high-water mark of {self._high_water} messages")
+
+    def _text_hold_time(self) -> float:
+        """Returns how much longer the head of the queue should be held, in seconds."""
+        if not self._hold_text or not self._text_window or len(self._items) != 1:
+            return 0
+        kind, message, queued_at = self._items[0]
+        if kind != TEXT or len(message["data"].encode()) >= self._text_window_bytes:
+            return 0
+        return queued_at + self._text_window - asyncio.get_running_loop().time()
+
+    async def run(self) -> None:
+        """Writer loop: sends queued messages until cancelled or the socket fails."""
+        while True:
+            while not self._items and self._error is None:
+                self._ready.clear()
+                await self._ready.wait()
+            if self._error is not None:
+                raise self._error
+
+            # Give a lone partial text message a moment to collect more deltas
+            hold_time = self._text_hold_time()
+            if hold_time > 0:
+                self._ready.clear()
+                try:
+                    await asyncio.wait_for(self._ready.wait(), hold_time)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            kind, message, _ = self._items.popleft()
+            if kind != AUDIO:
+                # Text sent: hold further deltas. Control sent: new turn.
+                self._hold_text = kind == TEXT
+            if isinstance(message, bytes):
+                await self._websocket.send_bytes(message)
+            else:
+                await self._websocket.send_text(json.dumps(message))
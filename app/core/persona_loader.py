@@ -1,11 +1,10 @@
 
 # core/persona_loader.py
-# This utility will load persona data from YAML/JSON files. 
-import yaml
+# This utility will load persona data from YAML/JSON files, or from the
+# precompiled data catalog when it is current.
 from google.adk.agents import LlmAgent
-from pathlib import Path
 
-PERSONAS_DIR = Path(__file__).parent.parent / "personas"
+from .data_catalog import load_persona_data
 
 def load_persona_agent(persona_name: str) -> LlmAgent:
     """
@@ -17,12 +16,7 @@ def load_persona_agent(persona_name: str) -> LlmAgent:
     Returns:
         An LlmAgent instance configured with the persona's details.
     """
-    persona_file = PERSONAS_DIR / f"{persona_name}.yaml"
-    if not persona_file.exists():
-        raise FileNotFoundError(f"Persona file not found: {persona_file}")
-
-    with open(persona_file, "r") as f:
-        persona_data = yaml.safe_load(f)
+    persona_data = load_persona_data(persona_name)
 
     return LlmAgent(
         name=persona_data["name"],
@@ -1,3 +1,325 @@
-
 # core/session_manager.py
-# This utility will manage the ADK SessionService. 
\ No newline at end of file
+# This utility manages the ADK SessionService for live streaming sessions.
+#
+# The Runner and RunConfig objects are built once per process and shared by
+# every connection, so connecting only costs creating or reloading a session.
+#
+# Sessions whose live stream has ended stay in the session service so a
+# returning user keeps their context, but a SessionEvictor bounds how long
+# and how much of that idle history stays in memory, spilling evicted
+# sessions to disk so they can still be reloaded.
+import asyncio
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.run_config import RunConfig
+from google.adk.runners import Runner
+from google.adk.sessions import BaseSessionService, Session
+from google.genai import types
+
+SessionKey = tuple[str, str, str]
+
+
+class SessionEvictor:
+    """
+    Idle-TTL, memory-budget and LRU eviction for sessions not in live use.
+
+    Sessions are tracked from the moment their live stream ends until they
+    are reused or evicted. Eviction removes the session from the session
+    service, after writing it to `spill_dir` when one is configured. Spilled
+    sessions are deleted once restored, or after `spill_ttl` seconds.
+    """
+
+    def __init__(
+        self,
+        session_service: BaseSessionService,
+        idle_ttl: float,
+        memory_budget_bytes: int,
+        spill_dir: Path | None = None,
+        spill_ttl: float | None = None,
+    ):
+        """
+        Args:
+            session_service: Service holding the sessions.
+            idle_ttl: Seconds an idle session is kept before eviction.
+            memory_budget_bytes: Upper bound on the serialized size of idle
+                sessions; least recently used ones are evicted beyond it.
+                Sessions with a live stream are not counted.
+            spill_dir: Directory evicted sessions are written to; None discards them.
+                The directory should be used for nothing else.
+            spill_ttl: Seconds a spilled session is kept; None keeps it until restored.
+        """
+        self._session_service = session_service
+        self._idle_ttl = idle_ttl
+        self._memory_budget_bytes = memory_budget_bytes
+        self._spill_dir = spill_dir
+        self._spill_ttl = spill_ttl
+        # Least recently used first: key -> (idle since, serialized size)
+        self._idle: OrderedDict[SessionKey, tuple[float, int]] = OrderedDict()
+        self._idle_bytes = 0
+        # Sessions being evicted, and those of them taken back into use meanwhile
+        self._evicting: set[SessionKey] = set()
+        self._reacquired: set[SessionKey] = set()
+
+    @property
+    def idle_bytes(self) -> int:
+        """Serialized size of all tracked idle sessions."""
+        return self._idle_bytes
+
+    def mark_active(self, app_name: str, user_id: str, session_id: str) -> None:
+        """Stops tracking a session that is back in live use, cancelling its eviction if under way."""
+        key = (app_name, user_id, session_id)
+        _, size = self._idle.pop(key, (0, 0))
+        self._idle_bytes -= size
+        if key in self._evicting:
+            self._reacquired.add(key)
+
+    async def mark_idle(self, session: Session) -> None:
+        """Starts tracking a session whose live stream has ended."""
+        key = (session.app_name, session.user_id, session.id)
+        self.mark_active(*key)
+        stored = await self._session_service.get_session(
+            app_name=session.app_name, user_id=session.user_id, session_id=session.id)
+        if stored is None:
+            return
+        size = len(stored.model_dump_json())
+        self._idle[key] = (time.monotonic(), size)
+        self._idle_bytes += size
+        await self.enforce_budget()
+
+    async def enforce_budget(self) -> None:
+        """Evicts least recently used idle sessions until within the memory budget."""
+        while self._idle and self._idle_bytes > self._memory_budget_bytes:
+            await self._evict(next(iter(self._idle)))
+
+    async def evict_expired(self) -> int:
+        """
+        Evicts sessions idle for longer than the TTL.
+
+        Returns:
+            The number of sessions evicted.
+        """
+        cutoff = time.monotonic() - self._idle_ttl
+        expired = [key for key, (idle_since, _) in self._idle.items()
+                   if idle_since <= cutoff]
+        for key in expired:
+            await self._evict(key)
+        return len(expired)
+
+    async def delete_expired_spills(self) -> int:
+        """
+        Deletes spilled sessions older than the spill TTL.
+
+        Returns:
+            The number of spill files deleted.
+        """
+        if self._spill_dir is None or self._spill_ttl is None:
+            return 0
+        return await asyncio.to_thread(
+            self._delete_spills_before, time.time() - self._spill_ttl)
+
+    async def run(self, interval: float) -> None:
+        """Sweeps for expired sessions and spills every `interval` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            await self.evict_expired()
+            await self.delete_expired_spills()
+
+    async def restore(self, app_name: str, user_id: str, session_id: str) -> Session | None:
+        """
+        Reloads a session that was spilled to disk.
+
+        Returns:
+            The restored session, or None if no spilled copy exists.
+        """
+        path = self._spill_path(session_id)
+        if path is None or not path.exists():
+            return None
+
+        spilled = Session.model_validate_json(await asyncio.to_thread(path.read_text))
+        if (spilled.app_name, spilled.user_id) != (app_name, user_id):
+            return None
+
+        session = await self._session_service.create_session(
+            app_name=app_name,
+            user_id=user_id,
+            state=spilled.state,
+            session_id=session_id,
+        )
+        for event in spilled.events:
+            await self._session_service.append_event(session, event)
+        await asyncio.to_thread(path.unlink, missing_ok=True)
+        return session
+
+    async def _evict(self, key: SessionKey) -> None:
+        _, size = self._idle.pop(key, (0, 0))
+        self._idle_bytes -= size
+        app_name, user_id, session_id = key
+        self._evicting.add(key)
+        try:
+            session = await self._session_service.get_session(
+                app_name=app_name, user_id=user_id, session_id=session_id)
+            if session is None or key in self._reacquired:
+                return
+
+            path = self._spill_path(session_id)
+            if path is not None:
+                await asyncio.to_thread(self._write_spill, path, session.model_dump_json())
+            # A client may have reconnected while the spill was written
+            if key in self._reacquired:
+                if path is not None:
+                    await asyncio.to_thread(path.unlink, missing_ok=True)
+                return
+            await self._session_service.delete_session(
+                app_name=app_name, user_id=user_id, session_id=session_id)
+        finally:
+            self._evicting.discard(key)
+            self._reacquired.discard(key)
+
+    def _spill_path(self, session_id: str) -> Path | None:
+        if self._spill_dir is None:
+            return None
+        return self._spill_dir / f"session-{session_id}.json"
+
+    def _delete_spills_before(self, cutoff: float) -> int:
+        deleted = 0
+        for path in self._spill_dir.glob("session-*.json"):
+            try:
+                if path.stat().st_mtime <= cutoff:
+                    path.unlink()
+                    deleted += 1
+            except FileNotFoundError:
+                pass
+        return deleted
+
+    @staticmethod
+    def _write_spill(path: Path, data: str) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(data)
+
+
+def build_run_config(is_audio: bool, voice_name: str = "Aoede") -> RunConfig:
+    """
+    Builds the RunConfig for a response modality.
+
+    Args:
+        is_audio: True for audio responses with output transcription, False for text.
+        voice_name: Prebuilt voice (Puck, Charon, Kore, Fenrir, Aoede, Leda, Orus, Zephyr).
+
+    Returns:
+        A RunConfig for run_live.
+    """
+    # Create speech config with voice settings
+    speech_config = types.SpeechConfig(
+        voice_config=types.VoiceConfig(
+            prebuilt_voice_config=types.PrebuiltVoiceConfig(voice_name=voice_name)
+        )
+    )
+
+    config = {
+        "response_modalities": ["AUDIO" if is_audio else "TEXT"],
+        "speech_config": speech_config,
+    }
+
+    # Add output_audio_transcription when audio is enabled to get both audio and text
+    if is_audio:
+        config["output_audio_transcription"] = {}
+
+    return RunConfig(**config)
+
+
+class SessionManager:
+    """
+    Shared Runner and cached RunConfig templates for live sessions.
+
+    One SessionManager is created per agent at import time and reused by
+    every WebSocket connection.
+    """
+
+    def __init__(
+        self,
+        app_name: str,
+        agent: BaseAgent,
+        session_service: BaseSessionService,
+        evictor: SessionEvictor | None = None,
+        retain_sessions: bool = False,
+    ):
+        """
+        Args:
+            app_name: ADK application name.
+            agent: Root agent run for every session.
+            session_service: Service that stores the sessions.
+            evictor: Keeps ended sessions for reuse under an eviction policy;
+                None deletes sessions as soon as their live stream ends.
+            retain_sessions: Keep ended sessions in the session service, for
+                services that persist them outside this process.
+        """
+        self.app_name = app_name
+        self.session_service = session_service
+        self.evictor = evictor
+        self.retain_sessions = retain_sessions
+        self.runner = Runner(
+            app_name=app_name,
+            agent=agent,
+            session_service=session_service,
+        )
+        self._run_configs = {
+            True: build_run_config(is_audio=True),
+            False: build_run_config(is_audio=False),
+        }
+
+    def run_config(self, is_audio: bool) -> RunConfig:
+        """
+        Returns a RunConfig for the modality.
+
+        run_live may adjust fields on the config it is given, so callers get a
+        shallow copy of the cached template rather than the template itself.
+        """
+        return self._run_configs[is_audio].model_copy()
+
+    async def acquire_session(self, user_id: str, session_id: str) -> Session:
+        """
+        Returns a session for a new connection.
+
+        An existing session with the given ids is reused, reloading it from
+        disk if it was evicted, when ended sessions are kept. Otherwise a new
+        session is created.
+
+        Args:
+            user_id: User the session is for.
+            session_id: Session id requested by the client.
+
+        Returns:
+            A session ready for run_live.
+        """
+        if self.evictor is not None or self.retain_sessions:
+            session = await self.session_service.get_session(
+                app_name=self.app_name, user_id=user_id, session_id=session_id)
+            if session is None and self.evictor is not None:
+                session = await self.evictor.restore(
+                    self.app_name, user_id, session_id)
+            if session is not None:
+                if self.evictor is not None:
+                    self.evictor.mark_active(self.app_name, user_id, session_id)
+                return session
+
+        return await self.session_service.create_session(
+            app_name=self.app_name,
+            user_id=user_id,
+            session_id=session_id,
+        )
+
+    async def release_session(self, session: Session) -> None:
+        """Hands a session whose live stream has ended to the evictor, or deletes it."""
+        if self.retain_sessions:
+            return
+        if self.evictor is not None:
+            await self.evictor.mark_idle(session)
+            return
+        await self.session_service.delete_session(
+            app_name=session.app_name,
+            user_id=session.user_id,
+            session_id=session.id,
+        )
@@ -0,0 +1,294 @@
+# core/session_service.py
+# Builds the ADK SessionService used by the streaming server.
+#
+# The "memory" backend keeps sessions in process, so they are lost on restart
+# and private to one uvicorn worker. The "database" backend stores them with
+# ADK's DatabaseSessionService (SQLite by default, any SQLAlchemy async URL
+# works), whose schema already keys sessions by (app_name, user_id, id) and
+# indexes events by app, user, session and timestamp.
+#
+# Writing every event is a database commit, and run_live appends an event for
+# each transcription chunk and model response. BatchingSessionService keeps
+# those off the live event loop: events that carry no state changes are added
+# to the in-memory session at once and written to the database in batches.
+import asyncio
+import logging
+from pathlib import Path
+from typing import Any, Optional
+
+from google.adk.events.event import Event
+from google.adk.sessions import BaseSessionService, InMemorySessionService, Session
+from google.adk.sessions.base_session_service import (
+    GetSessionConfig,
+    ListSessionsResponse,
+)
+from sqlalchemy import event as sqlalchemy_event
+
+from app.config import StreamingConfiguration
+
+from .session_manager import SessionKey
+from .stream_logging import STREAM_LOGGER_NAME
+
+logger = logging.getLogger(STREAM_LOGGER_NAME)
+
+MEMORY_BACKEND = "memory"
+DATABASE_BACKEND = "database"
+
+
+class BatchingSessionService(BaseSessionService):
+    """
+    Session service wrapper that batches event writes to a persistent service.
+
+    Events without state, artifact or control actions are appended to the
+    caller's in-memory session immediately and queued per session, so the
+    caller does not wait on the database. A background task writes the queue
+    out `flush_interval` seconds after its first event, or straight away once
+    it reaches `batch_size` or a turn ends. Before an event that changes
+    state, and before the session is read back, the queue is written inline,
+    so reads and state changes always see every earlier event.
+    """
+
+    def __init__(
+        self,
+        inner: BaseSessionService,
+        batch_size: int = 32,
+        flush_interval: float = 0.25,
+    ):
+        """
+        Args:
+            inner: Persistent service events are written to.
+            batch_size: Queued events per session that trigger a write.
+            flush_interval: Longest time in seconds an event stays queued.
+        """
+        self.inner = inner
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        # Session the queued events belong to, and the events themselves
+        self._pending: dict[SessionKey, tuple[Session, list[Event]]] = {}
+        self._timers: dict[SessionKey, asyncio.Task] = {}
+        self._locks: dict[SessionKey, asyncio.Lock] = {}
+
+    @staticmethod
+    def _key(app_name: str, user_id: str, session_id: str) -> SessionKey:
+        return (app_name, user_id, session_id)
+
+    @staticmethod
+    def _can_defer(event: Event) -> bool:
+        """True for events that only add history, such as transcriptions."""
+        if not event.actions:
+            return True
+        return not any(event.actions.model_dump(exclude_none=True).values())
+
+    def _lock(self, key: SessionKey) -> asyncio.Lock:
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
+
+    def _discard_lock(self, key: SessionKey) -> None:
+        # Locks are only needed while a session has writes in flight
+        lock = self._locks.get(key)
+        if lock is not None and not lock.locked() and key not in self._pending:
+            del self._locks[key]
+
+    @property
+    def pending_events(self) -> int:
+        """Events appended but not yet written to the persistent service."""
+        return sum(len(events) for _, events in self._pending.values())
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        return await self.inner.create_session(
+            app_name=app_name, user_id=user_id, state=state, session_id=session_id)
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        await self._flush_session(self._key(app_name, user_id, session_id))
+        return await self.inner.get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id, config=config)
+
+    async def list_sessions(
+        self, *, app_name: str, user_id: Optional[str] = None
+    ) -> ListSessionsResponse:
+        return await self.inner.list_sessions(app_name=app_name, user_id=user_id)
+
+    async def delete_session(
+        self, *, app_name: str, user_id: str, session_id: str
+    ) -> None:
+        key = self._key(app_name, user_id, session_id)
+        async with self._lock(key):
+            self._pending.pop(key, None)
+            timer = self._timers.pop(key, None)
+            if timer is not None:
+                timer.cancel()
+            await self.inner.delete_session(
+                app_name=app_name, user_id=user_id, session_id=session_id)
+        self._locks.pop(key, None)
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        if event.partial:
+            return event
+
+        key = self._key(session.app_name, session.user_id, session.id)
+        if not self._can_defer(event):
+            async with self._lock(key):
+                await self._write_pending(key)
+                event = await self.inner.append_event(session, event)
+            self._discard_lock(key)
+            return event
+
+        event = await super().append_event(session, event)
+        _, events = self._pending.setdefault(key, (session, []))
+        events.append(event)
+        if len(events) >= self._batch_size or event.turn_complete or event.interrupted:
+            self._schedule_flush(key, 0)
+        elif key not in self._timers:
+            self._schedule_flush(key, self._flush_interval)
+        return event
+
+    def _schedule_flush(self, key: SessionKey, delay: float) -> None:
+        # A timer still in _timers is sleeping, so replacing it is safe
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        self._timers[key] = asyncio.create_task(self._flush_later(key, delay))
+
+    async def _flush_later(self, key: SessionKey, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._timers.pop(key, None)
+        try:
+            await self._flush_session(key)
+        except Exception:
+            logger.exception("session event flush failed",
+                             extra={"fields": {"session_id": key[2]}})
+
+    async def _flush_session(self, key: SessionKey) -> None:
+        if key not in self._pending:
+            return
+        async with self._lock(key):
+            await self._write_pending(key)
+        self._discard_lock(key)
+
+    async def _write_pending(self, key: SessionKey) -> None:
+        """Writes a session's queued events. The caller holds the session's lock."""
+        timer = self._timers.pop(key, None)
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+        pending = self._pending.pop(key, None)
+        if pending is None:
+            return
+
+        session, events = pending
+        # The events are already in session.events, so write them through a
+        # copy with an empty history and carry its storage revision back.
+        writer = session.model_copy(update={"events": []})
+        try:
+            for index, event in enumerate(events):
+                await self.inner.append_event(writer, event)
+        except Exception:
+            # Requeue what was not written, ahead of anything appended since
+            _, newer = self._pending.get(key, (session, []))
+            self._pending[key] = (session, events[index:] + newer)
+            raise
+        finally:
+            session.last_update_time = writer.last_update_time
+            session._storage_update_marker = writer._storage_update_marker
+
+    async def flush(self) -> None:
+        """Writes every queued event, including writes already in progress."""
+        for key in list(self._pending):
+            await self._flush_session(key)
+        for lock in list(self._locks.values()):
+            async with lock:
+                pass
+
+    async def close(self) -> None:
+        """Writes every queued event and closes the persistent service."""
+        await self.flush()
+        close = getattr(self.inner, "close", None)
+        if close is not None:
+            await close()
+
+
+def _enable_sqlite_wal(dbapi_connection, connection_record) -> None:
+    # WAL lets readers in other workers proceed while one worker writes
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
+def build_session_service(config: StreamingConfiguration) -> BaseSessionService:
+    """
+    Creates the session service selected by `config.session_service_backend`.
+
+    Args:
+        config: Streaming configuration.
+
+    Returns:
+        An InMemorySessionService for the "memory" backend, or a
+        BatchingSessionService over a DatabaseSessionService for "database".
+
+    Raises:
+        ValueError: If the backend name is not recognised.
+    """
+    backend = config.session_service_backend
+    if backend == MEMORY_BACKEND:
+        return InMemorySessionService()
+    if backend != DATABASE_BACKEND:
+        raise ValueError(f"Unknown session service backend: {backend}")
+
+    from google.adk.sessions.database_session_service import DatabaseSessionService
+
+    db_url = config.session_db_url
+    engine_options = {
+        "pool_size": config.session_db_pool_size,
+        "max_overflow": config.session_db_max_overflow,
+        "pool_recycle": config.session_db_pool_recycle_s,
+    }
+    if db_url.startswith("sqlite"):
+        database = db_url.split(":///", 1)[-1]
+        if not database or database == ":memory:":
+            # An in-memory database lives on one shared connection
+            engine_options = {}
+        else:
+            Path(database).parent.mkdir(parents=True, exist_ok=True)
+
+    database_service = DatabaseSessionService(db_url=db_url, **engine_options)
+    if database_service.db_engine.dialect.name == "sqlite":
+        sqlalchemy_event.listen(
+            database_service.db_engine.sync_engine, "connect", _enable_sqlite_wal)
+
+    return BatchingSessionService(
+        database_service,
+        batch_size=config.session_event_batch_size,
+        flush_interval=config.session_event_flush_interval_s,
+    )
+
+
+async def prepare_session_service(session_service: BaseSessionService) -> None:
+    """Creates the database tables and indexes up front instead of on first use."""
+    inner = getattr(session_service, "inner", session_service)
+    prepare_tables = getattr(inner, "prepare_tables", None)
+    if prepare_tables is not None:
+        await prepare_tables()
+
+
+async def close_session_service(session_service: BaseSessionService) -> None:
+    """Writes buffered events and releases database connections."""
+    await session_service.flush()
+    close = getattr(session_service, "close", None)
+    if close is not None:
+        await close()
@@ -0,0 +1,145 @@
+# core/stream_logging.py
+# Structured, non-blocking logging for the live streaming endpoint.
+#
+# Records are handed to a QueueHandler and written to stdout by a
+# QueueListener thread, so the event loop never blocks on log I/O. Per-frame
+# activity is counted per session and only sampled into the log; the most
+# recent events are kept in a small ring buffer for debugging.
+import json
+import logging
+import logging.handlers
+import queue
+import time
+from collections import deque
+from typing import Any
+
+STREAM_LOGGER_NAME = "app.stream"
+
+_listener: logging.handlers.QueueListener | None = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as one JSON object per line, including `fields` extras."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def start_stream_logging(level: int = logging.INFO) -> logging.Logger:
+    """
+    Routes the stream logger through a queue to a background writer thread.
+
+    Safe to call more than once; only the first call installs the handler.
+
+    Returns:
+        The configured stream logger.
+    """
+    global _listener
+    logger = logging.getLogger(STREAM_LOGGER_NAME)
+    if _listener is None:
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        output = logging.StreamHandler()
+        output.setFormatter(JsonFormatter())
+        _listener = logging.handlers.QueueListener(log_queue, output)
+        _listener.start()
+
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        logger.setLevel(level)
+        logger.propagate = False
+    return logger
+
+
+def stop_stream_logging() -> None:
+    """Flushes pending records and stops the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+class SessionLog:
+    """
+    Per-session counters, sampled logging and a ring buffer of recent events.
+
+    Each event belongs to a category such as "agent_audio" or "client_text".
+    Frame and byte counts are kept for every category, but only one in
+    `sample_every[kind]` events is written to the log, where kind is the
+    category suffix (audio, text or control).
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        sample_every: dict[str, int],
+        buffer_size: int = 200,
+    ):
+        """
+        Args:
+            session_id: Session the events belong to.
+            sample_every: Sampling interval per kind; missing kinds log every event.
+            buffer_size: Number of recent events kept for debugging.
+        """
+        self.session_id = session_id
+        self._logger = logging.getLogger(STREAM_LOGGER_NAME)
+        self._sample_every = sample_every
+        self._recent: deque[dict[str, Any]] = deque(maxlen=buffer_size)
+        self.frames: dict[str, int] = {}
+        self.bytes: dict[str, int] = {}
+        self.started_at = time.time()
+
+    def record(self, category: str, size: int = 0, **fields: Any) -> None:
+        """
+        Counts one event and logs it if it falls on the sampling interval.
+
+        Args:
+            category: Event category, "<direction>_<kind>".
+            size: Payload size in bytes.
+            **fields: Extra details kept in the ring buffer and the log line.
+        """
+        count = self.frames.get(category, 0) + 1
+        self.frames[category] = count
+        self.bytes[category] = self.bytes.get(category, 0) + size
+
+        event = {"ts": round(time.time(), 3), "category": category, "size": size}
+        event.update(fields)
+        self._recent.append(event)
+
+        kind = category.rsplit("_", 1)[-1]
+        if count % self._sample_every.get(kind, 1) == 0:
+            self.info(category, count=count, **fields)
+
+    def info(self, message: str, **fields: Any) -> None:
+        """Logs a message tagged with this session's id."""
+        self._logger.info(message, extra={"fields": self._fields(fields)})
+
+    def error(self, message: str, **fields: Any) -> None:
+        """Logs an error with the current exception and the recent event buffer."""
+        self._logger.error(
+            message,
+            exc_info=True,
+            extra={"fields": self._fields(fields, recent=list(self._recent))},
+        )
+
+    def summary(self) -> dict[str, Any]:
+        """Returns the per-category frame and byte counters."""
+        return {
+            "duration_s": round(time.time() - self.started_at, 1),
+            "frames": dict(self.frames),
+            "bytes": dict(self.bytes),
+        }
+
+    def recent(self) -> list[dict[str, Any]]:
+        """Returns the buffered recent events, oldest first."""
+        return list(self._recent)
+
+    def _fields(self, fields: dict[str, Any], **more: Any) -> dict[str, Any]:
+        return {"session_id": self.session_id, **fields, **more}
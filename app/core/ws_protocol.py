@@ -0,0 +1,91 @@
+# core/ws_protocol.py
+# Wire format for the /ws/{session_id} streaming endpoint.
+#
+# Control and text messages are JSON text frames. When the client negotiates
+# binary mode, audio/pcm travels as raw binary frames prefixed with a small
+# fixed header instead of base64 inside JSON.
+import struct
+
+# Header layout: direction (uint8), mime code (uint8), sequence (uint32),
+# network byte order. The PCM payload follows the header directly.
+FRAME_HEADER = struct.Struct("!BBI")
+FRAME_HEADER_SIZE = FRAME_HEADER.size
+
+DIRECTION_CLIENT_TO_AGENT = 0
+DIRECTION_AGENT_TO_CLIENT = 1
+
+MIME_AUDIO_PCM = 1
+
+MIME_CODES = {"audio/pcm": MIME_AUDIO_PCM}
+MIME_TYPES = {code: mime_type for mime_type, code in MIME_CODES.items()}
+
+SEQUENCE_MODULUS = 2**32
+
+# Client microphone audio is 16-bit mono PCM
+PCM_SAMPLE_WIDTH = 2
+
+
+def encode_frame(direction: int, mime_type: str, sequence: int, payload: bytes) -> bytes:
+    """
+    Builds a binary frame for a media payload.
+
+    Args:
+        direction: DIRECTION_CLIENT_TO_AGENT or DIRECTION_AGENT_TO_CLIENT.
+        mime_type: Mime type of the payload; must be listed in MIME_CODES.
+        sequence: Per-connection frame counter, wrapped to 32 bits.
+        payload: Raw media bytes.
+
+    Returns:
+        The header followed by the payload.
+    """
+    header = FRAME_HEADER.pack(
+        direction, MIME_CODES[mime_type], sequence % SEQUENCE_MODULUS)
+    return header + payload
+
+
+def decode_frame(frame: bytes) -> tuple[int, str, int, bytes]:
+    """
+    Splits a binary frame into its header fields and payload.
+
+    Args:
+        frame: The raw bytes received from the WebSocket.
+
+    Returns:
+        A (direction, mime_type, sequence, payload) tuple.
+
+    Raises:
+        ValueError: If the frame is truncated or uses an unknown mime code.
+    """
+    if len(frame) < FRAME_HEADER_SIZE:
+        raise ValueError(f"Binary frame too short: {len(frame)} bytes")
+
+    direction, mime_code, sequence = FRAME_HEADER.unpack_from(frame)
+    mime_type = MIME_TYPES.get(mime_code)
+    if mime_type is None:
+        raise ValueError(f"Unknown mime code in binary frame: {mime_code}")
+
+    return direction, mime_type, sequence, frame[FRAME_HEADER_SIZE:]
+
+
+def negotiate_audio_frame_ms(
+    requested_ms: int | None, preferred_ms: int, min_ms: int, max_ms: int
+) -> int:
+    """
+    Picks the audio frame duration for a connection.
+
+    Args:
+        requested_ms: Frame duration asked for by the client, if any.
+        preferred_ms: Server default used when the client does not ask.
+        min_ms: Shortest allowed frame duration.
+        max_ms: Longest allowed frame duration.
+
+    Returns:
+        The requested (or preferred) duration clamped to [min_ms, max_ms].
+    """
+    frame_ms = requested_ms if requested_ms else preferred_ms
+    return max(min_ms, min(frame_ms, max_ms))
+
+
+def audio_frame_bytes(frame_ms: int, sample_rate: int) -> int:
+    """Returns the size in bytes of a PCM frame of the given duration."""
+    return sample_rate * frame_ms // 1000 * PCM_SAMPLE_WIDTH
@@ -10,7 +10,8 @@ This agent provides comprehensive interview simulation capabilities including:
 """
 
 from google.adk.agents import Agent
-from .tools import (
+# Async variants run the blocking tool I/O off the event loop
+from .tools.async_tools import (
     schedule_interview,
     list_scheduled_interviews,
     cancel_interview,
@@ -22,6 +23,8 @@ from .tools import (
     evaluate_answer,
     generate_interview_report,
     get_question_bank,
+    get_question,
+    search_questions,
     save_interview_progress,
     load_interview_progress,
 )
@@ -52,6 +55,8 @@ root_agent = Agent(
         # Data and reporting tools
         generate_interview_report,
         get_question_bank,
+        get_question,
+        search_questions,
         save_interview_progress,
         load_interview_progress,
     ],
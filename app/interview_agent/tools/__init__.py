@@ -20,6 +20,8 @@ from .interview_tools import (
 from .data_tools import (
     generate_interview_report,
     get_question_bank,
+    get_question,
+    search_questions,
     save_interview_progress,
     load_interview_progress,
 )
@@ -41,6 +43,8 @@ __all__ = [
     # Data and reporting tools
     "generate_interview_report",
     "get_question_bank",
+    "get_question",
+    "search_questions",
     "save_interview_progress",
     "load_interview_progress",
 ]
@@ -0,0 +1,87 @@
+"""
+Async variants of the interview agent tools.
+
+ADK calls synchronous tools directly on the event loop, so the file, database
+and Google Calendar I/O inside them would stall every live session served by
+the same worker. Each tool here runs its synchronous counterpart on a bounded
+thread pool and returns exactly the same result. Calendar tools get their own
+pool so slow API calls cannot starve the session tools.
+"""
+
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from ..utils import session_locks
+from . import calendar_tools, data_tools, interview_tools
+
+# Worker threads per pool; calls beyond this wait for a free worker
+SESSION_TOOL_WORKERS = int(os.getenv("INTERVIEW_SESSION_TOOL_WORKERS", "8"))
+CALENDAR_TOOL_WORKERS = int(os.getenv("INTERVIEW_CALENDAR_TOOL_WORKERS", "4"))
+
+session_executor = ThreadPoolExecutor(
+    max_workers=SESSION_TOOL_WORKERS, thread_name_prefix="interview-tool")
+calendar_executor = ThreadPoolExecutor(
+    max_workers=CALENDAR_TOOL_WORKERS, thread_name_prefix="calendar-tool")
+
+
+def offload(
+    func: Callable[..., Dict[str, Any]],
+    executor: ThreadPoolExecutor,
+    lock_session: bool = False
+) -> Callable[..., Any]:
+    """
+    Wrap a synchronous tool as a coroutine that runs it on `executor`.
+
+    The wrapper keeps the tool's name, docstring and signature, so ADK builds
+    the same function declaration for it.
+
+    Args:
+        func: Synchronous tool function
+        executor: Thread pool the tool runs on
+        lock_session: Hold the session's asyncio lock while the tool runs, so
+            calls on one session queue on the event loop instead of occupying
+            worker threads
+
+    Returns:
+        Async function with the same parameters and result as `func`
+    """
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        loop = asyncio.get_running_loop()
+        call = functools.partial(func, *args, **kwargs)
+        if not lock_session:
+            return await loop.run_in_executor(executor, call)
+
+        session_id = kwargs.get("session_id", args[0] if args else None)
+        async with session_locks.async_lock(session_id):
+            return await loop.run_in_executor(executor, call)
+
+    return wrapper
+
+
+# Calendar tools
+schedule_interview = offload(calendar_tools.schedule_interview, calendar_executor)
+list_scheduled_interviews = offload(calendar_tools.list_scheduled_interviews, calendar_executor)
+cancel_interview = offload(calendar_tools.cancel_interview, calendar_executor)
+update_interview = offload(calendar_tools.update_interview, calendar_executor)
+
+# Interview session tools
+start_interview_session = offload(interview_tools.start_interview_session, session_executor)
+ask_behavioral_question = offload(
+    interview_tools.ask_behavioral_question, session_executor, lock_session=True)
+ask_technical_question = offload(
+    interview_tools.ask_technical_question, session_executor, lock_session=True)
+provide_feedback = offload(interview_tools.provide_feedback, session_executor)
+evaluate_answer = offload(interview_tools.evaluate_answer, session_executor)
+
+# Data and reporting tools
+generate_interview_report = offload(data_tools.generate_interview_report, session_executor)
+get_question_bank = offload(data_tools.get_question_bank, session_executor)
+get_question = offload(data_tools.get_question, session_executor)
+search_questions = offload(data_tools.search_questions, session_executor)
+save_interview_progress = offload(data_tools.save_interview_progress, session_executor)
+load_interview_progress = offload(data_tools.load_interview_progress, session_executor)
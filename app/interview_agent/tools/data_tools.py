@@ -2,12 +2,21 @@
 Data management and reporting tools for interview sessions.
 """
 
-import json
 from typing import Dict, Any, List, Optional
-from pathlib import Path
 from datetime import datetime, timedelta
 
-from ..utils import load_session_data, save_session_data, calculate_interview_score
+from ..utils import (
+    load_session_data,
+    append_session_entries,
+    flush_session_data,
+    calculate_interview_score,
+    get_question_bank_service,
+    get_question_search_index,
+)
+
+# Questions listed per get_question_bank call unless the caller asks otherwise
+DEFAULT_QUESTION_PAGE = 20
+MAX_QUESTION_PAGE = 100
 
 
 def generate_interview_report(session_id: str, include_full_transcript: bool = True) -> Dict[str, Any]:
@@ -22,14 +31,17 @@ def generate_interview_report(session_id: str, include_full_transcript: bool = T
         Dictionary with detailed interview report including performance metrics, strengths, areas for improvement, and recommendations.
     """
     try:
-        # Load session data
-        session_data = load_session_data(session_id)
+        # Load session data, restoring it from the archive if needed
+        session_data = load_session_data(session_id, include_archived=True)
         if not session_data:
             return {
                 "status": "error",
                 "message": "Session not found."
             }
 
+        # The report marks the end of the interview; persist buffered changes now
+        flush_session_data(session_id)
+
         # Calculate performance metrics
         questions_asked = session_data.get("questions_asked", [])
         answers_given = session_data.get("answers_given", [])
@@ -195,96 +207,110 @@ We recommend reviewing this assessment thoroughly and implementing the suggested
 def get_question_bank(
     question_type: str,
     category: str,
-    difficulty: str
+    difficulty: str,
+    limit: int,
+    offset: int,
+    fields: str
 ) -> Dict[str, Any]:
     """
-    Retrieve questions from the question bank with optional filtering.
+    Browse the question bank with optional filtering, one page at a time.
+
+    By default only question ids and texts are listed; use get_question for
+    the full details of a question.
 
     Args:
         question_type: Type of questions (behavioral, technical, case_study, all)
-        category: Question category (varies by type)
+        category: Question category (varies by type, or all)
         difficulty: Difficulty level (easy, medium, hard, all)
+        limit: Maximum number of questions to list (default 20, at most 100)
+        offset: Number of matching questions to skip, for the next page (default 0)
+        fields: Comma-separated extra fields to include, e.g. "key_points,follow_ups",
+            or "all" for every field (default: none)
 
     Returns:
-        Dictionary with filtered question bank 
+        Dictionary with question counts per type and category, and one page
+        of matching questions
     """
     try:
-        # Load question bank
-        data_dir = Path(__file__).parent.parent / "data"
-        question_bank_path = data_dir / "question_bank.json"
-
+        # Handle default values
+        if not question_type:
+            question_type = "all"
+        if not category:
+            category = "all"
+        if not difficulty:
+            difficulty = "all"
+        limit = min(limit, MAX_QUESTION_PAGE) if limit and limit > 0 else DEFAULT_QUESTION_PAGE
+        offset = max(offset or 0, 0)
+        field_list = [field.strip() for field in (fields or "").split(",") if field.strip()]
+
+        # Shared, indexed question bank
         try:
-            with open(question_bank_path, 'r') as f:
-                question_bank = json.load(f)
+            question_bank = get_question_bank_service()
         except FileNotFoundError:
             return {
                 "status": "error",
                 "message": "Question bank not found."
             }
 
-        # Filter by question type
+        # Filter by question type; "behavioral" is short for "behavioral_questions"
         if question_type == "all":
-            filtered_bank = question_bank
-        elif question_type in question_bank:
-            filtered_bank = {question_type: question_bank[question_type]}
+            selected_types = list(question_bank.sections())
+        elif question_bank.resolve_section(question_type):
+            question_type = question_bank.resolve_section(question_type)
+            selected_types = [question_type]
         else:
             return {
                 "status": "error",
                 "message": f"Question type '{question_type}' not found."
             }
 
-        # Apply category and difficulty filters
-        if category != "all" or difficulty != "all":
-            final_bank = {}
-            for q_type, categories in filtered_bank.items():
-                final_bank[q_type] = {}
-
-                for cat_name, questions in categories.items():
-                    if category != "all" and cat_name != category:
-                        continue
-
-                    if difficulty != "all":
-                        # Filter questions by difficulty
-                        filtered_questions = []
-                        for q in questions:
-                            if isinstance(q, dict) and q.get("difficulty") == difficulty:
-                                filtered_questions.append(q)
-                            elif difficulty == "medium" and isinstance(q, dict) and "difficulty" not in q:
-                                # Include questions without difficulty as medium
-                                filtered_questions.append(q)
-
-                        if filtered_questions:
-                            final_bank[q_type][cat_name] = filtered_questions
-                    else:
-                        final_bank[q_type][cat_name] = questions
-
-            filtered_bank = final_bank
-
-        # Count questions
-        total_questions = 0
+        # Apply category and difficulty filters using the bank's indexes;
+        # questions without a difficulty are indexed as medium
+        matches = []
         question_summary = {}
-
-        for q_type, categories in filtered_bank.items():
+        for q_type in selected_types:
             type_count = 0
-            for cat_name, questions in categories.items():
-                cat_count = len(questions) if isinstance(
-                    questions, list) else 0
-                type_count += cat_count
-                question_summary[f"{q_type}_{cat_name}"] = cat_count
-
+            for cat_name in question_bank.categories(q_type):
+                if category != "all" and cat_name != category:
+                    continue
+                questions = question_bank.questions(
+                    q_type, cat_name, None if difficulty == "all" else difficulty)
+                if not questions:
+                    continue
+                question_summary[f"{q_type}_{cat_name}"] = len(questions)
+                type_count += len(questions)
+                matches.extend((q_type, cat_name, question) for question in questions)
             question_summary[q_type] = type_count
-            total_questions += type_count
 
+        # Summary-first page: ids and texts, plus any requested fields
+        page = []
+        for q_type, cat_name, question in matches[offset:offset + limit]:
+            entry = {
+                "id": question["id"],
+                "question_type": q_type,
+                "category": cat_name,
+                "question": question["question"]
+            }
+            if "all" in field_list:
+                entry.update(question)
+            else:
+                entry.update({field: question[field] for field in field_list if field in question})
+            page.append(entry)
+
+        next_offset = offset + len(page)
         return {
             "status": "success",
-            "message": f"Retrieved {total_questions} questions matching criteria",
+            "message": f"Listing {len(page)} of {len(matches)} questions matching criteria",
             "filters_applied": {
                 "question_type": question_type,
                 "category": category,
                 "difficulty": difficulty
             },
             "question_summary": question_summary,
-            "question_bank": filtered_bank
+            "total_questions": len(matches),
+            "offset": offset,
+            "next_offset": next_offset if next_offset < len(matches) else None,
+            "questions": page
         }
 
     except Exception as e:
@@ -293,6 +319,136 @@ def get_question_bank(
             "message": f"Error retrieving question bank: {str(e)}"
         }
 
+
+def get_question(question_id: str) -> Dict[str, Any]:
+    """
+    Get the full details of one question from the question bank.
+
+    Args:
+        question_id: Question id, as listed by get_question_bank or search_questions
+
+    Returns:
+        Dictionary with the question, its type and category, key points and follow-ups
+    """
+    try:
+        try:
+            question_bank = get_question_bank_service()
+        except FileNotFoundError:
+            return {
+                "status": "error",
+                "message": "Question bank not found."
+            }
+
+        # A reload between the two lookups may drop the question
+        question = question_bank.get(question_id)
+        location = question_bank.locate(question_id) if question is not None else None
+        if location is None:
+            return {
+                "status": "error",
+                "message": f"Question '{question_id}' not found."
+            }
+
+        question_type, category = location
+        return {
+            "status": "success",
+            "message": question["question"],
+            "question": {
+                "question_type": question_type,
+                "category": category,
+                **question
+            }
+        }
+
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Error retrieving question: {str(e)}"
+        }
+
+
+def search_questions(
+    query: str,
+    question_type: str,
+    category: str,
+    difficulty: str,
+    limit: int
+) -> Dict[str, Any]:
+    """
+    Search the question bank by keywords, with optional filters.
+
+    Args:
+        query: Keywords to look for in question text, key points and follow-ups
+        question_type: Type of questions (behavioral, technical, case_study, all)
+        category: Question category or technical domain (varies by type, or all)
+        difficulty: Difficulty level (easy, medium, hard, all)
+        limit: Maximum number of questions to return (default 10)
+
+    Returns:
+        Dictionary with the best matching questions, the total number of
+        matches and match counts by type, category and difficulty
+    """
+    try:
+        # Handle default values
+        if not query:
+            query = ""
+        if not limit or limit < 1:
+            limit = 10
+
+        try:
+            search_index = get_question_search_index()
+        except FileNotFoundError:
+            return {
+                "status": "error",
+                "message": "Question bank not found."
+            }
+
+        # Same type names as get_question_bank: "behavioral" is short for "behavioral_questions"
+        section = None
+        if question_type not in ("", "all"):
+            section = search_index.bank.resolve_section(question_type)
+            if section is None:
+                return {
+                    "status": "error",
+                    "message": f"Question type '{question_type}' not found."
+                }
+
+        found = search_index.search(
+            query,
+            section=section,
+            category=None if category in ("", "all") else category,
+            difficulty=None if difficulty in ("", "all") else difficulty,
+            limit=min(limit, 50)
+        )
+
+        if not found["total"]:
+            message = "No questions match the search."
+        elif found["match"] == "any":
+            message = (f"No question matches every keyword; showing {len(found['results'])} "
+                       f"of {found['total']} questions matching some of them")
+        else:
+            message = f"Found {found['total']} questions; showing the top {len(found['results'])}"
+
+        return {
+            "status": "success",
+            "message": message,
+            "filters_applied": {
+                "query": query,
+                "question_type": section or "all",
+                "category": category,
+                "difficulty": difficulty
+            },
+            "total_matches": found["total"],
+            "questions": found["results"],
+            "facets": found["facets"]
+        }
+
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Error searching question bank: {str(e)}"
+        }
+
+
 def save_interview_progress(
     session_id: str,
     notes: str,
@@ -330,7 +486,7 @@ def save_interview_progress(
         session_data.setdefault("progress_saves", []).append(progress_data)
 
         # Save session
-        success = save_session_data(session_id, session_data)
+        success = append_session_entries(session_id, {"progress_saves": [progress_data]})
 
         if success:
             return {
@@ -363,7 +519,7 @@ def load_interview_progress(session_id: str) -> Dict[str, Any]:
         Dictionary with session progress data
     """
     try:
-        session_data = load_session_data(session_id)
+        session_data = load_session_data(session_id, include_archived=True)
         if not session_data:
             return {
                 "status": "error",
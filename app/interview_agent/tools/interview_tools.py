@@ -2,13 +2,22 @@
 Interview session management tools for conducting mock interviews.
 """
 
-import json
-import random
 from typing import Dict, Any, Optional
-from pathlib import Path
 from datetime import datetime
 
-from ..utils import generate_session_id, save_session_data, load_session_data
+from google.adk.tools import ToolContext
+
+from ..utils import (
+    generate_session_id,
+    save_session_data,
+    load_session_data,
+    append_session_entries,
+    get_question_bank_service,
+    get_question_sampler,
+    load_interview_config,
+    with_session_lock,
+    SessionConflictError,
+)
 
 
 def start_interview_session(
@@ -17,7 +26,8 @@ def start_interview_session(
     difficulty_level: str,
     company: str,
     focus_areas: str,
-    session_duration: int
+    session_duration: int,
+    tool_context: Optional[ToolContext] = None
 ) -> Dict[str, Any]:
     """
     Start a new interview session with specified parameters.
@@ -29,6 +39,7 @@ def start_interview_session(
         company: Company name (optional)
         focus_areas: Comma-separated focus areas (optional)
         session_duration: Session duration in minutes
+        tool_context: Supplied by ADK; identifies the user the session belongs to
 
     Returns:
         Dictionary with session details and first interaction
@@ -54,6 +65,7 @@ def start_interview_session(
         # Initialize session data
         session_data = {
             "session_id": session_id,
+            "user_id": tool_context.user_id if tool_context is not None else None,
             "interview_type": interview_type,
             "role": role,
             "difficulty_level": difficulty_level,
@@ -70,7 +82,7 @@ def start_interview_session(
         }
 
         # Save session data
-        save_success = save_session_data(session_id, session_data)
+        save_success = save_session_data(session_id, session_data, expected_version=0)
         if not save_success:
             return {
                 "status": "error",
@@ -172,6 +184,7 @@ Shall we dive into our first case study? Let me know when you're ready.
         }
 
 
+@with_session_lock
 def ask_behavioral_question(
     session_id: str,
     category: str,
@@ -208,19 +221,16 @@ def ask_behavioral_question(
                 "message": "Session is not active."
             }
 
-        # Load question bank
-        data_dir = Path(__file__).parent.parent / "data"
-        question_bank_path = data_dir / "question_bank.json"
-
+        # Shared, indexed question bank
         try:
-            with open(question_bank_path, 'r') as f:
-                question_bank = json.load(f)
+            question_bank = get_question_bank_service()
         except FileNotFoundError:
             return {
                 "status": "error",
                 "message": "Question bank not found."
             }
 
+        session_updates: Dict[str, Any] = {}
         if custom_question:
             # Use custom question
             question_data = {
@@ -234,41 +244,33 @@ def ask_behavioral_question(
             }
             category_used = "custom"
         else:
-            # Select from question bank
-            behavioral_questions = question_bank.get(
-                "behavioral_questions", {})
-
-            if category == "random" or category not in behavioral_questions:
-                # Pick random category
-                available_categories = list(behavioral_questions.keys())
-                if not available_categories:
-                    return {
-                        "status": "error",
-                        "message": "No behavioral questions available in question bank."
-                    }
-                category_used = random.choice(available_categories)
-            else:
-                category_used = category
-
-            # Get questions from selected category
-            category_questions = behavioral_questions.get(category_used, [])
-            if not category_questions:
+            # Draw an unasked question from the requested category, or the
+            # most relevant one to the session's focus areas from any category
+            available_categories = question_bank.categories("behavioral_questions")
+            if not available_categories:
                 return {
                     "status": "error",
-                    "message": f"No questions available for category: {category_used}"
+                    "message": "No behavioral questions available in question bank."
                 }
 
-            # Select a question we haven't asked yet in this session
-            asked_questions = {q.get("question", "")
-                               for q in session_data.get("questions_asked", [])}
-            available_questions = [
-                q for q in category_questions if q["question"] not in asked_questions]
-
-            if not available_questions:
-                # If all questions in category have been asked, pick any from category
-                available_questions = category_questions
+            sampler = get_question_sampler(session_id, session_data)
+            question_data = None
+            if category in available_categories:
+                question_data = sampler.next(question_bank, "behavioral_questions", category)
+            if question_data is None:
+                question_data = sampler.next(question_bank, "behavioral_questions")
 
-            question_data = random.choice(available_questions)
+            if question_data is None:
+                return {
+                    "status": "error",
+                    "message": "Every behavioral question in the bank has been asked in this session. "
+                               "Ask a custom question instead.",
+                    "exhausted": True
+                }
+            # The bank may have reloaded without this question since it was drawn
+            location = question_bank.locate(question_data["id"])
+            category_used = location[1] if location else (category or "behavioral")
+            session_updates["question_sampler"] = sampler.to_dict()
 
         # Update session data
         question_number = len(session_data.get("questions_asked", [])) + 1
@@ -285,7 +287,17 @@ def ask_behavioral_question(
         session_data["current_question"] = question_number
 
         # Save updated session
-        save_session_data(session_id, session_data)
+        saved = append_session_entries(
+            session_id,
+            {"questions_asked": [question_entry]},
+            {"current_question": question_number, **session_updates},
+            expected_version=session_data.get("version")
+        )
+        if not saved:
+            return {
+                "status": "error",
+                "message": "Failed to save session data."
+            }
 
         # Format the question presentation
         question_text = f"""
@@ -310,6 +322,11 @@ def ask_behavioral_question(
             "follow_up_questions": question_data.get("follow_ups", [])
         }
 
+    except SessionConflictError:
+        return {
+            "status": "error",
+            "message": "The session was updated by another request. Please ask the question again."
+        }
     except Exception as e:
         return {
             "status": "error",
@@ -317,6 +334,7 @@ def ask_behavioral_question(
         }
 
 
+@with_session_lock
 def ask_technical_question(
     session_id: str,
     domain: str,
@@ -353,19 +371,16 @@ def ask_technical_question(
                 "message": "Session not found. Please start a new interview session."
             }
 
-        # Load question bank
-        data_dir = Path(__file__).parent.parent / "data"
-        question_bank_path = data_dir / "question_bank.json"
-
+        # Shared, indexed question bank
         try:
-            with open(question_bank_path, 'r') as f:
-                question_bank = json.load(f)
+            question_bank = get_question_bank_service()
         except FileNotFoundError:
             return {
                 "status": "error",
                 "message": "Question bank not found."
             }
 
+        session_updates: Dict[str, Any] = {}
         if custom_question:
             # Use custom question
             question_data = {
@@ -376,8 +391,7 @@ def ask_technical_question(
             }
         else:
             # Get technical questions for domain
-            technical_questions = question_bank.get("technical_questions", {})
-            domain_questions = technical_questions.get(domain, [])
+            domain_questions = question_bank.questions("technical_questions", domain)
 
             if not domain_questions:
                 return {
@@ -385,23 +399,23 @@ def ask_technical_question(
                     "message": f"No technical questions available for domain: {domain}"
                 }
 
-            # Filter by difficulty if specified
+            # Draw an unasked question, preferring the requested difficulty
+            sampler = get_question_sampler(session_id, session_data)
+            question_data = None
             if difficulty != "medium":
-                filtered_questions = [
-                    q for q in domain_questions if q.get("difficulty") == difficulty]
-                if filtered_questions:
-                    domain_questions = filtered_questions
+                question_data = sampler.next(
+                    question_bank, "technical_questions", domain, difficulty)
+            if question_data is None:
+                question_data = sampler.next(question_bank, "technical_questions", domain)
 
-            # Select question not asked in this session
-            asked_questions = {q.get("question", "")
-                               for q in session_data.get("questions_asked", [])}
-            available_questions = [
-                q for q in domain_questions if q["question"] not in asked_questions]
-
-            if not available_questions:
-                available_questions = domain_questions
-
-            question_data = random.choice(available_questions)
+            if question_data is None:
+                return {
+                    "status": "error",
+                    "message": f"Every {domain.replace('_', ' ')} question in the bank has been asked "
+                               "in this session. Try another domain or ask a custom question.",
+                    "exhausted": True
+                }
+            session_updates["question_sampler"] = sampler.to_dict()
 
         # Update session data
         question_number = len(session_data.get("questions_asked", [])) + 1
@@ -418,7 +432,17 @@ def ask_technical_question(
 
         session_data.setdefault("questions_asked", []).append(question_entry)
         session_data["current_question"] = question_number
-        save_session_data(session_id, session_data)
+        saved = append_session_entries(
+            session_id,
+            {"questions_asked": [question_entry]},
+            {"current_question": question_number, **session_updates},
+            expected_version=session_data.get("version")
+        )
+        if not saved:
+            return {
+                "status": "error",
+                "message": "Failed to save session data."
+            }
 
         # Format technical question
         question_text = f"""
@@ -447,6 +471,11 @@ Take your time and feel free to ask clarifying questions.
             }
         }
 
+    except SessionConflictError:
+        return {
+            "status": "error",
+            "message": "The session was updated by another request. Please ask the question again."
+        }
     except Exception as e:
         return {
             "status": "error",
@@ -564,10 +593,15 @@ Overall, this was a solid response that demonstrates relevant experience!
             "answered_at": datetime.now().isoformat()
         }
 
-        session_data.setdefault("feedback_given", []).append(feedback_entry)
-        session_data.setdefault("answers_given", []).append(answer_entry)
-
-        save_session_data(session_id, session_data)
+        saved = append_session_entries(session_id, {
+            "feedback_given": [feedback_entry],
+            "answers_given": [answer_entry]
+        })
+        if not saved:
+            return {
+                "status": "error",
+                "message": "Failed to save session data."
+            }
 
         return {
             "status": "success",
@@ -614,12 +648,8 @@ def evaluate_answer(
             }
 
         # Load feedback criteria
-        data_dir = Path(__file__).parent.parent / "data"
-        config_path = data_dir / "interview_config.json"
-
         try:
-            with open(config_path, 'r') as f:
-                config = json.load(f)
+            config = load_interview_config()
             criteria = config.get("feedback_criteria", {})
         except FileNotFoundError:
             # Use default criteria
@@ -689,8 +719,12 @@ def evaluate_answer(
             "evaluation_time": datetime.now().isoformat()
         }
 
-        session_data.setdefault("scores", []).append(evaluation)
-        save_session_data(session_id, session_data)
+        saved = append_session_entries(session_id, {"scores": [evaluation]})
+        if not saved:
+            return {
+                "status": "error",
+                "message": "Failed to save session data."
+            }
 
         # Create evaluation summary
         score_interpretation = ""
@@ -2,12 +2,99 @@
 Utility functions for the Job Interview Roleplay Agent.
 """
 
+import atexit
 import datetime
-from typing import Dict, Any, List
+import functools
+import inspect
+from typing import Dict, Any, List, Optional
 import json
 import os
+import threading
 from pathlib import Path
 
+from . import serializers
+from .question_bank import QuestionBank
+from .question_relevance import QuestionRanker
+from .question_sampler import QuestionSampler
+from .question_search import QuestionSearchIndex
+from .session_archive import SessionArchive, SessionArchiver
+from .session_index import IndexedSessionStore, SessionIndex, new_ulid
+from .session_store import (
+    CachedSessionStore,
+    EventLogSessionStore,
+    JsonFileSessionStore,
+    SessionConflictError,
+    SessionLocks,
+    SessionStore,
+    SqliteSessionStore,
+)
+
+try:
+    # Precompiled static data (python -m app.core.build_catalog build), when
+    # running inside the app package
+    from app.core.data_catalog import compiled_interview_config, compiled_question_bank
+except ImportError:
+    compiled_interview_config = compiled_question_bank = None
+
+# Session storage lives next to the package, not in the process working directory
+PACKAGE_DIR = Path(__file__).parent.parent
+SESSIONS_DIR = Path(os.getenv("INTERVIEW_SESSIONS_DIR", PACKAGE_DIR / "interview_sessions"))
+SESSION_DB_PATH = Path(os.getenv("INTERVIEW_SESSION_DB", SESSIONS_DIR / "sessions.db"))
+# "sqlite" (default), "eventlog" for append-only logs with snapshots, or "json"
+# for the legacy one-file-per-session layout
+SESSION_STORE_BACKEND = os.getenv("INTERVIEW_SESSION_STORE", "sqlite")
+# On-disk encoding for the json and eventlog backends: "json" or "msgpack". The
+# sqlite backend always stores JSON columns and ignores this and the codec below
+SESSION_FORMAT = os.getenv("INTERVIEW_SESSION_FORMAT", serializers.JSON)
+# Codec for finished sessions in the json and eventlog backends: "zstd", "gzip" or
+# "none"; defaults to the best available
+SESSION_COMPRESSION = os.getenv("INTERVIEW_SESSION_COMPRESSION", serializers.default_compression())
+# Sessions kept in the write-behind cache (0 disables it) and its flush interval
+SESSION_CACHE_SIZE = int(os.getenv("INTERVIEW_SESSION_CACHE_SIZE", "256"))
+SESSION_FLUSH_INTERVAL = float(os.getenv("INTERVIEW_SESSION_FLUSH_INTERVAL", "1.0"))
+# Secondary index of sessions by user, start date and status
+SESSION_INDEX_PATH = Path(os.getenv("INTERVIEW_SESSION_INDEX", SESSIONS_DIR / "index.db"))
+# Finished and idle sessions are moved to compressed archive bundles here
+ARCHIVE_DIR = Path(os.getenv("INTERVIEW_ARCHIVE_DIR", SESSIONS_DIR / "archive"))
+# Seconds between archiver runs (0 disables background archiving)
+ARCHIVE_INTERVAL = float(os.getenv("INTERVIEW_ARCHIVE_INTERVAL", "3600"))
+ARCHIVE_COMPLETED_AFTER = datetime.timedelta(
+    hours=float(os.getenv("INTERVIEW_ARCHIVE_COMPLETED_AFTER_HOURS", "1")))
+ARCHIVE_IDLE_AFTER = datetime.timedelta(
+    days=float(os.getenv("INTERVIEW_ARCHIVE_IDLE_AFTER_DAYS", "7")))
+# Question bank file, reloaded when its mtime changes (checked at most this often)
+QUESTION_BANK_PATH = Path(os.getenv(
+    "INTERVIEW_QUESTION_BANK", PACKAGE_DIR / "data" / "question_bank.json"))
+QUESTION_BANK_CHECK_INTERVAL = float(os.getenv("INTERVIEW_QUESTION_BANK_CHECK_INTERVAL", "2.0"))
+INTERVIEW_CONFIG_PATH = PACKAGE_DIR / "data" / "interview_config.json"
+# Fixed seed for question order, for reproducible runs; by default each session seeds its own
+QUESTION_SEED = os.getenv("INTERVIEW_QUESTION_SEED")
+
+_session_store: Optional[SessionStore] = None
+_session_archiver: Optional[SessionArchiver] = None
+_session_index: Optional[SessionIndex] = None
+_question_bank: Optional[QuestionBank] = None
+_question_bank_lock = threading.Lock()
+_question_search: Optional[QuestionSearchIndex] = None
+_question_ranker: Optional[QuestionRanker] = None
+
+# Tools that read a session and write back something derived from it hold the
+# session's lock, so independent tool calls can still run in parallel
+session_locks = SessionLocks()
+
+
+def with_session_lock(func):
+    """Run a tool while holding the lock of the session named by its `session_id` argument."""
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        session_id = signature.bind_partial(*args, **kwargs).arguments.get("session_id")
+        with session_locks.lock(session_id):
+            return func(*args, **kwargs)
+
+    return wrapper
+
 
 def get_current_time() -> str:
     """Get current date and time formatted for display."""
@@ -79,59 +166,285 @@ def calculate_interview_score(answers: List[Dict[str, Any]]) -> Dict[str, Any]:
     }
 
 
-def save_session_data(session_id: str, data: Dict[str, Any]) -> bool:
+def get_session_store() -> SessionStore:
+    """Get the configured session store, creating it on first use."""
+    global _session_store, _session_index
+    if _session_store is None:
+        compression = None if SESSION_COMPRESSION == "none" else SESSION_COMPRESSION
+        if SESSION_STORE_BACKEND == "json":
+            _session_store = JsonFileSessionStore(
+                SESSIONS_DIR, fmt=SESSION_FORMAT, compression=compression)
+        elif SESSION_STORE_BACKEND == "eventlog":
+            _session_store = EventLogSessionStore(
+                SESSIONS_DIR / "events", fmt=SESSION_FORMAT, compression=compression)
+        else:
+            # Sessions saved as JSON files by earlier versions are imported on first load
+            _session_store = SqliteSessionStore(
+                SESSION_DB_PATH, legacy_dir=Path("interview_sessions"))
+        if SESSION_CACHE_SIZE > 0:
+            _session_store = CachedSessionStore(
+                _session_store, SESSION_CACHE_SIZE, SESSION_FLUSH_INTERVAL)
+        _session_index = SessionIndex(SESSION_INDEX_PATH)
+        if _session_index.is_new:
+            # Index sessions written before the index existed
+            _session_index.rebuild(_session_store)
+        _session_store = IndexedSessionStore(_session_store, _session_index)
+        # Buffered writes must reach storage before the process exits
+        atexit.register(close_session_store)
+        if ARCHIVE_INTERVAL > 0:
+            get_session_archiver().start(ARCHIVE_INTERVAL)
+    return _session_store
+
+
+def get_session_archiver() -> SessionArchiver:
+    """Get the archiver for the configured session store."""
+    global _session_archiver
+    if _session_archiver is None:
+        _session_archiver = SessionArchiver(
+            get_session_store(),
+            SessionArchive(ARCHIVE_DIR),
+            completed_after=ARCHIVE_COMPLETED_AFTER,
+            idle_after=ARCHIVE_IDLE_AFTER,
+            index=_session_index,
+            locks=session_locks,
+        )
+    return _session_archiver
+
+
+def get_question_bank_service() -> QuestionBank:
+    """
+    Get the shared question bank, loading it on first use.
+
+    Raises:
+        FileNotFoundError: If the question bank file does not exist
+    """
+    global _question_bank
+    if _question_bank is None:
+        with _question_bank_lock:
+            if _question_bank is None:
+                _question_bank = QuestionBank(
+                    QUESTION_BANK_PATH, QUESTION_BANK_CHECK_INTERVAL,
+                    precompiled=compiled_question_bank)
+                # Build the relevance vectors as soon as the bank is loaded, so
+                # the first question asked does not have to wait for them
+                threading.Thread(
+                    target=get_question_ranker, name="question-ranker-build", daemon=True).start()
+    return _question_bank
+
+
+def get_question_search_index() -> QuestionSearchIndex:
+    """Get the full-text index of the shared question bank, building it on first use."""
+    global _question_search
+    if _question_search is None:
+        bank = get_question_bank_service()
+        with _question_bank_lock:
+            if _question_search is None:
+                _question_search = QuestionSearchIndex(bank)
+    return _question_search
+
+
+def load_interview_config() -> Dict[str, Any]:
+    """
+    Interview types, job roles and feedback criteria, from the precompiled
+    catalog when it is current, otherwise from interview_config.json.
+
+    Raises:
+        FileNotFoundError: If the configuration file does not exist
+    """
+    if compiled_interview_config is not None:
+        config = compiled_interview_config(INTERVIEW_CONFIG_PATH)
+        if config is not None:
+            return config
+    with open(INTERVIEW_CONFIG_PATH, 'r') as f:
+        return json.load(f)
+
+
+def get_question_ranker() -> QuestionRanker:
+    """Get the relevance ranker of the shared question bank, building it on first use."""
+    global _question_ranker
+    if _question_ranker is None:
+        bank = get_question_bank_service()
+        with _question_bank_lock:
+            if _question_ranker is None:
+                _question_ranker = QuestionRanker(bank)
+    return _question_ranker
+
+
+def get_question_sampler(session_id: str, session_data: Dict[str, Any]) -> QuestionSampler:
+    """
+    Get the question sampler stored with a session, or a new one for it.
+
+    Questions are drawn in order of relevance to the session's focus areas,
+    role and company.
+    """
+    return QuestionSampler.for_session(
+        session_id, session_data, seed=QUESTION_SEED, ranker=get_question_ranker())
+
+
+def set_session_store(store: SessionStore) -> None:
+    """Replace the session store used by the interview tools."""
+    global _session_store, _session_archiver
+    if _session_archiver is not None:
+        _session_archiver.stop()
+        _session_archiver = None
+    _session_store = store
+
+
+def flush_session_data(session_id: Optional[str] = None) -> None:
+    """Write buffered changes for one session, or all sessions, to storage."""
+    try:
+        if _session_store is not None:
+            _session_store.flush(session_id)
+    except Exception as e:
+        print(f"Error flushing session data: {e}")
+
+
+def compact_session_logs() -> None:
+    """Merge event logs into snapshots when the event-log backend is in use."""
+    store = get_session_store()
+    store.flush()
+    # Look through the index and cache wrappers for the backing store
+    while isinstance(store, (IndexedSessionStore, CachedSessionStore)):
+        store = store.store if isinstance(store, IndexedSessionStore) else store.backing
+    if isinstance(store, EventLogSessionStore):
+        store.compact()
+
+
+def close_session_store() -> None:
+    """Flush buffered changes and close the session store."""
+    global _session_store, _session_archiver, _session_index
+    if _session_archiver is not None:
+        _session_archiver.stop()
+        _session_archiver = None
+    if _session_store is not None:
+        try:
+            _session_store.close()
+        except Exception as e:
+            print(f"Error closing session store: {e}")
+        _session_store = None
+        _session_index = None
+
+
+def save_session_data(
+    session_id: str,
+    data: Dict[str, Any],
+    expected_version: Optional[int] = None
+) -> bool:
     """
-    Save interview session data to file.
+    Save interview session data, replacing any stored version.
     
     Args:
         session_id: Unique session identifier
         data: Session data to save
+        expected_version: Version the data was loaded at, or 0 for a new
+            session; None saves unconditionally
     
     Returns:
         True if successful, False otherwise
+
+    Raises:
+        SessionConflictError: If the session changed since expected_version
     """
     try:
-        sessions_dir = Path("interview_sessions")
-        sessions_dir.mkdir(exist_ok=True)
-        
-        file_path = sessions_dir / f"{session_id}.json"
-        with open(file_path, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
-        
+        # Serialized with the archiver, which moves sessions out under the same lock
+        with session_locks.lock(session_id):
+            get_session_store().save(session_id, data, expected_version)
         return True
+    except SessionConflictError:
+        raise
     except Exception as e:
         print(f"Error saving session data: {e}")
         return False
 
 
-def load_session_data(session_id: str) -> Dict[str, Any]:
+def append_session_entries(
+    session_id: str,
+    entries: Dict[str, List[Dict[str, Any]]],
+    updates: Optional[Dict[str, Any]] = None,
+    expected_version: Optional[int] = None
+) -> bool:
+    """
+    Append entries to a session's collections without rewriting the session.
+    
+    Args:
+        session_id: Unique session identifier
+        entries: New entries keyed by collection, e.g. {"answers_given": [answer]}
+        updates: Scalar session fields to update at the same time
+        expected_version: Version the session was loaded at; None appends unconditionally
+    
+    Returns:
+        True if successful, False otherwise
+
+    Raises:
+        SessionConflictError: If the session changed since expected_version
+    """
+    try:
+        with session_locks.lock(session_id):
+            return get_session_store().append(session_id, entries, updates, expected_version)
+    except SessionConflictError:
+        raise
+    except Exception as e:
+        print(f"Error appending session data: {e}")
+        return False
+
+
+def load_session_data(session_id: str, include_archived: bool = False) -> Dict[str, Any]:
     """
-    Load interview session data from file.
+    Load interview session data.
     
     Args:
         session_id: Unique session identifier
+        include_archived: Restore the session from the archive if it was archived
     
     Returns:
         Session data dictionary or empty dict if not found
     """
     try:
-        sessions_dir = Path("interview_sessions")
-        file_path = sessions_dir / f"{session_id}.json"
-        
-        if file_path.exists():
-            with open(file_path, 'r') as f:
-                return json.load(f)
-        else:
-            return {}
+        data = get_session_store().load(session_id)
+        if not data and include_archived:
+            data = get_session_archiver().rehydrate(session_id)
+        return data
     except Exception as e:
         print(f"Error loading session data: {e}")
         return {}
 
 
 def generate_session_id() -> str:
-    """Generate a unique session ID."""
-    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    return f"interview_{timestamp}"
+    """Generate a unique, time-ordered session ID."""
+    return f"interview_{new_ulid()}"
+
+
+def list_user_sessions(
+    user_id: str,
+    limit: Optional[int] = 10,
+    status: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    List a user's interview sessions, newest first.
+    
+    Args:
+        user_id: User whose sessions to list
+        limit: Maximum number of sessions, or None for all
+        status: Only include sessions with this status
+    
+    Returns:
+        Index entries with session_id, start_date, session_status, interview_type,
+        role and tier ("hot" or "archived")
+    """
+    get_session_store()
+    return _session_index.by_user(user_id, limit, status)
+
+
+def list_sessions_by_date(day: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """List sessions started on a date ("YYYY-MM-DD"), newest first."""
+    get_session_store()
+    return _session_index.by_date(day, limit)
+
+
+def list_sessions_by_status(status: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """List sessions with a status, newest first."""
+    get_session_store()
+    return _session_index.by_status(status, limit)
 
 
 def validate_email(email: str) -> bool:
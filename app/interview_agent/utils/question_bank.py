@@ -0,0 +1,309 @@
+"""
+In-memory, indexed question bank.
+
+The question bank file is read and validated once, and questions are indexed
+by (section, category, difficulty) and by a hash of their text, so tools look
+questions up instead of re-reading and filtering the file on every call.
+The file's mtime is checked at most every `check_interval` seconds; when it
+changes the bank is rebuilt off to the side and swapped in with a single
+assignment, so readers always see either the old bank or the new one.
+
+Sections are the top-level keys of the file (behavioral_questions,
+technical_questions, case_study_questions); categories are the keys within
+a section (leadership, software_engineering, consulting, ...).
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Callable, Dict, Generic, List, Optional, Tuple, TypeVar
+
+DEFAULT_DIFFICULTY = "medium"
+DIFFICULTIES = ("easy", "medium", "hard")
+
+Question = Dict[str, Any]
+BucketKey = Tuple[str, Optional[str], Optional[str]]
+# Returns the already validated bank and its problems for a file, or None
+PrecompiledLoader = Callable[[Path], Optional[Tuple[Dict[str, Dict[str, List[Question]]], List[str]]]]
+Built = TypeVar("Built")
+
+
+def question_hash(text: str) -> str:
+    """Stable id of a question, derived from its whitespace- and case-normalized text."""
+    normalized = " ".join(text.split()).lower()
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16]
+
+
+def validate_question_bank(raw: Dict[str, Any]) -> Tuple[Dict[str, Dict[str, List[Question]]], List[str]]:
+    """
+    Normalize a parsed question bank file.
+
+    Questions without text are dropped. Every kept question gets a lowercase
+    `difficulty` (DEFAULT_DIFFICULTY when missing or unrecognised) and an `id`
+    from question_hash(). A question whose text already appeared anywhere
+    earlier in the bank is dropped, so ids are unique across sections.
+
+    Args:
+        raw: Parsed question bank JSON
+
+    Returns:
+        The normalized bank and a list of problems found
+    """
+    bank: Dict[str, Dict[str, List[Question]]] = {}
+    problems: List[str] = []
+    # question id -> "section.category" it was first seen in
+    seen: Dict[str, str] = {}
+
+    for section, categories in raw.items():
+        if not isinstance(categories, dict):
+            problems.append(f"{section}: expected an object of categories")
+            continue
+
+        bank[section] = {}
+        for category, questions in categories.items():
+            if not isinstance(questions, list):
+                problems.append(f"{section}.{category}: expected a list of questions")
+                continue
+
+            normalized = []
+            for position, question in enumerate(questions):
+                text = question.get("question") if isinstance(question, dict) else None
+                if not isinstance(text, str) or not text.strip():
+                    problems.append(f"{section}.{category}[{position}]: missing question text")
+                    continue
+
+                question_id = question_hash(text)
+                if question_id in seen:
+                    problems.append(
+                        f"{section}.{category}[{position}]: duplicate of a question in {seen[question_id]}")
+                    continue
+                seen[question_id] = f"{section}.{category}"
+
+                difficulty = str(question.get("difficulty") or "").strip().lower()
+                if difficulty not in DIFFICULTIES:
+                    if difficulty:
+                        problems.append(
+                            f"{section}.{category}[{position}]: unknown difficulty '{difficulty}'")
+                    difficulty = DEFAULT_DIFFICULTY
+
+                normalized.append({**question, "id": question_id, "difficulty": difficulty})
+            bank[section][category] = normalized
+
+    return bank, problems
+
+
+class _Snapshot:
+    """One loaded version of the bank with its indexes. Never modified after creation."""
+
+    def __init__(self, bank: Dict[str, Dict[str, List[Question]]], mtime: float):
+        self.bank = bank
+        self.mtime = mtime
+        self.buckets: Dict[BucketKey, Tuple[Question, ...]] = {}
+        self.by_id: Dict[str, Tuple[str, str, Question]] = {}
+
+        for section, categories in bank.items():
+            section_questions: List[Question] = []
+            for category, questions in categories.items():
+                self.buckets[(section, category, None)] = tuple(questions)
+                by_difficulty: Dict[str, List[Question]] = {}
+                for question in questions:
+                    by_difficulty.setdefault(question["difficulty"], []).append(question)
+                    self.by_id[question["id"]] = (section, category, question)
+                for difficulty, bucket in by_difficulty.items():
+                    self.buckets[(section, category, difficulty)] = tuple(bucket)
+                section_questions.extend(questions)
+            self.buckets[(section, None, None)] = tuple(section_questions)
+
+
+class QuestionBank:
+    """
+    The question bank file, loaded once and indexed for constant-time lookups.
+
+    Lookups return shared question dicts; callers must not modify them.
+    """
+
+    def __init__(self, path: Path, check_interval: float = 2.0,
+                 precompiled: Optional[PrecompiledLoader] = None):
+        """
+        Args:
+            path: Question bank JSON file
+            check_interval: Minimum seconds between mtime checks; 0 checks on every lookup
+            precompiled: Source of an already validated copy of the file, used
+                instead of parsing it when it has one
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+            ValueError: If the file is not valid JSON
+        """
+        self.path = Path(path)
+        self.check_interval = check_interval
+        self.precompiled = precompiled
+        self.problems: List[str] = []
+        # Incremented each time a new version of the file is swapped in
+        self.generation = 0
+        self._reload_lock = threading.Lock()
+        self._checked_at = time.monotonic()
+        self._snapshot = self._load()
+
+    def _load(self) -> _Snapshot:
+        mtime = os.stat(self.path).st_mtime
+        compiled = self.precompiled(self.path) if self.precompiled is not None else None
+        if compiled is not None:
+            bank, problems = compiled
+        else:
+            with open(self.path, 'r') as f:
+                raw = json.load(f)
+            bank, problems = validate_question_bank(raw)
+            for problem in problems:
+                print(f"Question bank {self.path.name}: {problem}")
+        self.problems = problems
+        return _Snapshot(bank, mtime)
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Reloads the bank if the file changed since it was loaded.
+
+        A file that fails to load leaves the current bank in place.
+
+        Args:
+            force: Reload even if the mtime is unchanged
+
+        Returns:
+            True if a new version of the bank was swapped in
+        """
+        with self._reload_lock:
+            self._checked_at = time.monotonic()
+            try:
+                if not force and os.stat(self.path).st_mtime == self._snapshot.mtime:
+                    return False
+                snapshot = self._load()
+            except (OSError, ValueError) as e:
+                print(f"Error reloading question bank: {e}")
+                return False
+            self._snapshot = snapshot
+            self.generation += 1
+            return True
+
+    def _current(self) -> _Snapshot:
+        if time.monotonic() - self._checked_at >= self.check_interval:
+            self.reload()
+        return self._snapshot
+
+    def check(self) -> None:
+        """Reloads the bank if the file changed and the check interval has passed."""
+        self._current()
+
+    def sections(self) -> Dict[str, Dict[str, List[Question]]]:
+        """The whole normalized bank: section -> category -> questions."""
+        return self._current().bank
+
+    def resolve_section(self, name: str) -> Optional[str]:
+        """The section called `name`, accepting short names like "behavioral"; None if unknown."""
+        sections = self._current().bank
+        if name in sections:
+            return name
+        if f"{name}_questions" in sections:
+            return f"{name}_questions"
+        return None
+
+    def categories(self, section: str) -> List[str]:
+        """Category names of a section, in file order."""
+        return list(self._current().bank.get(section, {}))
+
+    def questions(
+        self,
+        section: str,
+        category: Optional[str] = None,
+        difficulty: Optional[str] = None
+    ) -> Tuple[Question, ...]:
+        """
+        Questions in a section, optionally narrowed to a category and difficulty.
+
+        Difficulty is only indexed within a category, so it is ignored when
+        no category is given.
+        """
+        if category is None:
+            difficulty = None
+        return self._current().buckets.get((section, category, difficulty), ())
+
+    def get(self, question_id: str) -> Optional[Question]:
+        """A question by its id, or None."""
+        entry = self._current().by_id.get(question_id)
+        return entry[2] if entry else None
+
+    def locate(self, question_id: str) -> Optional[Tuple[str, str]]:
+        """The (section, category) a question belongs to, or None."""
+        entry = self._current().by_id.get(question_id)
+        return entry[:2] if entry else None
+
+    def find(self, text: str) -> Optional[Question]:
+        """A question by its text, ignoring case and whitespace differences."""
+        return self.get(question_hash(text))
+
+
+class QuestionBankIndex(ABC, Generic[Built]):
+    """
+    Base for structures built from a QuestionBank and rebuilt when it reloads.
+
+    The first build runs in the caller. After a reload, current() keeps
+    returning the previous build while the new one is made on a background
+    thread, so lookups never wait for a rebuild.
+    """
+
+    def __init__(self, bank: QuestionBank):
+        """
+        Args:
+            bank: Question bank to build from; builds follow its reloads
+        """
+        self.bank = bank
+        self._build_lock = threading.Lock()
+        self._rebuild_thread: Optional[threading.Thread] = None
+        self._generation = -1
+        self._built: Optional[Built] = None
+
+    @abstractmethod
+    def _build(self) -> Built:
+        """Builds the structure from the bank's current contents."""
+
+    def _install(self, built: Built) -> None:
+        """Makes a new build the current one."""
+        self._built = built
+
+    def _rebuild(self) -> None:
+        generation = self.bank.generation
+        try:
+            built = self._build()
+        except Exception as e:
+            print(f"Error rebuilding {type(self).__name__}: {e}")
+            # Keep serving the previous build until the bank changes again
+        else:
+            self._install(built)
+        self._generation = generation
+
+    def rebuild(self) -> None:
+        """Rebuilds now, in the caller, if the bank changed since the last build."""
+        self.bank.check()
+        with self._build_lock:
+            if self._generation != self.bank.generation:
+                self._rebuild()
+
+    def current(self) -> Built:
+        """The latest completed build, starting a background rebuild if the bank changed."""
+        self.bank.check()
+        if self._generation == self.bank.generation:
+            return self._built
+        with self._build_lock:
+            if self._built is None:
+                # Nothing to serve yet: build in the caller
+                generation = self.bank.generation
+                self._install(self._build())
+                self._generation = generation
+            elif self._rebuild_thread is None or not self._rebuild_thread.is_alive():
+                self._rebuild_thread = threading.Thread(
+                    target=self._rebuild, name=f"{type(self).__name__}-rebuild", daemon=True)
+                self._rebuild_thread.start()
+        return self._built
@@ -0,0 +1,144 @@
+"""
+Relevance of questions to an interview's focus areas, role and company.
+
+Every question in the bank is turned into a TF-IDF vector over word unigrams
+and bigrams from its text, key points, follow-ups and category name, when the
+bank is loaded. The vectors are stored transposed, as postings lists from
+term to (question, weight), so scoring a profile against the whole bank is
+a sparse matrix-vector product: only the postings of the profile's own
+terms are visited, however large the bank is.
+
+Vectors are L2-normalized, so a score is the cosine similarity between the
+question and the profile text, from 0 (nothing in common) to 1.
+
+When the bank reloads, the vectors are rebuilt on a background thread and
+the previous ones keep scoring until the new ones are ready.
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List
+
+from .question_bank import Question, QuestionBank, QuestionBankIndex
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+STOP_WORDS = frozenset("""
+    a about after all an and any are as at be been but by can could did do
+    does for from had has have how i if in into is it its me my of on or our
+    so than that the their them then there these they this through time to
+    us was we were what when where which while who why will with would you
+    your tell describe explain give example walk
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase content words and adjacent-word bigrams of `text`."""
+    words = []
+    for word in _WORD.findall(text.lower()):
+        if word in STOP_WORDS:
+            continue
+        # Fold simple plurals so "teams" matches "team"
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        words.append(word)
+    return words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+
+
+def _question_text(category: str, question: Question) -> str:
+    parts = [category.replace("_", " "), question.get("question", "")]
+    for field in ("key_points", "key_areas", "follow_ups"):
+        value = question.get(field)
+        if isinstance(value, list):
+            parts.extend(str(item) for item in value)
+    return "\n".join(parts)
+
+
+def _weights(counts: Counter, idf: Dict[str, float]) -> Dict[str, float]:
+    """L2-normalized TF-IDF weights, with sublinear term frequency."""
+    weights = {term: (1.0 + math.log(count) if count > 1 else 1.0) * idf[term]
+               for term, count in counts.items() if term in idf}
+    norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+    if not norm:
+        return {}
+    return {term: weight / norm for term, weight in weights.items()}
+
+
+class _Model:
+    """TF-IDF postings for one version of the bank."""
+
+    def __init__(self, bank: QuestionBank):
+        self.ids: List[str] = []
+        documents: List[Counter] = []
+        for categories in bank.sections().values():
+            for category, questions in categories.items():
+                for question in questions:
+                    self.ids.append(question["id"])
+                    documents.append(Counter(tokenize(_question_text(category, question))))
+
+        document_frequency: Counter = Counter()
+        for counts in documents:
+            document_frequency.update(counts.keys())
+        total = len(documents)
+        self.idf = {term: math.log((1 + total) / (1 + frequency)) + 1.0
+                    for term, frequency in document_frequency.items()}
+
+        self.postings: Dict[str, List[tuple]] = {term: [] for term in self.idf}
+        for index, counts in enumerate(documents):
+            for term, weight in _weights(counts, self.idf).items():
+                self.postings[term].append((index, weight))
+
+
+class QuestionRanker(QuestionBankIndex[_Model]):
+    """Scores questions of a QuestionBank against free-text interview profiles."""
+
+    def __init__(self, bank: QuestionBank):
+        """
+        Args:
+            bank: Question bank to score; vectors are rebuilt when it reloads
+        """
+        super().__init__(bank)
+        self.current()
+
+    def _build(self) -> _Model:
+        return _Model(self.bank)
+
+    def scores(self, profile: str) -> Dict[str, float]:
+        """
+        Relevance of every question that shares a term with `profile`.
+
+        Returns:
+            Question id -> cosine similarity; questions with no shared terms
+            are omitted and score 0
+        """
+        model = self.current()
+        query = _weights(Counter(tokenize(profile)), model.idf)
+        totals: Dict[int, float] = {}
+        for term, query_weight in query.items():
+            for index, weight in model.postings.get(term, ()):
+                totals[index] = totals.get(index, 0.0) + query_weight * weight
+        return {model.ids[index]: score for index, score in totals.items()}
+
+    def rank(self, question_ids: Iterable[str], profile: str) -> List[str]:
+        """
+        `question_ids` ordered from most to least relevant to `profile`.
+
+        The sort is stable, so questions with equal scores keep their
+        incoming order, e.g. a shuffle.
+        """
+        question_ids = list(question_ids)
+        if not profile.strip():
+            return question_ids
+        relevance = self.scores(profile)
+        return sorted(question_ids, key=lambda question_id: -relevance.get(question_id, 0.0))
+
+
+def session_profile(session_data: Dict) -> str:
+    """Free text describing what a session should focus on: focus areas, role and company."""
+    focus_areas = session_data.get("focus_areas") or []
+    if isinstance(focus_areas, str):
+        focus_areas = [focus_areas]
+    # Focus areas are what the candidate asked for, so they count twice
+    parts = list(focus_areas) * 2 + [session_data.get("role") or "", session_data.get("company") or ""]
+    return "\n".join(part for part in parts if part)
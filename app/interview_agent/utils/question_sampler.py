@@ -0,0 +1,140 @@
+"""
+Per-session question sampling without replacement.
+
+Each bucket of the question bank, a (section, category, difficulty) triple,
+gets a shuffled order of question ids the first time a session draws from
+it, and a cursor into that order. Drawing the next question advances the
+cursor, so no question repeats and no per-call filtering is needed.
+
+Shuffles are seeded from the session's seed, the bucket and the number of
+questions drawn when the order was made, so an order can always be made
+again and only the cursors and drawn ids are stored with the session, as
+plain JSON. Each bucket also records a hash of its question ids; when a
+reload changes them, the questions not yet drawn are shuffled afresh. With
+a ranker, each new order is sorted by relevance to the session's focus
+areas, role and company, the shuffle only breaking ties.
+"""
+
+import hashlib
+import random
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .question_bank import Question, QuestionBank, question_hash
+from .question_relevance import QuestionRanker, session_profile
+
+
+class QuestionSampler:
+    """Draws questions for one session, never repeating a question."""
+
+    def __init__(self, seed: Any, state: Optional[Dict[str, Any]] = None,
+                 asked: Iterable[str] = (), ranker: Optional[QuestionRanker] = None,
+                 profile: str = ""):
+        """
+        Args:
+            seed: Seed for the shuffles; ignored when `state` already has one
+            state: Sampler state saved with the session by to_dict()
+            asked: Texts of questions already asked, for sessions started
+                before sampling was tracked
+            ranker: Orders new buckets by relevance to `profile`
+            profile: Text describing what the session focuses on
+        """
+        self.ranker = ranker
+        self.profile = profile
+        state = state or {}
+        self.seed = str(state.get("seed", seed))
+        self._drawn: List[str] = list(state.get("drawn", []))
+        if not state:
+            self._drawn.extend(question_hash(text) for text in asked if text)
+        self._drawn_ids = set(self._drawn)
+        # Buckets saved before orders were derived carry no hash and are reshuffled
+        self._buckets: Dict[str, Dict[str, Any]] = {
+            key: {"hash": bucket["hash"], "start": bucket["start"], "cursor": bucket["cursor"]}
+            for key, bucket in state.get("buckets", {}).items() if "hash" in bucket}
+        # Orders made from the stored buckets, and bucket hashes by bank generation
+        self._orders: Dict[str, List[str]] = {}
+        self._hashes: Dict[str, Tuple[int, str]] = {}
+
+    @classmethod
+    def for_session(cls, session_id: str, session_data: Dict[str, Any],
+                    seed: Optional[str] = None,
+                    ranker: Optional[QuestionRanker] = None) -> "QuestionSampler":
+        """
+        The sampler stored with a session, or a new one.
+
+        Args:
+            session_id: Session identifier, used as the seed unless `seed` is given
+            session_data: Session document
+            seed: Fixed seed, e.g. for reproducible benchmarks
+            ranker: Ranks questions against the session's focus areas, role and company
+        """
+        return cls(
+            seed if seed is not None else session_id,
+            session_data.get("question_sampler"),
+            asked=(q.get("question", "") for q in session_data.get("questions_asked", [])),
+            ranker=ranker,
+            profile=session_profile(session_data),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """State to save with the session."""
+        return {"seed": self.seed, "drawn": list(self._drawn), "buckets": self._buckets}
+
+    @staticmethod
+    def _bucket_key(section: str, category: Optional[str], difficulty: Optional[str]) -> str:
+        return f"{section}/{category or '*'}/{difficulty or '*'}"
+
+    def _bucket_hash(self, bank: QuestionBank, key: str, questions: Iterable[Question]) -> str:
+        cached = self._hashes.get(key)
+        if cached is not None and cached[0] == bank.generation:
+            return cached[1]
+        ids = "\n".join(sorted(q["id"] for q in questions))
+        digest = hashlib.sha1(ids.encode("utf-8")).hexdigest()[:16]
+        self._hashes[key] = (bank.generation, digest)
+        return digest
+
+    def _order(self, key: str, questions: Iterable[Question], start: int) -> List[str]:
+        """The order of a bucket whose shuffle began after `start` draws."""
+        drawn_before = set(self._drawn[:start])
+        order = sorted(q["id"] for q in questions if q["id"] not in drawn_before)
+        random.Random(f"{self.seed}:{key}:{start}").shuffle(order)
+        if self.ranker is not None:
+            order = self.ranker.rank(order, self.profile)
+        return order
+
+    def _bucket(self, bank: QuestionBank, section: str, category: Optional[str],
+                difficulty: Optional[str]) -> Tuple[Dict[str, Any], List[str]]:
+        key = self._bucket_key(section, category, difficulty)
+        questions = bank.questions(section, category, difficulty)
+        digest = self._bucket_hash(bank, key, questions)
+        bucket = self._buckets.get(key)
+        if bucket is None or bucket["hash"] != digest:
+            # New bucket, or the bank was reloaded with a different set of
+            # questions: reshuffle whatever has not been drawn yet
+            bucket = {"hash": digest, "start": len(self._drawn), "cursor": 0}
+            self._buckets[key] = bucket
+            self._orders.pop(key, None)
+        order = self._orders.get(key)
+        if order is None:
+            order = self._orders[key] = self._order(key, questions, bucket["start"])
+        return bucket, order
+
+    def next(self, bank: QuestionBank, section: str, category: Optional[str] = None,
+             difficulty: Optional[str] = None) -> Optional[Question]:
+        """
+        Draws the next unasked question from a bucket.
+
+        Returns:
+            The question, or None if every question in the bucket has been drawn
+        """
+        bucket, order = self._bucket(bank, section, category, difficulty)
+        while bucket["cursor"] < len(order):
+            question_id = order[bucket["cursor"]]
+            bucket["cursor"] += 1
+            question = bank.get(question_id)
+            # Skip questions drawn through another bucket or removed from the bank
+            if question is None or question_id in self._drawn_ids:
+                continue
+            self._drawn.append(question_id)
+            self._drawn_ids.add(question_id)
+            return question
+        return None
@@ -0,0 +1,204 @@
+"""
+Full-text and faceted search over the question bank.
+
+Questions are loaded into an in-memory SQLite database with an FTS5 index
+over their text, key points and follow-ups, plus a plain table of facets
+(section, category, difficulty) with an index per facet. Keyword queries are
+ranked with BM25, weighting matches in the question text above matches in
+key points and follow-ups. Facet counts are computed over the matching set
+in SQL, so neither searching nor counting scans the bank in Python.
+
+The index is rebuilt when the question bank reloads a changed file. The new
+database is built on a background thread and swapped in when complete;
+queries keep using the current one meanwhile, so a reload never stalls them.
+"""
+
+import re
+import threading
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import StaticPool
+
+from .question_bank import QuestionBank, QuestionBankIndex
+
+FACETS = ("section", "category", "difficulty")
+
+# BM25 column weights: question text, key points, follow-ups
+RANK_WEIGHTS = (4.0, 2.0, 1.0)
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+
+def _match_expression(query: str, operator: str) -> Optional[str]:
+    """FTS5 query for the words in `query`, each quoted so punctuation cannot break the syntax."""
+    terms = _TERM.findall(query.lower())
+    if not terms:
+        return None
+    return f" {operator} ".join(f'"{term}"' for term in terms)
+
+
+def _as_text(value: Any) -> str:
+    if isinstance(value, list):
+        return "\n".join(str(item) for item in value)
+    return str(value or "")
+
+
+class QuestionSearchIndex(QuestionBankIndex[Engine]):
+    """Keyword search with facet counts over a QuestionBank."""
+
+    def __init__(self, bank: QuestionBank):
+        """
+        Args:
+            bank: Question bank to index; the index follows its reloads
+        """
+        super().__init__(bank)
+        # Builds run outside the query lock; the in-memory database is a single
+        # connection, so queries on it are serialized
+        self._query_lock = threading.Lock()
+        self.current()
+
+    def _build(self) -> Engine:
+        engine = create_engine(
+            "sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+        rows = []
+        for section, categories in self.bank.sections().items():
+            for category, questions in categories.items():
+                for question in questions:
+                    rows.append({
+                        "rowid": len(rows) + 1,
+                        "id": question["id"],
+                        "section": section,
+                        "category": category,
+                        "difficulty": question["difficulty"],
+                        "question": question["question"],
+                        "key_points": _as_text(question.get("key_points") or question.get("key_areas")),
+                        "follow_ups": _as_text(question.get("follow_ups")),
+                    })
+
+        with engine.begin() as conn:
+            conn.execute(text(
+                "CREATE TABLE questions ("
+                " rowid INTEGER PRIMARY KEY, id TEXT NOT NULL,"
+                " section TEXT NOT NULL, category TEXT NOT NULL, difficulty TEXT NOT NULL)"))
+            for facet in FACETS:
+                conn.execute(text(f"CREATE INDEX ix_questions_{facet} ON questions ({facet})"))
+            conn.execute(text(
+                "CREATE VIRTUAL TABLE question_text USING fts5("
+                " question, key_points, follow_ups, tokenize = 'porter unicode61')"))
+            if rows:
+                conn.execute(text(
+                    "INSERT INTO questions (rowid, id, section, category, difficulty)"
+                    " VALUES (:rowid, :id, :section, :category, :difficulty)"), rows)
+                conn.execute(text(
+                    "INSERT INTO question_text (rowid, question, key_points, follow_ups)"
+                    " VALUES (:rowid, :question, :key_points, :follow_ups)"), rows)
+            conn.execute(text("INSERT INTO question_text (question_text) VALUES ('optimize')"))
+        return engine
+
+    def _install(self, engine: Engine) -> None:
+        # Queries read the engine under the query lock, so none still uses
+        # the previous one once it has been swapped out
+        with self._query_lock:
+            previous, self._built = self._built, engine
+        if previous is not None:
+            previous.dispose()
+
+    def search(
+        self,
+        query: str = "",
+        section: Optional[str] = None,
+        category: Optional[str] = None,
+        difficulty: Optional[str] = None,
+        limit: int = 10,
+        offset: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Finds questions matching keywords and facet filters.
+
+        All keywords must match; if no question matches them all, questions
+        matching any keyword are returned instead. An empty query matches
+        every question that passes the filters.
+
+        Args:
+            query: Keywords searched in question text, key points and follow-ups
+            section: Only questions in this section, e.g. "technical_questions"
+            category: Only questions in this category
+            difficulty: Only questions of this difficulty
+            limit: Maximum number of results
+            offset: Number of ranked results to skip
+
+        Returns:
+            Dictionary with the total match count, ranked results (question
+            id, facets, text and score) and facet counts over all matches
+        """
+        filters, params = [], {"limit": limit, "offset": offset}
+        for facet, value in (("section", section), ("category", category),
+                             ("difficulty", difficulty)):
+            if value:
+                filters.append(f"q.{facet} = :{facet}")
+                params[facet] = value
+
+        def clauses(match: Optional[str]):
+            if match is None:
+                where = filters
+                source, score, order = "questions q", "0.0", "q.rowid"
+            else:
+                params["match"] = match
+                where = filters + ["question_text MATCH :match"]
+                # CROSS JOIN keeps the full-text match as the outer loop, so
+                # SQLite never runs MATCH once per row of a facet index
+                source = "question_text CROSS JOIN questions q ON q.rowid = question_text.rowid"
+                score = f"bm25(question_text, {', '.join(map(str, RANK_WEIGHTS))})"
+                order = "score"
+            where_sql = f" WHERE {' AND '.join(where)}" if where else ""
+            return source + where_sql, score, order
+
+        self.current()
+        with self._query_lock, self._built.connect() as conn:
+            match = _match_expression(query, "AND")
+            match_mode = "all" if match else None
+            source, score, order = clauses(match)
+            total = conn.execute(text(f"SELECT count(*) FROM {source}"), params).scalar()
+            if not total and match and " AND " in match:
+                # No question has every keyword: fall back to any keyword
+                match_mode = "any"
+                source, score, order = clauses(_match_expression(query, "OR"))
+                total = conn.execute(text(f"SELECT count(*) FROM {source}"), params).scalar()
+
+            rows = conn.execute(text(
+                f"SELECT q.id, q.section, q.category, q.difficulty, {score} AS score"
+                f" FROM {source} ORDER BY {order} LIMIT :limit OFFSET :offset"),
+                params).mappings().all()
+
+            facets = {}
+            for facet in FACETS:
+                facets[facet] = dict(conn.execute(text(
+                    f"SELECT q.{facet}, count(*) FROM {source}"
+                    f" GROUP BY q.{facet} ORDER BY count(*) DESC"), params).all())
+
+        results = []
+        for row in rows:
+            question = self.bank.get(row["id"]) or {}
+            results.append({
+                "id": row["id"],
+                "section": row["section"],
+                "category": row["category"],
+                "difficulty": row["difficulty"],
+                "question": question.get("question", ""),
+                # bm25() is lower for better matches; report higher-is-better
+                "score": round(-row["score"], 4) or 0.0,
+            })
+
+        return {
+            "total": total,
+            "match": match_mode,
+            "results": results,
+            "facets": facets,
+        }
+
+    def close(self) -> None:
+        with self._query_lock:
+            if self._built is not None:
+                self._built.dispose()
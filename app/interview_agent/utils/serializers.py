@@ -0,0 +1,145 @@
+"""
+Serialization of interview session data.
+
+Session documents can be written as compact JSON (using orjson when it is
+installed) or msgpack, optionally compressed with zstd or gzip. Readers never
+need to know how a document was written: compression is recognised by its
+magic bytes and the payload format by its first byte, so files written in any
+supported format, including the original indented JSON, load the same way.
+"""
+
+import datetime
+import gzip
+import json
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+JSON = "json"
+MSGPACK = "msgpack"
+
+GZIP = "gzip"
+ZSTD = "zstd"
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+FORMAT_SUFFIXES = {JSON: ".json", MSGPACK: ".msgpack"}
+COMPRESSION_SUFFIXES = {GZIP: ".gz", ZSTD: ".zst"}
+
+
+def _default(value: Any) -> Any:
+    """Fallback for values JSON and msgpack cannot encode natively."""
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    return str(value)
+
+
+def available_formats() -> list:
+    """Payload formats usable in this environment."""
+    return [JSON] + ([MSGPACK] if msgpack is not None else [])
+
+
+def available_compressions() -> list:
+    """Compression codecs usable in this environment."""
+    return ([ZSTD] if zstandard is not None else []) + [GZIP]
+
+
+def default_compression() -> str:
+    """The best compression codec available: zstd if installed, otherwise gzip."""
+    return available_compressions()[0]
+
+
+def file_suffix(fmt: str = JSON, compression: Optional[str] = None) -> str:
+    """File name suffix for documents written by encode(), e.g. ".json" or ".msgpack.zst"."""
+    return FORMAT_SUFFIXES[fmt] + (COMPRESSION_SUFFIXES[compression] if compression else "")
+
+
+def file_suffixes() -> list:
+    """Every suffix file_suffix() can return."""
+    return [fmt_suffix + codec_suffix
+            for fmt_suffix in FORMAT_SUFFIXES.values()
+            for codec_suffix in ("", *COMPRESSION_SUFFIXES.values())]
+
+
+def dumps_json(value: Any) -> bytes:
+    """Encode a value as compact JSON."""
+    if orjson is not None:
+        return orjson.dumps(value, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, separators=(",", ":"), default=_default).encode()
+
+
+def loads_json(data: bytes) -> Any:
+    """Decode JSON bytes or text."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def encode(value: Any, fmt: str = JSON, compression: Optional[str] = None) -> bytes:
+    """
+    Serialize a session document.
+
+    Args:
+        value: Document to encode
+        fmt: Payload format, JSON or MSGPACK
+        compression: GZIP, ZSTD or None for uncompressed output
+
+    Returns:
+        Encoded bytes, readable with decode()
+    """
+    if fmt == MSGPACK:
+        if msgpack is None:
+            raise ValueError("msgpack format requested but msgpack is not installed")
+        payload = msgpack.packb(value, default=_default, use_bin_type=True)
+    elif fmt == JSON:
+        payload = dumps_json(value)
+    else:
+        raise ValueError(f"Unknown session data format: {fmt}")
+
+    if compression is None:
+        return payload
+    if compression == GZIP:
+        return gzip.compress(payload, compresslevel=6)
+    if compression == ZSTD:
+        if zstandard is None:
+            raise ValueError("zstd compression requested but zstandard is not installed")
+        return zstandard.ZstdCompressor(level=3).compress(payload)
+    raise ValueError(f"Unknown compression: {compression}")
+
+
+def decode(data: bytes) -> Any:
+    """
+    Deserialize a session document written by encode() or as plain JSON.
+
+    Raises:
+        ValueError: If the data is in a format that cannot be read here
+    """
+    if data.startswith(GZIP_MAGIC):
+        data = gzip.decompress(data)
+    elif data.startswith(ZSTD_MAGIC):
+        if zstandard is None:
+            raise ValueError("Session data is zstd-compressed but zstandard is not installed")
+        data = zstandard.ZstdDecompressor().decompressobj().decompress(data)
+
+    stripped = data.lstrip()
+    if not stripped or stripped[:1] in (b"{", b"["):
+        return loads_json(data)
+    if msgpack is None:
+        raise ValueError("Session data is msgpack-encoded but msgpack is not installed")
+    return msgpack.unpackb(data, raw=False)
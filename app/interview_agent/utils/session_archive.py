@@ -0,0 +1,262 @@
+"""
+Archival of finished and idle interview sessions.
+
+Sessions that are completed, or have not been touched for a long time, are
+moved out of the session store into compressed, date-partitioned bundle
+files. One bundle holds every session archived for a given start date, and
+an append-only index maps each session id to its bundle and byte range, so
+an archived session can be read back without scanning bundles. Restoring a
+session appends a removal entry to the index, so a session archived again
+later has exactly one live bundle record.
+
+Layout::
+
+    <archive_dir>/index.jsonl
+    <archive_dir>/<YYYY>/<MM>/<YYYY-MM-DD>.bundle
+"""
+
+import contextlib
+import os
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from . import serializers
+from .session_index import ARCHIVED, SessionIndex
+from .session_store import SessionLocks, SessionStore
+
+
+class SessionArchive:
+    """Compressed, date-partitioned bundles of archived session documents."""
+
+    def __init__(self, archive_dir: Path, compression: Optional[str] = None):
+        """
+        Args:
+            archive_dir: Directory holding the bundles and the index
+            compression: Codec for archived documents; defaults to the best available
+        """
+        self.archive_dir = Path(archive_dir)
+        self.compression = compression or serializers.default_compression()
+        self._lock = threading.Lock()
+        self._index: Optional[Dict[str, Dict[str, Any]]] = None
+
+    @property
+    def index_path(self) -> Path:
+        return self.archive_dir / "index.jsonl"
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        if self._index is None:
+            self._index = {}
+            if self.index_path.exists():
+                with open(self.index_path, 'rb') as f:
+                    for line in f:
+                        if line.strip():
+                            entry = serializers.loads_json(line)
+                            # Later entries supersede earlier ones for the same session
+                            if entry.get("removed"):
+                                self._index.pop(entry["session_id"], None)
+                            else:
+                                self._index[entry["session_id"]] = entry
+        return self._index
+
+    @staticmethod
+    def _partition_date(data: Dict[str, Any]) -> datetime:
+        try:
+            return datetime.fromisoformat(data.get("start_time", ""))
+        except (TypeError, ValueError):
+            return datetime.now()
+
+    def contains(self, session_id: str) -> bool:
+        """True if the session has been archived."""
+        with self._lock:
+            return session_id in self._load_index()
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Index entries of all archived sessions."""
+        with self._lock:
+            return list(self._load_index().values())
+
+    def add(self, session_id: str, data: Dict[str, Any]) -> None:
+        """Appends a session document to its date's bundle and records it in the index."""
+        payload = serializers.encode(data, serializers.JSON, self.compression)
+        day = self._partition_date(data)
+        bundle = Path(f"{day:%Y}") / f"{day:%m}" / f"{day:%Y-%m-%d}.bundle"
+
+        with self._lock:
+            index = self._load_index()
+            bundle_path = self.archive_dir / bundle
+            bundle_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(bundle_path, 'ab') as f:
+                offset = f.seek(0, os.SEEK_END)
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+
+            entry = {
+                "session_id": session_id,
+                "bundle": bundle.as_posix(),
+                "offset": offset,
+                "length": len(payload),
+                "session_status": data.get("session_status"),
+                "start_time": data.get("start_time"),
+                "archived_at": datetime.now().isoformat(),
+            }
+            # The bundle is durable before the index points at it
+            with open(self.index_path, 'ab') as f:
+                f.write(serializers.dumps_json(entry) + b"\n")
+            index[session_id] = entry
+
+    def remove(self, session_id: str) -> None:
+        """
+        Drops a session from the index, e.g. once it is back in the store.
+
+        Its bundle record stays in place but is no longer reachable.
+        """
+        with self._lock:
+            index = self._load_index()
+            if session_id not in index:
+                return
+            self.archive_dir.mkdir(parents=True, exist_ok=True)
+            entry = {
+                "session_id": session_id,
+                "removed": True,
+                "removed_at": datetime.now().isoformat(),
+            }
+            with open(self.index_path, 'ab') as f:
+                f.write(serializers.dumps_json(entry) + b"\n")
+            del index[session_id]
+
+    def load(self, session_id: str) -> Dict[str, Any]:
+        """Reads an archived session, or returns an empty dict if it is not archived."""
+        with self._lock:
+            entry = self._load_index().get(session_id)
+        if entry is None:
+            return {}
+        with open(self.archive_dir / entry["bundle"], 'rb') as f:
+            f.seek(entry["offset"])
+            return serializers.decode(f.read(entry["length"]))
+
+
+class SessionArchiver:
+    """
+    Moves completed and idle sessions from a session store into an archive.
+
+    A session is archived once it has been finished for `completed_after`, or
+    untouched for `idle_after` whatever its status. run_once() can be called
+    directly; start() runs it periodically on a daemon thread.
+    """
+
+    def __init__(
+        self,
+        store: SessionStore,
+        archive: SessionArchive,
+        completed_after: timedelta = timedelta(hours=1),
+        idle_after: timedelta = timedelta(days=7),
+        index: Optional[SessionIndex] = None,
+        locks: Optional[SessionLocks] = None
+    ):
+        """
+        Args:
+            store: Store sessions are archived from and restored into
+            archive: Destination for archived sessions
+            completed_after: How long a finished session stays in the store
+            idle_after: How long any session may go untouched before archiving
+            index: Session index whose entries are kept, marked archived, when
+                a session leaves the store
+            locks: Per-session locks held by writers of the store; a session
+                is archived and restored while holding its lock
+        """
+        self.store = store
+        self.archive = archive
+        self.index = index
+        self.locks = locks
+        self.completed_after = completed_after
+        self.idle_after = idle_after
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _lock(self, session_id: str):
+        return self.locks.lock(session_id) if self.locks is not None else contextlib.nullcontext()
+
+    def _is_due(self, summary: Dict[str, Any], data: Dict[str, Any], now: datetime) -> bool:
+        age = now - summary["updated_at"]
+        if age >= self.idle_after:
+            return True
+        return data.get("session_status", "active") != "active" and age >= self.completed_after
+
+    def run_once(self) -> int:
+        """
+        Archives every session that is due.
+
+        Returns:
+            The number of sessions archived
+        """
+        now = datetime.now()
+        archived = 0
+        for summary in self.store.list_sessions():
+            # Skip loading sessions that cannot be due yet
+            if now - summary["updated_at"] < min(self.completed_after, self.idle_after):
+                continue
+            if summary["session_status"] == "active" and \
+                    now - summary["updated_at"] < self.idle_after:
+                continue
+
+            session_id = summary["session_id"]
+            try:
+                with self._lock(session_id):
+                    data = self.store.load(session_id)
+                    if not data or not self._is_due(summary, data, now):
+                        continue
+                    self.archive.add(session_id, data)
+                    # A writer not holding the lock may have changed the session
+                    # while it was being archived: keep it in the store
+                    if self.store.load(session_id).get("version") != data.get("version"):
+                        self.archive.remove(session_id)
+                        continue
+                    self.store.delete(session_id)
+                    if self.index is not None:
+                        self.index.record(session_id, data, tier=ARCHIVED)
+                archived += 1
+            except Exception as e:
+                print(f"Error archiving session {session_id}: {e}")
+        return archived
+
+    def rehydrate(self, session_id: str) -> Dict[str, Any]:
+        """
+        Restores an archived session into the store and removes it from the archive.
+
+        The session keeps the version it was archived at.
+
+        Returns:
+            The restored session data, or an empty dict if it is not archived
+        """
+        with self._lock(session_id):
+            data = self.store.load(session_id)
+            if data:
+                return data
+            data = self.archive.load(session_id)
+            if data:
+                self.store.save(session_id, data, new_version=data.get("version") or None)
+                self.archive.remove(session_id)
+                data = self.store.load(session_id)
+        return data
+
+    def start(self, interval: float) -> None:
+        """Runs run_once() every `interval` seconds on a daemon thread."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, args=(interval,), name="session-archiver", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops the background thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            self.run_once()
@@ -0,0 +1,223 @@
+"""
+Session ids and the secondary index of interview sessions.
+
+Session ids are ULID-style: a millisecond timestamp followed by random bits,
+encoded in Crockford base32, so they are unique across processes and sort
+in creation order. The index is a small SQLite table keyed by session id
+with composite indexes on user, start date and status. Because ids sort by
+time, "latest sessions for a user" is an index range scan read backwards.
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import (
+    Column,
+    Index,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+    delete,
+    event,
+    select,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from .session_store import SessionStore
+
+CROCKFORD_BASE32 = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+HOT = "hot"
+ARCHIVED = "archived"
+
+_ulid_lock = threading.Lock()
+_last_ulid = (0, 0)
+
+
+def new_ulid() -> str:
+    """
+    Generate a 26-character ULID.
+
+    Ids generated in the same millisecond increment the random part, so they
+    still sort in generation order within this process.
+    """
+    global _last_ulid
+    with _ulid_lock:
+        timestamp = time.time_ns() // 1_000_000
+        last_timestamp, last_random = _last_ulid
+        if timestamp <= last_timestamp:
+            timestamp = last_timestamp
+            randomness = last_random + 1
+        else:
+            randomness = int.from_bytes(os.urandom(10), "big")
+        _last_ulid = (timestamp, randomness)
+
+    value = (timestamp << 80) | (randomness & ((1 << 80) - 1))
+    chars = []
+    for _ in range(26):
+        chars.append(CROCKFORD_BASE32[value & 31])
+        value >>= 5
+    return "".join(reversed(chars))
+
+
+class SessionIndex:
+    """Persistent lookup of sessions by user, start date and status."""
+
+    def __init__(self, db_path: Path):
+        """
+        Args:
+            db_path: SQLite database file, created if missing
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.is_new = not self.db_path.exists()
+        self.engine = create_engine(
+            f"sqlite:///{self.db_path}", connect_args={"check_same_thread": False})
+        event.listen(self.engine, "connect", self._configure_connection)
+
+        self.metadata = MetaData()
+        self.sessions = Table(
+            "session_index", self.metadata,
+            Column("session_id", String, primary_key=True),
+            Column("user_id", String),
+            Column("start_date", String),
+            Column("session_status", String),
+            Column("interview_type", String),
+            Column("role", String),
+            Column("tier", String, nullable=False, default=HOT),
+            Index("ix_session_index_user", "user_id", "session_id"),
+            Index("ix_session_index_date", "start_date", "session_id"),
+            Index("ix_session_index_status", "session_status", "session_id"),
+        )
+        self.metadata.create_all(self.engine)
+
+    @staticmethod
+    def _configure_connection(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+    @staticmethod
+    def _row(session_id: str, data: Dict[str, Any], tier: str) -> Dict[str, Any]:
+        return {
+            "session_id": session_id,
+            "user_id": data.get("user_id"),
+            "start_date": (data.get("start_time") or "")[:10] or None,
+            "session_status": data.get("session_status"),
+            "interview_type": data.get("interview_type"),
+            "role": data.get("role"),
+            "tier": tier,
+        }
+
+    def record(self, session_id: str, data: Dict[str, Any], tier: str = HOT) -> None:
+        """Adds or replaces the index entry for a session document."""
+        row = self._row(session_id, data, tier)
+        statement = sqlite_insert(self.sessions).values(**row).on_conflict_do_update(
+            index_elements=["session_id"],
+            set_={key: value for key, value in row.items() if key != "session_id"},
+        )
+        with self.engine.begin() as conn:
+            conn.execute(statement)
+
+    def remove(self, session_id: str) -> None:
+        """Drops a session from the index."""
+        with self.engine.begin() as conn:
+            conn.execute(delete(self.sessions).where(self.sessions.c.session_id == session_id))
+
+    def _query(self, column, value: Any, limit: Optional[int],
+               status: Optional[str] = None) -> List[Dict[str, Any]]:
+        statement = select(self.sessions).where(column == value)
+        if status is not None:
+            statement = statement.where(self.sessions.c.session_status == status)
+        statement = statement.order_by(self.sessions.c.session_id.desc())
+        if limit is not None:
+            statement = statement.limit(limit)
+        with self.engine.connect() as conn:
+            return [dict(row) for row in conn.execute(statement).mappings()]
+
+    def by_user(self, user_id: str, limit: Optional[int] = 10,
+                status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """A user's sessions, newest first."""
+        return self._query(self.sessions.c.user_id, user_id, limit, status)
+
+    def by_date(self, day: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Sessions started on a date ("YYYY-MM-DD"), newest first."""
+        return self._query(self.sessions.c.start_date, day, limit)
+
+    def by_status(self, status: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Sessions with a status, newest first."""
+        return self._query(self.sessions.c.session_status, status, limit)
+
+    def rebuild(self, store: SessionStore) -> int:
+        """
+        Indexes every session in `store`, e.g. for a store that predates the index.
+
+        Returns:
+            The number of sessions indexed
+        """
+        count = 0
+        for summary in store.list_sessions():
+            data = store.load(summary["session_id"])
+            if data:
+                self.record(summary["session_id"], data)
+                count += 1
+        return count
+
+    def close(self) -> None:
+        self.engine.dispose()
+
+
+class IndexedSessionStore(SessionStore):
+    """
+    Session store wrapper that keeps a SessionIndex up to date on every write.
+
+    Only writes that change an indexed field touch the index, so ordinary
+    appends of answers and scores cost nothing extra.
+    """
+
+    INDEXED_FIELDS = ("user_id", "start_time", "session_status", "interview_type", "role")
+
+    def __init__(self, store: SessionStore, index: SessionIndex):
+        self.store = store
+        self.index = index
+
+    def save(self, session_id: str, data: Dict[str, Any],
+             expected_version: Optional[int] = None,
+             new_version: Optional[int] = None) -> None:
+        self.store.save(session_id, data, expected_version, new_version)
+        self.index.record(session_id, data)
+
+    def load(self, session_id: str) -> Dict[str, Any]:
+        return self.store.load(session_id)
+
+    def append(
+        self,
+        session_id: str,
+        entries: Dict[str, List[Dict[str, Any]]],
+        updates: Optional[Dict[str, Any]] = None,
+        expected_version: Optional[int] = None,
+        new_version: Optional[int] = None
+    ) -> bool:
+        appended = self.store.append(session_id, entries, updates, expected_version, new_version)
+        if appended and updates and any(field in updates for field in self.INDEXED_FIELDS):
+            self.index.record(session_id, self.store.load(session_id))
+        return appended
+
+    def list_sessions(self) -> List[Dict[str, Any]]:
+        return self.store.list_sessions()
+
+    def delete(self, session_id: str) -> None:
+        self.store.delete(session_id)
+        self.index.remove(session_id)
+
+    def flush(self, session_id: Optional[str] = None) -> None:
+        self.store.flush(session_id)
+
+    def close(self) -> None:
+        self.store.close()
+        self.index.close()
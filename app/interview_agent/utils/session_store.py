@@ -0,0 +1,975 @@
+"""
+Storage backends for interview session data.
+
+A session is a document of scalar fields (role, status, current question,
+...) plus append-only collections of questions, answers, scores, feedback and
+progress saves. Stores expose whole-document save/load for compatibility and
+an append operation so that recording one answer touches one row instead of
+rewriting the whole session.
+
+Documents are encoded through the serializers module, so the on-disk format
+(JSON or msgpack, compressed or not) is a store setting and is detected again
+on read.
+
+Every stored document carries a `version` that increases with each change.
+Writers may pass the version they read as `expected_version`; the write then
+only succeeds if nobody changed the session in between. A store that buffers
+several changes into one write passes the version it assigned as
+`new_version`, so the backing store records the same version.
+"""
+
+import asyncio
+import copy
+import os
+import shutil
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import (
+    JSON,
+    Column,
+    ForeignKey,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+    delete,
+    event,
+    inspect,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from . import serializers
+
+# Session document keys holding append-only lists of entries
+COLLECTIONS = (
+    "questions_asked",
+    "answers_given",
+    "scores",
+    "feedback_given",
+    "progress_saves",
+)
+
+# Scalar session fields stored in their own columns; anything else goes to `attributes`
+SESSION_COLUMNS = (
+    "interview_type",
+    "role",
+    "difficulty_level",
+    "company",
+    "focus_areas",
+    "session_duration",
+    "start_time",
+    "current_question",
+    "session_status",
+)
+
+
+class SessionConflictError(Exception):
+    """Raised when a session changed since the version the writer expected."""
+
+    def __init__(self, session_id: str, expected_version: int, actual_version: int):
+        super().__init__(
+            f"Session {session_id} is at version {actual_version}, "
+            f"expected {expected_version}")
+        self.session_id = session_id
+        self.expected_version = expected_version
+        self.actual_version = actual_version
+
+
+def check_version(session_id: str, expected_version: Optional[int],
+                  actual_version: int) -> None:
+    """Raises SessionConflictError unless `expected_version` is None or matches."""
+    if expected_version is not None and expected_version != actual_version:
+        raise SessionConflictError(session_id, expected_version, actual_version)
+
+
+def atomic_write_bytes(path: Path, content: bytes) -> None:
+    """Writes a file via a temporary file and rename, so readers never see a partial file."""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+class SessionLocks:
+    """
+    Per-session thread and asyncio locks, created on demand.
+
+    Locks are only referenced weakly here, so a session's lock disappears
+    once no caller holds it.
+    """
+
+    def __init__(self):
+        self._guard = threading.Lock()
+        self._thread_locks: "weakref.WeakValueDictionary[str, Any]" = weakref.WeakValueDictionary()
+        self._async_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+    def lock(self, session_id: str):
+        """Returns the reentrant thread lock for a session."""
+        with self._guard:
+            lock = self._thread_locks.get(session_id)
+            if lock is None:
+                lock = threading.RLock()
+                self._thread_locks[session_id] = lock
+            return lock
+
+    def async_lock(self, session_id: str) -> asyncio.Lock:
+        """Returns the asyncio lock for a session."""
+        with self._guard:
+            lock = self._async_locks.get(session_id)
+            if lock is None:
+                lock = asyncio.Lock()
+                self._async_locks[session_id] = lock
+            return lock
+
+
+class SessionStore(ABC):
+    """Interface for interview session persistence."""
+
+    @abstractmethod
+    def save(self, session_id: str, data: Dict[str, Any],
+             expected_version: Optional[int] = None,
+             new_version: Optional[int] = None) -> None:
+        """
+        Replaces the stored session with `data`.
+
+        Args:
+            session_id: Session to write
+            data: Full session document
+            expected_version: Version the caller read, or 0 for a new session;
+                None writes unconditionally
+            new_version: Version to record instead of the next one
+
+        Raises:
+            SessionConflictError: If the stored version differs from expected_version
+        """
+
+    @abstractmethod
+    def load(self, session_id: str) -> Dict[str, Any]:
+        """Returns the session document, or an empty dict if it does not exist."""
+
+    @abstractmethod
+    def append(
+        self,
+        session_id: str,
+        entries: Dict[str, List[Dict[str, Any]]],
+        updates: Optional[Dict[str, Any]] = None,
+        expected_version: Optional[int] = None,
+        new_version: Optional[int] = None
+    ) -> bool:
+        """
+        Appends entries to session collections and updates scalar fields.
+
+        Args:
+            session_id: Session to modify
+            entries: New entries per collection name (see COLLECTIONS)
+            updates: Scalar fields to set in the same operation
+            expected_version: Version the caller read; None appends unconditionally
+            new_version: Version to record instead of the next one
+
+        Returns:
+            True if the session exists and was updated, False otherwise
+
+        Raises:
+            SessionConflictError: If the stored version differs from expected_version
+        """
+
+    @abstractmethod
+    def list_sessions(self) -> List[Dict[str, Any]]:
+        """
+        Lists stored sessions without loading their documents.
+
+        Returns:
+            One dict per session with session_id, session_status (None when the
+            store cannot tell cheaply) and updated_at as a datetime
+        """
+
+    @abstractmethod
+    def delete(self, session_id: str) -> None:
+        """Removes a session; deleting a missing session is not an error."""
+
+    def flush(self, session_id: Optional[str] = None) -> None:
+        """Writes buffered changes for one session, or all sessions, to storage."""
+
+    def close(self) -> None:
+        """Flushes buffered changes and releases resources."""
+        self.flush()
+
+
+def is_finished(data: Dict[str, Any]) -> bool:
+    """True for sessions that are no longer being conducted."""
+    return data.get("session_status", "active") != "active"
+
+
+class JsonFileSessionStore(SessionStore):
+    """
+    One document per session, rewritten on every change.
+
+    Files are replaced atomically and read-modify-write cycles hold a
+    per-session lock, so concurrent calls in one process never lose updates.
+    The file suffix follows the encoding (`.json`, `.msgpack.zst`, ...);
+    a file is read whatever its suffix, so changing the format or codec
+    leaves existing sessions readable and they are renamed when next written.
+    """
+
+    def __init__(self, sessions_dir: Path, fmt: str = serializers.JSON,
+                 compression: Optional[str] = None):
+        """
+        Args:
+            sessions_dir: Directory holding one file per session
+            fmt: Payload format, serializers.JSON or serializers.MSGPACK
+            compression: Codec applied once a session is finished; None stores it uncompressed
+        """
+        self.sessions_dir = Path(sessions_dir)
+        self.fmt = fmt
+        self.compression = compression
+        self._locks = SessionLocks()
+
+    def _paths(self, session_id: str) -> List[Path]:
+        return [self.sessions_dir / f"{session_id}{suffix}"
+                for suffix in serializers.file_suffixes()]
+
+    def _path(self, session_id: str) -> Optional[Path]:
+        """The session's file, or None; the newest one if an interrupted write left two."""
+        existing = [path for path in self._paths(session_id) if path.exists()]
+        return max(existing, key=lambda path: path.stat().st_mtime_ns, default=None)
+
+    def _write(self, session_id: str, data: Dict[str, Any]) -> None:
+        self.sessions_dir.mkdir(parents=True, exist_ok=True)
+        compression = self.compression if is_finished(data) else None
+        path = self.sessions_dir / f"{session_id}{serializers.file_suffix(self.fmt, compression)}"
+        atomic_write_bytes(path, serializers.encode(data, self.fmt, compression))
+        # Drop the copy written under a previous format or codec
+        for old_path in self._paths(session_id):
+            if old_path != path:
+                old_path.unlink(missing_ok=True)
+
+    def save(self, session_id: str, data: Dict[str, Any],
+             expected_version: Optional[int] = None,
+             new_version: Optional[int] = None) -> None:
+        with self._locks.lock(session_id):
+            version = self.load(session_id).get("version", 0)
+            check_version(session_id, expected_version, version)
+            self._write(session_id, {**data, "version": new_version or version + 1})
+
+    def load(self, session_id: str) -> Dict[str, Any]:
+        file_path = self._path(session_id)
+        if file_path is None:
+            return {}
+        return serializers.decode(file_path.read_bytes())
+
+    def append(
+        self,
+        session_id: str,
+        entries: Dict[str, List[Dict[str, Any]]],
+        updates: Optional[Dict[str, Any]] = None,
+        expected_version: Optional[int] = None,
+        new_version: Optional[int] = None
+    ) -> bool:
+        with self._locks.lock(session_id):
+            data = self.load(session_id)
+            if not data:
+                return False
+            version = data.get("version", 0)
+            check_version(session_id, expected_version, version)
+            for collection, new_entries in entries.items():
+                data.setdefault(collection, []).extend(new_entries)
+            data.update(updates or {})
+            data["version"] = new_version or version + 1
+            self._write(session_id, data)
+        return True
+
+    def list_sessions(self) -> List[Dict[str, Any]]:
+        if not self.sessions_dir.exists():
+            return []
+        sessions: Dict[str, Dict[str, Any]] = {}
+        for suffix in serializers.file_suffixes():
+            for path in self.sessions_dir.glob(f"*{suffix}"):
+                session_id = path.name[:-len(suffix)]
+                if "." in session_id:
+                    # A longer suffix ending in this one, e.g. ".json.gz" for ".gz"
+                    continue
+                updated_at = datetime.fromtimestamp(path.stat().st_mtime)
+                if session_id not in sessions or updated_at > sessions[session_id]["updated_at"]:
+                    sessions[session_id] = {
+                        "session_id": session_id,
+                        "session_status": None,
+                        "updated_at": updated_at,
+                    }
+        return list(sessions.values())
+
+    def delete(self, session_id: str) -> None:
+        with self._locks.lock(session_id):
+            for path in self._paths(session_id):
+                path.unlink(missing_ok=True)
+
+
+class EventLogSessionStore(SessionStore):
+    """
+    Event-sourced storage: an append-only JSONL log per session plus snapshots.
+
+    Every change appends one compact record to the session's current log, so
+    writes cost the same however long the session is. A snapshot of the full
+    document is taken every `snapshot_every` records and loading replays only
+    the records after it. Compaction starts a new log generation from a fresh
+    snapshot and moves the old records to the session's audit log, which keeps
+    the complete history of changes.
+
+    Layout per session, with the snapshot suffix following its encoding::
+
+        <sessions_dir>/<session_id>/snapshot.json
+        <sessions_dir>/<session_id>/log.<generation>.jsonl
+        <sessions_dir>/<session_id>/audit.jsonl
+    """
+
+    def __init__(self, sessions_dir: Path, snapshot_every: int = 50,
+                 compact_after: int = 500, fmt: str = serializers.JSON,
+                 compression: Optional[str] = None):
+        """
+        Args:
+            sessions_dir: Directory holding one subdirectory per session
+            snapshot_every: Records appended between snapshots
+            compact_after: Records in one log generation before it is compacted
+            fmt: Snapshot payload format, serializers.JSON or serializers.MSGPACK
+            compression: Codec for snapshots of finished sessions; None leaves them uncompressed
+        """
+        self.sessions_dir = Path(sessions_dir)
+        self.fmt = fmt
+        self.compression = compression
+        self.snapshot_every = snapshot_every
+        self.compact_after = compact_after
+        self._lock = threading.RLock()
+        # session_id -> [generation, records in generation, records since snapshot, version]
+        self._logs: Dict[str, List[int]] = {}
+
+    def _dir(self, session_id: str) -> Path:
+        return self.sessions_dir / session_id
+
+    def _log_path(self, session_id: str, generation: int) -> Path:
+        return self._dir(session_id) / f"log.{generation}.jsonl"
+
+    def _snapshot_paths(self, session_id: str) -> List[Path]:
+        return [self._dir(session_id) / f"snapshot{suffix}"
+                for suffix in serializers.file_suffixes()]
+
+    def _read_snapshot(self, session_id: str) -> Dict[str, Any]:
+        existing = [path for path in self._snapshot_paths(session_id) if path.exists()]
+        if not existing:
+            return {"generation": 0, "offset": 0, "records": 0, "data": {}}
+        path = max(existing, key=lambda path: path.stat().st_mtime_ns)
+        return serializers.decode(path.read_bytes())
+
+    def _write_snapshot(self, session_id: str, snapshot: Dict[str, Any]) -> None:
+        compression = self.compression if is_finished(snapshot["data"]) else None
+        path = self._dir(session_id) / f"snapshot{serializers.file_suffix(self.fmt, compression)}"
+        atomic_write_bytes(path, serializers.encode(snapshot, self.fmt, compression))
+        for old_path in self._snapshot_paths(session_id):
+            if old_path != path:
+                old_path.unlink(missing_ok=True)
+
+    def _write_record(self, session_id: str, record: Dict[str, Any],
+                      new_version: Optional[int] = None) -> None:
+        state = self._logs[session_id]
+        state[3] = new_version or state[3] + 1
+        record["version"] = state[3]
+        record["ts"] = datetime.now().isoformat()
+        with open(self._log_path(session_id, state[0]), 'ab') as f:
+            f.write(serializers.dumps_json(record) + b"\n")
+        state[1] += 1
+        state[2] += 1
+        if state[1] >= self.compact_after:
+            self.compact(session_id)
+        elif state[2] >= self.snapshot_every:
+            self.snapshot(session_id)
+
+    @staticmethod
+    def _apply(data: Dict[str, Any], record: Dict[str, Any]) -> Dict[str, Any]:
+        if record["op"] == "save":
+            data = dict(record["data"])
+        else:
+            for collection, new_entries in record.get("entries", {}).items():
+                data.setdefault(collection, []).extend(new_entries)
+            data.update(record.get("updates", {}))
+        data["version"] = record["version"]
+        return data
+
+    def _replay(self, session_id: str) -> Dict[str, Any]:
+        """Rebuilds the document and refreshes the cached log position."""
+        snapshot = self._read_snapshot(session_id)
+        data = snapshot["data"]
+        generation = snapshot["generation"]
+        replayed = 0
+        log_path = self._log_path(session_id, generation)
+        if log_path.exists():
+            with open(log_path, 'rb') as f:
+                f.seek(snapshot["offset"])
+                for line in f:
+                    if line.strip():
+                        data = self._apply(data, serializers.loads_json(line))
+                        replayed += 1
+        self._logs[session_id] = [
+            generation, snapshot["records"] + replayed, replayed, data.get("version", 0)]
+        return data
+
+    def save(self, session_id: str, data: Dict[str, Any],
+             expected_version: Optional[int] = None,
+             new_version: Optional[int] = None) -> None:
+        with self._lock:
+            if session_id not in self._logs:
+                self._dir(session_id).mkdir(parents=True, exist_ok=True)
+                self._replay(session_id)
+            check_version(session_id, expected_version, self._logs[session_id][3])
+            self._write_record(session_id, {"op": "save", "data": data}, new_version)
+
+    def load(self, session_id: str) -> Dict[str, Any]:
+        with self._lock:
+            if not self._dir(session_id).exists():
+                return {}
+            return self._replay(session_id)
+
+    def append(
+        self,
+        session_id: str,
+        entries: Dict[str, List[Dict[str, Any]]],
+        updates: Optional[Dict[str, Any]] = None,
+        expected_version: Optional[int] = None,
+        new_version: Optional[int] = None
+    ) -> bool:
+        with self._lock:
+            if session_id not in self._logs:
+                if not self._dir(session_id).exists():
+                    return False
+                self._replay(session_id)
+            check_version(session_id, expected_version, self._logs[session_id][3])
+            self._write_record(
+                session_id, {"op": "append", "entries": entries, "updates": updates or {}},
+                new_version)
+        return True
+
+    def snapshot(self, session_id: str) -> None:
+        """Records the current document so loading skips the records before it."""
+        with self._lock:
+            data = self._replay(session_id)
+            generation, records, _, version = self._logs[session_id]
+            log_path = self._log_path(session_id, generation)
+            offset = log_path.stat().st_size if log_path.exists() else 0
+            self._write_snapshot(session_id, {
+                "generation": generation,
+                "offset": offset,
+                "records": records,
+                "data": data,
+            })
+            self._logs[session_id] = [generation, records, 0, version]
+
+    def compact(self, session_id: Optional[str] = None) -> None:
+        """
+        Merges log records into a new snapshot and starts a new log generation.
+
+        The merged records are moved to the session's audit log. Without a
+        session_id every session in the store is compacted.
+        """
+        with self._lock:
+            if session_id is None:
+                if self.sessions_dir.exists():
+                    for session_dir in self.sessions_dir.iterdir():
+                        if session_dir.is_dir():
+                            self.compact(session_dir.name)
+                return
+
+            data = self._replay(session_id)
+            generation = self._logs[session_id][0]
+            # The new snapshot is written first, so a crash never loses records
+            self._write_snapshot(session_id, {
+                "generation": generation + 1,
+                "offset": 0,
+                "records": 0,
+                "data": data,
+            })
+            self._logs[session_id] = [generation + 1, 0, 0, data.get("version", 0)]
+
+            old_log = self._log_path(session_id, generation)
+            if old_log.exists():
+                with open(old_log, 'r') as src, \
+                        open(self._dir(session_id) / "audit.jsonl", 'a') as audit:
+                    for line in src:
+                        audit.write(line)
+                old_log.unlink()
+
+    def list_sessions(self) -> List[Dict[str, Any]]:
+        if not self.sessions_dir.exists():
+            return []
+        sessions = []
+        for session_dir in self.sessions_dir.iterdir():
+            mtimes = [path.stat().st_mtime for path in session_dir.iterdir()
+                      if path.name != "audit.jsonl"] if session_dir.is_dir() else []
+            if mtimes:
+                sessions.append({
+                    "session_id": session_dir.name,
+                    "session_status": None,
+                    "updated_at": datetime.fromtimestamp(max(mtimes)),
+                })
+        return sessions
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._logs.pop(session_id, None)
+            shutil.rmtree(self._dir(session_id), ignore_errors=True)
+
+
+class SqliteSessionStore(SessionStore):
+    """
+    Normalized SQLite storage with one row per session and per collection entry.
+
+    Each collection lives in its own table keyed by session_id and
+    question_number. Entries keep their full content in a JSON `data` column,
+    so documents round-trip unchanged while lookups use the indexed columns.
+    The database runs in WAL mode so reads do not block the writer.
+
+    Rows are always stored as JSON columns: the session format and
+    compression settings do not apply, since compressed rows could no longer
+    be queried or appended to. Finished sessions are compressed when they
+    are archived.
+    """
+
+    # Collection name -> table name
+    TABLES = {
+        "questions_asked": "questions",
+        "answers_given": "answers",
+        "scores": "scores",
+        "feedback_given": "feedback",
+        "progress_saves": "progress_saves",
+    }
+
+    def __init__(self, db_path: Path, legacy_dir: Optional[Path] = None):
+        """
+        Args:
+            db_path: SQLite database file, created if missing
+            legacy_dir: Directory of JSON session files imported on first access
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._legacy = JsonFileSessionStore(legacy_dir) if legacy_dir else None
+
+        self.engine = create_engine(
+            f"sqlite:///{self.db_path}",
+            connect_args={"check_same_thread": False},
+            json_serializer=lambda obj: serializers.dumps_json(obj).decode(),
+            json_deserializer=serializers.loads_json,
+        )
+        event.listen(self.engine, "connect", self._configure_connection)
+
+        self.metadata = MetaData()
+        self.sessions = Table(
+            "sessions", self.metadata,
+            Column("session_id", String, primary_key=True),
+            Column("interview_type", String),
+            Column("role", String),
+            Column("difficulty_level", String),
+            Column("company", String),
+            Column("focus_areas", JSON),
+            Column("session_duration", Integer),
+            Column("start_time", String),
+            Column("current_question", Integer, nullable=False, default=0),
+            Column("session_status", String, index=True),
+            Column("attributes", JSON, nullable=False, default=dict),
+            Column("version", Integer, nullable=False, default=0),
+            Column("updated_at", String),
+        )
+        self.entry_tables = {
+            collection: self._entry_table(name)
+            for collection, name in self.TABLES.items()
+        }
+        self.metadata.create_all(self.engine)
+        self._migrate()
+
+    def _migrate(self) -> None:
+        columns = {column["name"] for column in inspect(self.engine).get_columns("sessions")}
+        if "version" not in columns:
+            with self.engine.begin() as conn:
+                conn.execute(text(
+                    "ALTER TABLE sessions ADD COLUMN version INTEGER NOT NULL DEFAULT 0"))
+
+    @staticmethod
+    def _configure_connection(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+    def _entry_table(self, name: str) -> Table:
+        return Table(
+            name, self.metadata,
+            Column("id", Integer, primary_key=True, autoincrement=True),
+            Column("session_id", String,
+                   ForeignKey("sessions.session_id", ondelete="CASCADE"),
+                   nullable=False),
+            Column("question_number", Integer),
+            Column("data", JSON, nullable=False),
+            Index(f"ix_{name}_session_question", "session_id", "question_number"),
+        )
+
+    def _session_row(self, session_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        row = {column: data.get(column) for column in SESSION_COLUMNS if column in data}
+        row["session_id"] = session_id
+        row["attributes"] = {
+            key: value for key, value in data.items()
+            if key not in SESSION_COLUMNS and key not in COLLECTIONS
+            and key not in ("session_id", "version")
+        }
+        row["updated_at"] = datetime.now().isoformat()
+        return row
+
+    def _insert_entries(self, conn, session_id: str,
+                        entries: Dict[str, List[Dict[str, Any]]]) -> None:
+        for collection, new_entries in entries.items():
+            if not new_entries:
+                continue
+            conn.execute(self.entry_tables[collection].insert(), [
+                {
+                    "session_id": session_id,
+                    "question_number": entry.get("question_number"),
+                    "data": entry,
+                }
+                for entry in new_entries
+            ])
+
+    def _current_version(self, conn, session_id: str) -> int:
+        version = conn.execute(
+            select(self.sessions.c.version).where(self.sessions.c.session_id == session_id)
+        ).scalar_one_or_none()
+        return version or 0
+
+    def save(self, session_id: str, data: Dict[str, Any],
+             expected_version: Optional[int] = None,
+             new_version: Optional[int] = None) -> None:
+        row = self._session_row(session_id, data)
+        with self.engine.begin() as conn:
+            if expected_version:
+                # Compare-and-swap: only the writer that read this version succeeds
+                result = conn.execute(
+                    update(self.sessions)
+                    .where(self.sessions.c.session_id == session_id)
+                    .where(self.sessions.c.version == expected_version)
+                    .values(**row, version=new_version or expected_version + 1)
+                )
+                if result.rowcount == 0:
+                    check_version(session_id, expected_version,
+                                  self._current_version(conn, session_id))
+            else:
+                statement = sqlite_insert(self.sessions).values(**row, version=new_version or 1)
+                if expected_version is None:
+                    statement = statement.on_conflict_do_update(
+                        index_elements=["session_id"],
+                        set_={**{key: value for key, value in row.items()
+                                 if key != "session_id"},
+                              "version": new_version or self.sessions.c.version + 1},
+                    )
+                else:
+                    statement = statement.on_conflict_do_nothing()
+                result = conn.execute(statement)
+                if result.rowcount == 0:
+                    check_version(session_id, expected_version,
+                                  self._current_version(conn, session_id))
+            for collection, table in self.entry_tables.items():
+                conn.execute(delete(table).where(table.c.session_id == session_id))
+            self._insert_entries(conn, session_id, {
+                collection: data.get(collection) or [] for collection in COLLECTIONS
+            })
+
+    def load(self, session_id: str) -> Dict[str, Any]:
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                select(self.sessions).where(self.sessions.c.session_id == session_id)
+            ).mappings().first()
+            if row is None:
+                return self._import_legacy(session_id)
+
+            data = {"session_id": session_id}
+            data.update({column: row[column] for column in SESSION_COLUMNS
+                         if row[column] is not None})
+            data.update(row["attributes"] or {})
+            data["version"] = row["version"]
+            for collection, table in self.entry_tables.items():
+                data[collection] = list(conn.execute(
+                    select(table.c.data)
+                    .where(table.c.session_id == session_id)
+                    .order_by(table.c.id)
+                ).scalars())
+        return data
+
+    def append(
+        self,
+        session_id: str,
+        entries: Dict[str, List[Dict[str, Any]]],
+        updates: Optional[Dict[str, Any]] = None,
+        expected_version: Optional[int] = None,
+        new_version: Optional[int] = None
+    ) -> bool:
+        updates = {key: value for key, value in (updates or {}).items() if key != "version"}
+        with self.engine.begin() as conn:
+            values = {key: value for key, value in updates.items() if key in SESSION_COLUMNS}
+            values["updated_at"] = datetime.now().isoformat()
+            values["version"] = new_version or self.sessions.c.version + 1
+            statement = update(self.sessions).where(self.sessions.c.session_id == session_id)
+            if expected_version is not None:
+                statement = statement.where(self.sessions.c.version == expected_version)
+            result = conn.execute(statement.values(**values))
+            if result.rowcount == 0:
+                version = conn.execute(
+                    select(self.sessions.c.version)
+                    .where(self.sessions.c.session_id == session_id)
+                ).scalar_one_or_none()
+                if version is None:
+                    return False
+                check_version(session_id, expected_version, version)
+
+            extra = {key: value for key, value in updates.items() if key not in SESSION_COLUMNS}
+            if extra:
+                attributes = conn.execute(
+                    select(self.sessions.c.attributes)
+                    .where(self.sessions.c.session_id == session_id)
+                ).scalar_one() or {}
+                conn.execute(
+                    update(self.sessions)
+                    .where(self.sessions.c.session_id == session_id)
+                    .values(attributes={**attributes, **extra})
+                )
+
+            self._insert_entries(conn, session_id, entries)
+        return True
+
+    def list_sessions(self) -> List[Dict[str, Any]]:
+        with self.engine.connect() as conn:
+            rows = conn.execute(select(
+                self.sessions.c.session_id,
+                self.sessions.c.session_status,
+                self.sessions.c.updated_at,
+            )).all()
+        return [
+            {
+                "session_id": session_id,
+                "session_status": status,
+                "updated_at": datetime.fromisoformat(updated_at) if updated_at else datetime.min,
+            }
+            for session_id, status, updated_at in rows
+        ]
+
+    def delete(self, session_id: str) -> None:
+        with self.engine.begin() as conn:
+            for table in self.entry_tables.values():
+                conn.execute(delete(table).where(table.c.session_id == session_id))
+            conn.execute(delete(self.sessions).where(self.sessions.c.session_id == session_id))
+
+    def close(self) -> None:
+        self.engine.dispose()
+
+    def _import_legacy(self, session_id: str) -> Dict[str, Any]:
+        if self._legacy is None:
+            return {}
+        data = self._legacy.load(session_id)
+        if not data:
+            return {}
+        self.save(session_id, data)
+        # Reload so the caller sees the version the import was stored at
+        return self.load(session_id)
+
+
+class CachedSessionStore(SessionStore):
+    """
+    Write-behind, LRU-bounded cache in front of another session store.
+
+    Reads are served from memory once a session has been loaded. Changes are
+    applied to the cached document at once and buffered, then written to the
+    backing store by a background thread every `flush_interval` seconds, when
+    the session leaves the "active" status, or on close(). Buffered appends
+    are replayed as appends, so the backing store still only inserts new rows.
+    Versions are assigned here, one per change, and written through with the
+    buffered changes, so a session reloaded after eviction or a restart has
+    the version its readers last saw.
+    """
+
+    def __init__(self, backing: SessionStore, max_sessions: int = 256,
+                 flush_interval: float = 1.0):
+        """
+        Args:
+            backing: Store the cached sessions are read from and written to
+            max_sessions: Number of sessions kept in memory
+            flush_interval: Seconds between background flushes; 0 disables the thread
+        """
+        self.backing = backing
+        self.max_sessions = max_sessions
+        self.flush_interval = flush_interval
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        # Least recently used first
+        self._documents: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # session_id -> {"save": bool, "entries": {collection: [...]}, "updates": {...}}
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        # Sessions whose changes are being written by flush()
+        self._flushing: set = set()
+        self._closed = threading.Event()
+        self._flusher = None
+        if flush_interval > 0:
+            self._flusher = threading.Thread(
+                target=self._run_flusher, name="session-store-flush", daemon=True)
+            self._flusher.start()
+
+    def save(self, session_id: str, data: Dict[str, Any],
+             expected_version: Optional[int] = None,
+             new_version: Optional[int] = None) -> None:
+        with self._lock:
+            current = self._documents.get(session_id)
+            if current is None and (expected_version is not None or new_version is None):
+                # Number on from the stored version, not from 0
+                current = self.load(session_id)
+            version = current.get("version", 0) if current else 0
+            check_version(session_id, expected_version, version)
+            self._documents[session_id] = {
+                **copy.deepcopy(data), "version": new_version or version + 1}
+            self._documents.move_to_end(session_id)
+            # A full save supersedes anything buffered before it
+            self._pending[session_id] = {"save": True, "entries": {}, "updates": {}}
+            self._evict()
+        self._flush_if_finished(session_id, data)
+
+    def load(self, session_id: str) -> Dict[str, Any]:
+        with self._lock:
+            document = self._documents.get(session_id)
+            if document is not None:
+                self._documents.move_to_end(session_id)
+                return copy.deepcopy(document)
+
+        data = self.backing.load(session_id)
+        if data:
+            with self._lock:
+                # Another thread may have cached a newer version meanwhile
+                if session_id not in self._documents:
+                    self._documents[session_id] = copy.deepcopy(data)
+                    self._evict()
+        return data
+
+    def append(
+        self,
+        session_id: str,
+        entries: Dict[str, List[Dict[str, Any]]],
+        updates: Optional[Dict[str, Any]] = None,
+        expected_version: Optional[int] = None,
+        new_version: Optional[int] = None
+    ) -> bool:
+        updates = {key: value for key, value in (updates or {}).items() if key != "version"}
+        with self._lock:
+            if session_id not in self._documents and not self.load(session_id):
+                return False
+            document = self._documents[session_id]
+            check_version(session_id, expected_version, document.get("version", 0))
+            document["version"] = new_version or document.get("version", 0) + 1
+            self._documents.move_to_end(session_id)
+            pending = self._pending.setdefault(
+                session_id, {"save": False, "entries": {}, "updates": {}})
+            for collection, new_entries in entries.items():
+                new_entries = copy.deepcopy(new_entries)
+                document.setdefault(collection, []).extend(new_entries)
+                pending["entries"].setdefault(collection, []).extend(new_entries)
+            document.update(copy.deepcopy(updates))
+            pending["updates"].update(copy.deepcopy(updates))
+        self._flush_if_finished(session_id, updates)
+        return True
+
+    def flush(self, session_id: Optional[str] = None) -> None:
+        with self._flush_lock:
+            with self._lock:
+                if session_id is None:
+                    batch, self._pending = self._pending, {}
+                elif session_id in self._pending:
+                    batch = {session_id: self._pending.pop(session_id)}
+                else:
+                    batch = {}
+                documents = {sid: copy.deepcopy(self._documents[sid])
+                             for sid, pending in batch.items() if pending["save"]}
+                # The version of each cached document covers exactly its batched changes
+                versions = {sid: self._documents[sid].get("version") for sid in batch}
+                self._flushing.update(batch)
+
+            for sid, pending in batch.items():
+                try:
+                    if pending["save"]:
+                        # The cached document already includes later appends
+                        self.backing.save(sid, documents[sid], new_version=versions[sid])
+                    else:
+                        self.backing.append(sid, pending["entries"], pending["updates"],
+                                            new_version=versions[sid])
+                except Exception as e:
+                    print(f"Error flushing session data for {sid}: {e}")
+                    self._requeue(sid, pending)
+
+            with self._lock:
+                self._flushing.difference_update(batch)
+                self._evict()
+
+    def list_sessions(self) -> List[Dict[str, Any]]:
+        self.flush()
+        return self.backing.list_sessions()
+
+    def delete(self, session_id: str) -> None:
+        # Hold the flush lock so an in-flight flush cannot write the session back
+        with self._flush_lock:
+            with self._lock:
+                self._documents.pop(session_id, None)
+                self._pending.pop(session_id, None)
+            self.backing.delete(session_id)
+
+    def close(self) -> None:
+        self._closed.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        self.flush()
+        self.backing.close()
+
+    def _requeue(self, session_id: str, pending: Dict[str, Any]) -> None:
+        with self._lock:
+            newer = self._pending.get(session_id)
+            if newer is None:
+                self._pending[session_id] = pending
+            elif not newer["save"]:
+                # Keep the failed changes ahead of the ones buffered since
+                for collection, new_entries in newer["entries"].items():
+                    pending["entries"].setdefault(collection, []).extend(new_entries)
+                pending["updates"].update(newer["updates"])
+                self._pending[session_id] = pending
+
+    def _flush_if_finished(self, session_id: str, changes: Dict[str, Any]) -> None:
+        if changes.get("session_status", "active") != "active":
+            self.flush(session_id)
+
+    def _evict(self) -> None:
+        # Sessions with buffered changes stay cached until they are flushed
+        excess = len(self._documents) - self.max_sessions
+        if excess <= 0:
+            return
+        for session_id in list(self._documents):
+            if excess <= 0:
+                break
+            if session_id not in self._pending and session_id not in self._flushing:
+                del self._documents[session_id]
+                excess -= 1
+
+    def _run_flusher(self) -> None:
+        while not self._closed.wait(self.flush_interval):
+            self.flush()
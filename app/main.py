@@ -2,19 +2,42 @@ import asyncio
 import base64
 import json
 import os
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import AsyncIterable
 
-from fastapi import FastAPI, Query, WebSocket
+from fastapi import FastAPI, Query, WebSocket, WebSocketDisconnect
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 from google.adk.agents import LiveRequestQueue
-from google.adk.agents.run_config import RunConfig
 from google.adk.events.event import Event
-from google.adk.runners import Runner
-from google.adk.sessions.in_memory_session_service import InMemorySessionService
 from google.genai import types
 from app.agent import root_agent
+from app.config import streaming_config
+from app.core.admission import AdmissionController, AdmissionRejected
+from app.core.live_session import (
+    LiveSession,
+    LiveSessionClosed,
+    LiveSessionRegistry,
+)
+from app.core.outbound_queue import OutboundQueue
+from app.core.session_manager import SessionEvictor, SessionManager
+from app.core.session_service import (
+    MEMORY_BACKEND,
+    build_session_service,
+    close_session_service,
+    prepare_session_service,
+)
+from app.core.stream_logging import (
+    SessionLog,
+    start_stream_logging,
+    stop_stream_logging,
+)
+from app.core.ws_protocol import (
+    audio_frame_bytes,
+    decode_frame,
+    negotiate_audio_frame_ms,
+)
 
 #
 # ADK Streaming
@@ -24,133 +47,183 @@ from app.agent import root_agent
 # load_dotenv()
 
 APP_NAME = "Job Interview Roleplay Agent"
-session_service = InMemorySessionService()
+
+# In-memory or database-backed, as selected by the streaming configuration
+session_service = build_session_service(streaming_config)
+persistent_sessions = streaming_config.session_service_backend != MEMORY_BACKEND
+
+# Bounds how long and how much ended-session history stays in memory;
+# a database-backed service keeps ended sessions in the database instead
+session_evictor = None if persistent_sessions else SessionEvictor(
+    session_service,
+    idle_ttl=streaming_config.session_idle_ttl_s,
+    memory_budget_bytes=streaming_config.session_memory_budget_mb * 1024 * 1024,
+    spill_dir=Path(streaming_config.session_spill_dir)
+    if streaming_config.session_spill_dir else None,
+    spill_ttl=streaming_config.session_spill_ttl_s,
+)
+
+# One Runner and RunConfig set shared by all connections
+session_manager = SessionManager(
+    APP_NAME,
+    root_agent,
+    session_service,
+    evictor=session_evictor,
+    retain_sessions=persistent_sessions,
+)
+
+# Live streams kept alive across reconnects, keyed by client session id
+live_sessions = LiveSessionRegistry()
+
+# Caps on concurrent live streams so admitted sessions keep stable latency
+admission = AdmissionController(
+    max_sessions=streaming_config.max_live_sessions,
+    max_sessions_per_client=streaming_config.max_live_sessions_per_client,
+    max_waiting=streaming_config.max_admission_queue,
+    retry_after=streaming_config.admission_retry_after_s,
+)
 
 
 async def start_agent_session(session_id, is_audio=False):
     """Starts an agent session"""
 
-    # Create a Session
-    session = await session_service.create_session(
-        app_name=APP_NAME,
-        user_id=session_id,
-        session_id=session_id,
-    )
-
-    # Create a Runner
-    runner = Runner(
-        app_name=APP_NAME,
-        agent=root_agent,
-        session_service=session_service,
-    )    # Set response modality
-    modality = "AUDIO" if is_audio else "TEXT"
-
-    # Create speech config with voice settings
-    speech_config = types.SpeechConfig(
-        voice_config=types.VoiceConfig(
-            # Puck, Charon, Kore, Fenrir, Aoede, Leda, Orus, and Zephyr
-            prebuilt_voice_config=types.PrebuiltVoiceConfig(voice_name="Aoede")
-        )
-    )
-
-    # Create run config with basic settings
-    config = {"response_modalities": [
-        modality], "speech_config": speech_config}
-
-    # Add output_audio_transcription when audio is enabled to get both audio and text
-    if is_audio:
-        config["output_audio_transcription"] = {}
-
-    run_config = RunConfig(**config)
+    # Reuse the client's session if it is still kept, or create one
+    session = await session_manager.acquire_session(
+        user_id=session_id, session_id=session_id)
 
     # Create a LiveRequestQueue for this session
     live_request_queue = LiveRequestQueue()
 
-    # Start agent session
-    live_events = runner.run_live(
+    # Start agent session with the shared Runner and cached RunConfig
+    live_events = session_manager.runner.run_live(
         session=session,
         live_request_queue=live_request_queue,
-        run_config=run_config,
+        run_config=session_manager.run_config(is_audio),
     )
-    return live_events, live_request_queue
+    return session, live_events, live_request_queue
+
+
+async def wait_for_admission(websocket: WebSocket, client_id: str, on_position):
+    """Waits for a live session slot, leaving the queue if the client disconnects"""
+    admitted = asyncio.create_task(
+        admission.acquire(client_id, on_position=on_position))
+    try:
+        while True:
+            received = asyncio.create_task(websocket.receive())
+            try:
+                await asyncio.wait(
+                    (admitted, received), return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                received.cancel()
+            disconnected = (
+                received.done() and not received.cancelled()
+                and received.result()["type"] == "websocket.disconnect")
+            if disconnected:
+                if admitted.done() and admitted.exception() is None:
+                    admission.release(client_id)
+                raise WebSocketDisconnect(received.result().get("code", 1000))
+            if admitted.done():
+                admitted.result()
+                return
+            # Anything else the client sends before the handshake is dropped
+    finally:
+        if not admitted.done():
+            admitted.cancel()
+            await asyncio.gather(admitted, return_exceptions=True)
+
+
+async def release_live_session(live_session: LiveSession):
+    """Frees what a closed live session held"""
+    live_sessions.remove(live_session)
+    admission.release(live_session.client_id)
+    await session_manager.release_session(live_session.session)
 
 
 async def agent_to_client_messaging(
-    websocket: WebSocket, live_events: AsyncIterable[Event | None]
+    live_session: LiveSession,
+    live_events: AsyncIterable[Event | None],
+    session_log: SessionLog,
 ):
     """Agent to client communication"""
     try:
-        while True:
-            async for event in live_events:
-                if event is None:
-                    continue
-
-                # If the turn complete or interrupted, send it
-                if event.turn_complete or event.interrupted:
-                    message = {
-                        "turn_complete": event.turn_complete,
-                        "interrupted": event.interrupted,
-                    }
-                    await websocket.send_text(json.dumps(message))
-                    print(f"[AGENT TO CLIENT]: {message}")
-                    continue
-
-                # Read the Content and its first Part
-                part = event.content and event.content.parts and event.content.parts[0]
-                if not part:
-                    continue
-
-                # Make sure we have a valid Part
-                if not isinstance(part, types.Part):
-                    continue
-
-                # Only send text if it's a partial response (streaming)
-                # Skip the final complete message to avoid duplication
-                if part.text and event.partial:
-                    message = {
-                        "mime_type": "text/plain",
-                        "data": part.text,
-                        "role": "model",
-                    }
-                    await websocket.send_text(json.dumps(message))
-                    print(f"[AGENT TO CLIENT]: text/plain: {part.text}")
-
-                # If it's audio, send Base64 encoded audio data
-                is_audio = (
-                    part.inline_data
-                    and part.inline_data.mime_type
-                    and part.inline_data.mime_type.startswith("audio/pcm")
-                )
-                if is_audio:
-                    audio_data = part.inline_data and part.inline_data.data
-                    if audio_data:
-                        message = {
-                            "mime_type": "audio/pcm",
-                            "data": base64.b64encode(audio_data).decode("ascii"),
-                            "role": "model",
-                        }
-                        await websocket.send_text(json.dumps(message))
-                        print(
-                            f"[AGENT TO CLIENT]: audio/pcm: {len(audio_data)} bytes.")
-    except Exception as e:
-        print(f"ERROR in agent_to_client_messaging: {e}")
-        # Optionally re-raise or handle as needed
+        async for event in live_events:
+            if event is None:
+                continue
+
+            # If the turn complete or interrupted, send it. Audio still
+            # queued after an interruption is stale, so drop it first.
+            if event.turn_complete or event.interrupted:
+                message = {
+                    "turn_complete": event.turn_complete,
+                    "interrupted": event.interrupted,
+                }
+                if event.interrupted:
+                    live_session.drop_audio()
+                live_session.put_control(message)
+                session_log.record("agent_control", **message)
+                continue
+
+            # Read the Content and its first Part
+            part = event.content and event.content.parts and event.content.parts[0]
+            if not part:
+                continue
+
+            # Make sure we have a valid Part
+            if not isinstance(part, types.Part):
+                continue
+
+            # Only send text if it's a partial response (streaming)
+            # Skip the final complete message to avoid duplication
+            if part.text and event.partial:
+                message = {
+                    "mime_type": "text/plain",
+                    "data": part.text,
+                    "role": "model",
+                }
+                live_session.put_text(message)
+                session_log.record(
+                    "agent_text", len(part.text), text=part.text[:80])
+
+            # If it's audio, send it; each connection encodes it as a
+            # binary frame or Base64 JSON depending on its handshake
+            is_audio = (
+                part.inline_data
+                and part.inline_data.mime_type
+                and part.inline_data.mime_type.startswith("audio/pcm")
+            )
+            if is_audio:
+                audio_data = part.inline_data and part.inline_data.data
+                if audio_data:
+                    live_session.put_audio(audio_data)
+                    session_log.record("agent_audio", len(audio_data))
+    except Exception:
+        session_log.error("agent_to_client_messaging failed")
         raise
 
 
 async def client_to_agent_messaging(
-    websocket: WebSocket, live_request_queue: LiveRequestQueue
+    websocket: WebSocket,
+    live_request_queue: LiveRequestQueue,
+    session_log: SessionLog,
+    max_audio_bytes: int | None = None,
 ):
     """Client to agent communication"""
     try:
         while True:
-            # Decode JSON message
-            message_json = await websocket.receive_text()
-            message = json.loads(message_json)
-            mime_type = message["mime_type"]
-            data = message["data"]
-            # Default to 'user' if role is not provided
-            role = message.get("role", "user")
+            # Binary frames carry raw audio, text frames carry JSON
+            received = await websocket.receive()
+            if received["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(received.get("code", 1000))
+
+            if received.get("bytes") is not None:
+                _, mime_type, _, data = decode_frame(received["bytes"])
+                role = "user"
+            else:
+                message = json.loads(received["text"])
+                mime_type = message["mime_type"]
+                data = message["data"]
+                # Default to 'user' if role is not provided
+                role = message.get("role", "user")
 
             # Send the message to the agent
             if mime_type == "text/plain":
@@ -158,24 +231,40 @@ async def client_to_agent_messaging(
                 content = types.Content(
                     role=role, parts=[types.Part.from_text(text=data)])
                 live_request_queue.send_content(content=content)
-                print(f"[CLIENT TO AGENT]: 123{data}")
+                session_log.record("client_text", len(data), text=data[:80])
             elif mime_type == "audio/pcm":
-                # Send audio data
-                decoded_data = base64.b64decode(data)
+                # Send audio data; binary frames are already raw PCM
+                decoded_data = data if isinstance(
+                    data, bytes) else base64.b64decode(data)
+
+                # Frames above the negotiated maximum, e.g. from a browser
+                # that ignored the requested sample rate, are split rather
+                # than rejected so the stream keeps going
+                chunk_size = len(decoded_data)
+                if max_audio_bytes and chunk_size > max_audio_bytes:
+                    if "client_oversized_audio" not in session_log.frames:
+                        session_log.info(
+                            "splitting oversized audio frames",
+                            size=chunk_size, max_bytes=max_audio_bytes)
+                    session_log.record("client_oversized_audio", chunk_size)
+                    chunk_size = max_audio_bytes
 
                 # Send the audio data - note that ActivityStart/End and transcription
                 # handling is done automatically by the ADK when input_audio_transcription
                 # is enabled in the config
-                live_request_queue.send_realtime(
-                    types.Blob(data=decoded_data, mime_type=mime_type)
-                )
-                print(f"[CLIENT TO AGENT]: audio/pcm: 123{len(decoded_data)} bytes")
+                for start in range(0, len(decoded_data), chunk_size or 1):
+                    chunk = decoded_data[start:start + chunk_size]
+                    live_request_queue.send_realtime(
+                        types.Blob(data=chunk, mime_type=mime_type)
+                    )
+                    session_log.record("client_audio", len(chunk))
 
             else:
                 raise ValueError(f"Mime type not supported: {mime_type}")
-    except Exception as e:
-        print(f"ERROR in client_to_agent_messaging: {e}")
-        # Optionally re-raise or handle as needed
+    except WebSocketDisconnect:
+        raise
+    except Exception:
+        session_log.error("client_to_agent_messaging failed")
         raise
 
 
@@ -183,7 +272,24 @@ async def client_to_agent_messaging(
 # FastAPI web app
 #
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Starts and stops process-wide background services"""
+    start_stream_logging()
+    await prepare_session_service(session_service)
+    eviction_task = None
+    if session_evictor is not None:
+        eviction_task = asyncio.create_task(
+            session_evictor.run(streaming_config.session_sweep_interval_s))
+    yield
+    if eviction_task is not None:
+        eviction_task.cancel()
+    await live_sessions.close_all("shutdown")
+    await close_session_service(session_service)
+    stop_stream_logging()
+
+
+app = FastAPI(lifespan=lifespan)
 
 STATIC_DIR = Path(__file__).parent / "static"
 app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
@@ -200,32 +306,154 @@ async def websocket_endpoint(
     websocket: WebSocket,
     session_id: str,
     is_audio: str = Query(...),
+    binary: str = Query("false"),
+    frame_ms: int | None = Query(None),
+    resume_from: int | None = Query(None),
 ):
     """Client websocket endpoint"""    # Wait for client connection
     await websocket.accept()
-    print(f"Interview Client #{session_id} connected, audio mode: {is_audio}")
+    # Session ids are chosen by the client, so the optional per-client limit
+    # keys on the peer address instead
+    client_id = websocket.client.host if websocket.client else session_id
+    audio_mode = is_audio == "true"
+    binary_audio = binary == "true"
+    audio_frame_ms = negotiate_audio_frame_ms(
+        frame_ms,
+        streaming_config.preferred_audio_frame_ms,
+        streaming_config.min_audio_frame_ms,
+        streaming_config.max_audio_frame_ms,
+    )
+    max_audio_bytes = audio_frame_bytes(
+        streaming_config.max_audio_frame_ms, streaming_config.input_sample_rate)
+
+    # Reattach to a live stream still in its grace period if the modality matches
+    live_session = live_sessions.get(session_id)
+    resumed = live_session is not None and live_session.is_audio == audio_mode
+    if live_session is not None and not resumed:
+        live_session.close("modality_changed")
+        await live_session.wait_closed()
+
+    if resumed:
+        session_log = live_session.session_log
+    else:
+        session_log = SessionLog(
+            session_id,
+            sample_every={
+                "audio": streaming_config.audio_log_sample_every,
+                "text": streaming_config.text_log_sample_every,
+            },
+            buffer_size=streaming_config.session_log_buffer_size,
+        )
+    session_log.info(
+        "client connected", is_audio=is_audio, binary_audio=binary_audio,
+        resumed=resumed, resume_from=resume_from)
 
+    outbound = None
     try:
-        # Start agent session
-        live_events, live_request_queue = await start_agent_session(
-            session_id, is_audio == "true"
+        if not resumed:
+            # Wait for a free live session slot, reporting the queue position
+            async def send_position(position):
+                await websocket.send_text(json.dumps(
+                    {"admission": {"status": "queued", "position": position}}))
+
+            await wait_for_admission(websocket, client_id, send_position)
+            try:
+                # Start agent session
+                session, live_events, live_request_queue = await start_agent_session(
+                    session_id, audio_mode
+                )
+            except BaseException:
+                admission.release(client_id)
+                raise
+
+            live_session = LiveSession(
+                session_id,
+                client_id,
+                session,
+                live_events,
+                live_request_queue,
+                audio_mode,
+                session_log,
+                replay_size=streaming_config.resume_replay_buffer_size,
+                grace_period=streaming_config.resume_grace_period_s,
+            )
+            live_session.start(
+                agent_to_client_messaging(
+                    live_session, live_events, session_log),
+                on_close=release_live_session,
+            )
+            live_sessions.add(live_session)
+
+        # Outgoing messages go through a bounded queue drained by its own
+        # writer task, so a slow client cannot stall the live event stream
+        outbound = OutboundQueue(
+            websocket,
+            binary_audio=binary_audio,
+            high_water=streaming_config.outbound_high_water,
+            overflow_policy=streaming_config.outbound_overflow_policy,
+            text_window_ms=streaming_config.text_coalesce_window_ms,
+            text_window_bytes=streaming_config.text_coalesce_max_bytes,
         )
 
+        # Queue everything the client has not seen yet: missed messages when
+        # resuming, or anything produced since a new stream started
+        resume_point = resume_from if resumed and resume_from is not None else 0
+        replayed = live_session.attach(outbound, resume_point)
+        if resumed:
+            session_log.info("replayed missed messages", count=replayed)
+
+        # Tell the client which wire format and audio frame size to use, and
+        # where the message sequence resumes. Sent before the writer starts so
+        # it always precedes queued messages.
+        await websocket.send_text(json.dumps({"handshake": {
+            "binary_audio": binary_audio,
+            "audio_frame_ms": audio_frame_ms,
+            "min_audio_frame_ms": streaming_config.min_audio_frame_ms,
+            "max_audio_frame_ms": streaming_config.max_audio_frame_ms,
+            "resumed": resumed,
+            "seq": resume_point,
+        }}))
+
         # Start tasks
-        agent_to_client_task = asyncio.create_task(
-            agent_to_client_messaging(websocket, live_events)
-        )
+        outbound_writer_task = asyncio.create_task(outbound.run())
         client_to_agent_task = asyncio.create_task(
-            client_to_agent_messaging(websocket, live_request_queue)
+            client_to_agent_messaging(
+                websocket, live_session.live_request_queue, session_log, max_audio_bytes)
         )
-        await asyncio.gather(agent_to_client_task, client_to_agent_task)
-    except Exception as e:
-        print(f"ERROR in websocket_endpoint: {e}")
+
+        # Whichever side finishes first ends the connection: cancel its peer
+        # (both, if the endpoint itself is cancelled), then surface the first
+        # side's outcome
+        connection_tasks = (outbound_writer_task, client_to_agent_task)
+        try:
+            done, _ = await asyncio.wait(
+                connection_tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in connection_tasks:
+                task.cancel()
+        for task in done:
+            task.result()
+    except AdmissionRejected as e:
+        session_log.info("admission rejected", reason=e.reason)
+        await websocket.send_text(json.dumps({"admission": {
+            "status": "rejected",
+            "reason": e.reason,
+            "retry_after": e.retry_after,
+        }}))
+        # 1013: Try Again Later
+        await websocket.close(code=1013)
+    except (WebSocketDisconnect, LiveSessionClosed):
+        pass
+    except Exception:
+        session_log.error("websocket_endpoint failed")
     finally:
-        # Disconnected
-        print(f"Interview Client #{session_id} disconnected")
+        # Keep the live stream around for a reconnect within the grace period
+        if live_session is not None and outbound is not None:
+            live_session.detach(outbound)
+        # Disconnected: one summary line instead of a line per frame
+        session_log.info("client disconnected", **session_log.summary())
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="localhost:", port=8000) 
\ No newline at end of file
+    uvicorn.run(app, host="localhost:", port=8000)
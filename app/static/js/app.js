@@ -12,6 +12,17 @@ const ws_url = "ws://" + window.location.host + "/ws/" + sessionId;
 let websocket = null;
 let is_audio = false;
 let currentMessageId = null; // Track the current message ID during a conversation turn
+let binaryAudio = false; // Set by the server handshake when binary audio frames are enabled
+let audioSequence = 0; // Sequence number for outgoing binary audio frames
+let audioFrameMs = 40; // Microphone frame duration, confirmed by the server handshake
+let lastSeq = null; // Sequence number of the last server message, used to resume
+let reconnectDelay = 250; // Backoff for reconnect attempts, in ms
+
+// Binary frame header: direction (uint8), mime code (uint8), sequence (uint32)
+// Must match app/core/ws_protocol.py
+const FRAME_HEADER_SIZE = 6;
+const DIRECTION_CLIENT_TO_AGENT = 0;
+const MIME_AUDIO_PCM = 1;
 
 // Get DOM elements
 const messageForm = document.getElementById("messageForm");
@@ -27,8 +38,17 @@ const recordingContainer = document.getElementById("recording-container");
 // WebSocket handlers
 function connectWebsocket() {
   // Connect websocket
-  const wsUrl = ws_url + "?is_audio=" + is_audio;
+  const wsUrl =
+    ws_url +
+    "?is_audio=" +
+    is_audio +
+    "&binary=true&frame_ms=" +
+    audioFrameMs +
+    (lastSeq !== null ? "&resume_from=" + lastSeq : "");
   websocket = new WebSocket(wsUrl);
+  websocket.binaryType = "arraybuffer";
+  binaryAudio = false;
+  audioSequence = 0;
 
   // Handle connection open
   websocket.onopen = function () {
@@ -36,6 +56,7 @@ function connectWebsocket() {
     console.log("WebSocket connection opened.");
     connectionStatus.textContent = "Connected";
     statusDot.classList.add("connected");
+    reconnectDelay = 250;
 
     // Enable the Send button
     document.getElementById("sendButton").disabled = false;
@@ -44,9 +65,57 @@ function connectWebsocket() {
 
   // Handle incoming messages
   websocket.onmessage = function (event) {
+    // Binary frames carry raw audio/pcm after a fixed header
+    if (event.data instanceof ArrayBuffer) {
+      const header = new DataView(event.data, 0, FRAME_HEADER_SIZE);
+      lastSeq = header.getUint32(2);
+      if (header.getUint8(1) === MIME_AUDIO_PCM && audioPlayerNode) {
+        typingIndicator.classList.add("visible");
+        audioPlayerNode.port.postMessage(event.data.slice(FRAME_HEADER_SIZE));
+      }
+      return;
+    }
+
     // Parse the incoming message
     const message_from_server = JSON.parse(event.data);
     console.log("[AGENT TO CLIENT] ", message_from_server);
+    if (message_from_server.seq !== undefined) {
+      lastSeq = message_from_server.seq;
+    }
+
+    // Admission updates arrive before the handshake while the server is busy
+    if (message_from_server.admission) {
+      const admission = message_from_server.admission;
+      if (admission.status === "queued") {
+        connectionStatus.textContent =
+          "Waiting for a free slot (position " + admission.position + ")";
+      } else if (admission.status === "rejected") {
+        connectionStatus.textContent =
+          "Server busy, retrying in " + admission.retry_after + "s";
+        reconnectDelay = admission.retry_after * 1000;
+      }
+      return;
+    }
+
+    // Handshake tells us which wire format to use for audio, and whether
+    // the server resumed our previous live session
+    if (message_from_server.handshake) {
+      connectionStatus.textContent = "Connected";
+      binaryAudio = message_from_server.handshake.binary_audio === true;
+      if (!message_from_server.handshake.resumed) {
+        lastSeq = message_from_server.handshake.seq;
+      }
+      if (message_from_server.handshake.audio_frame_ms) {
+        audioFrameMs = message_from_server.handshake.audio_frame_ms;
+        if (audioRecorderNode) {
+          audioRecorderNode.port.postMessage({
+            command: "configure",
+            frameDurationMs: audioFrameMs,
+          });
+        }
+      }
+      return;
+    }
 
     // Show typing indicator for first message in a response sequence,
     // but not for turn_complete messages
@@ -145,16 +214,20 @@ function connectWebsocket() {
   };
 
   // Handle connection close
-  websocket.onclose = function () {
+  websocket.onclose = function (event) {
     console.log("WebSocket connection closed.");
     document.getElementById("sendButton").disabled = true;
-    connectionStatus.textContent = "Disconnected. Reconnecting...";
+    // 1013 (Try Again Later) keeps the admission message on screen
+    if (event.code !== 1013) {
+      connectionStatus.textContent = "Disconnected. Reconnecting...";
+    }
     statusDot.classList.remove("connected");
     typingIndicator.classList.remove("visible");
     setTimeout(function () {
       console.log("Reconnecting...");
       connectWebsocket();
-    }, 5000);
+    }, reconnectDelay);
+    reconnectDelay = Math.min(reconnectDelay * 2, 5000);
   };
 
   websocket.onerror = function (e) {
@@ -236,7 +309,7 @@ function startAudio() {
     audioPlayerContext = ctx;
   });
   // Start audio input
-  startAudioRecorderWorklet(audioRecorderHandler).then(
+  startAudioRecorderWorklet(audioRecorderHandler, audioFrameMs).then(
     ([node, ctx, stream]) => {
       audioRecorderNode = node;
       audioRecorderContext = ctx;
@@ -297,8 +370,26 @@ stopAudioButton.addEventListener("click", () => {
   }
 });
 
+// Send a PCM chunk as a binary frame with the fixed header
+function sendAudioFrame(pcmData) {
+  if (websocket && websocket.readyState == WebSocket.OPEN) {
+    const frame = new Uint8Array(FRAME_HEADER_SIZE + pcmData.byteLength);
+    const header = new DataView(frame.buffer, 0, FRAME_HEADER_SIZE);
+    header.setUint8(0, DIRECTION_CLIENT_TO_AGENT);
+    header.setUint8(1, MIME_AUDIO_PCM);
+    header.setUint32(2, audioSequence);
+    audioSequence = (audioSequence + 1) >>> 0;
+    frame.set(new Uint8Array(pcmData), FRAME_HEADER_SIZE);
+    websocket.send(frame.buffer);
+  }
+}
+
 // Audio recorder handler
 function audioRecorderHandler(pcmData) {
+  if (binaryAudio) {
+    sendAudioFrame(pcmData);
+    return;
+  }
   const base64data = arrayBufferToBase64(pcmData);
   sendMessage({
     mime_type: "audio/pcm",
@@ -4,7 +4,10 @@
 
 let micStream;
 
-export async function startAudioRecorderWorklet(audioRecorderHandler) {
+export async function startAudioRecorderWorklet(
+  audioRecorderHandler,
+  frameDurationMs = 40
+) {
   // Create an AudioContext
   const audioRecorderContext = new AudioContext({ sampleRate: 16000 });
   console.log("AudioContext sample rate:", audioRecorderContext.sampleRate);
@@ -19,10 +22,12 @@ export async function startAudioRecorderWorklet(audioRecorderHandler) {
   });
   const source = audioRecorderContext.createMediaStreamSource(micStream);
 
-  // Create an AudioWorkletNode that uses the PCMProcessor
+  // Create an AudioWorkletNode that uses the PCMProcessor, batching
+  // samples into frames of frameDurationMs
   const audioRecorderNode = new AudioWorkletNode(
     audioRecorderContext,
-    "pcm-recorder-processor"
+    "pcm-recorder-processor",
+    { processorOptions: { frameDurationMs } }
   );
 
   // Connect the microphone source to the worklet.
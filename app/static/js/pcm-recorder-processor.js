@@ -1,15 +1,55 @@
 class PCMProcessor extends AudioWorkletProcessor {
-  constructor() {
+  constructor(options) {
     super();
+    // Batch render quanta (128 samples) into frames of frameDurationMs
+    const frameDurationMs =
+      (options.processorOptions && options.processorOptions.frameDurationMs) ||
+      40;
+    this.setFrameDuration(frameDurationMs);
+
+    this.port.onmessage = (event) => {
+      if (event.data.command === "configure") {
+        this.flush();
+        this.setFrameDuration(event.data.frameDurationMs);
+      }
+    };
+  }
+
+  setFrameDuration(frameDurationMs) {
+    // sampleRate is a global in the AudioWorkletGlobalScope
+    const frameSamples = Math.round((sampleRate * frameDurationMs) / 1000);
+    this.buffer = new Float32Array(frameSamples);
+    this.bufferLength = 0;
+  }
+
+  flush() {
+    if (this.bufferLength > 0) {
+      // Copy the filled part so the buffer can be reused
+      this.port.postMessage(this.buffer.slice(0, this.bufferLength));
+      this.bufferLength = 0;
+    }
   }
 
   process(inputs, outputs, parameters) {
     if (inputs.length > 0 && inputs[0].length > 0) {
       // Use the first channel
       const inputChannel = inputs[0][0];
-      // Copy the buffer to avoid issues with recycled memory
-      const inputCopy = new Float32Array(inputChannel);
-      this.port.postMessage(inputCopy);
+      let offset = 0;
+      while (offset < inputChannel.length) {
+        const count = Math.min(
+          inputChannel.length - offset,
+          this.buffer.length - this.bufferLength
+        );
+        this.buffer.set(
+          inputChannel.subarray(offset, offset + count),
+          this.bufferLength
+        );
+        this.bufferLength += count;
+        offset += count;
+        if (this.bufferLength === this.buffer.length) {
+          this.flush();
+        }
+      }
     }
     return true;
   }
@@ -0,0 +1,11 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Importing the interview utils opens the default session store and may start
+# the archiver; point them at a scratch directory and keep the thread off
+os.environ.setdefault("INTERVIEW_SESSIONS_DIR", tempfile.mkdtemp(prefix="interview-sessions-"))
+os.environ.setdefault("INTERVIEW_ARCHIVE_INTERVAL", "0")
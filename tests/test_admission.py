@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from app.core.admission import AdmissionController, AdmissionRejected
+
+
+def test_waiters_are_admitted_in_arrival_order():
+    async def scenario():
+        admission = AdmissionController(max_sessions=1, max_sessions_per_client=0, max_waiting=5)
+        await admission.acquire("a")
+        admitted = []
+        positions = {}
+
+        async def wait(client_id):
+            async def on_position(position):
+                positions.setdefault(client_id, []).append(position)
+            await admission.acquire(client_id, on_position)
+            admitted.append(client_id)
+
+        waiters = [asyncio.create_task(wait(client_id)) for client_id in ("b", "c", "d")]
+        await asyncio.sleep(0)
+        assert admission.waiting == 3
+        for holder in ("a", "b", "c"):
+            admission.release(holder)
+            await asyncio.sleep(0)
+        await asyncio.gather(*waiters)
+        return admitted, positions, admission
+
+    admitted, positions, admission = asyncio.run(scenario())
+    assert admitted == ["b", "c", "d"]
+    assert positions["d"] == [3, 2, 1]
+    assert admission.active == 1
+    assert admission.waiting == 0
+
+
+def test_full_queue_rejects():
+    async def scenario():
+        admission = AdmissionController(max_sessions=1, max_sessions_per_client=0, max_waiting=1,
+                                        retry_after=5)
+        await admission.acquire("a")
+        waiter = asyncio.create_task(admission.acquire("b"))
+        await asyncio.sleep(0)
+        try:
+            await admission.acquire("c")
+        finally:
+            waiter.cancel()
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        asyncio.run(scenario())
+    assert rejected.value.reason == "queue_full"
+    assert rejected.value.retry_after == 5
+
+
+def test_per_client_limit_counts_waiting_sessions():
+    async def scenario():
+        admission = AdmissionController(max_sessions=1, max_sessions_per_client=2, max_waiting=5)
+        await admission.acquire("a")
+        waiter = asyncio.create_task(admission.acquire("a"))
+        await asyncio.sleep(0)
+        try:
+            with pytest.raises(AdmissionRejected) as rejected:
+                await admission.acquire("a")
+            assert rejected.value.reason == "client_limit"
+            # Other clients are unaffected
+            other = asyncio.create_task(admission.acquire("b"))
+            await asyncio.sleep(0)
+            assert admission.waiting == 2
+        finally:
+            waiter.cancel()
+            other.cancel()
+            await asyncio.gather(waiter, other, return_exceptions=True)
+
+    asyncio.run(scenario())
+
+
+def test_zero_per_client_limit_disables_it():
+    async def scenario():
+        admission = AdmissionController(max_sessions=3, max_sessions_per_client=0, max_waiting=0)
+        for _ in range(3):
+            await admission.acquire("a")
+        return admission.active
+
+    assert asyncio.run(scenario()) == 3
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    async def scenario():
+        admission = AdmissionController(max_sessions=1, max_sessions_per_client=0, max_waiting=5)
+        await admission.acquire("a")
+        first = asyncio.create_task(admission.acquire("b"))
+        second = asyncio.create_task(admission.acquire("c"))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.gather(first, return_exceptions=True)
+        assert admission.waiting == 1
+
+        admission.release("a")
+        await second
+        return admission
+
+    admission = asyncio.run(scenario())
+    assert admission.active == 1
+    assert admission.waiting == 0
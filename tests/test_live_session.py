@@ -0,0 +1,144 @@
+import asyncio
+
+from google.adk.agents import LiveRequestQueue
+
+from app.core.live_session import LiveSession, LiveSessionClosed
+from app.core.outbound_queue import OutboundQueue
+from app.core.stream_logging import SessionLog
+
+
+class FakeWebSocket:
+    async def send_text(self, text):
+        pass
+
+    async def send_bytes(self, data):
+        pass
+
+
+async def no_events():
+    return
+    yield
+
+
+def make_session(replay_size=8, grace_period=0.05):
+    return LiveSession(
+        session_id="s1",
+        client_id="127.0.0.1",
+        session=None,
+        live_events=no_events(),
+        live_request_queue=LiveRequestQueue(),
+        is_audio=False,
+        session_log=SessionLog("s1", {}),
+        replay_size=replay_size,
+        grace_period=grace_period,
+    )
+
+
+def queued(outbound):
+    return [item[1] for item in outbound._items]
+
+
+def test_messages_are_numbered_and_forwarded():
+    async def scenario():
+        live = make_session()
+        outbound = OutboundQueue(FakeWebSocket())
+        live.attach(outbound)
+        live.put_control({"turn_complete": True})
+        live.put_audio(b"pcm")
+        return outbound
+
+    outbound = asyncio.run(scenario())
+    assert [message.get("seq") for message in queued(outbound)] == [1, 2]
+
+
+def test_resume_replays_only_missed_messages():
+    async def scenario():
+        live = make_session()
+        first = OutboundQueue(FakeWebSocket())
+        live.attach(first)
+        for i in range(5):
+            live.put_control({"n": i})
+        live.detach(first)
+
+        second = OutboundQueue(FakeWebSocket())
+        replayed = live.attach(second, resume_from=3)
+        live.put_control({"n": 5})
+        await asyncio.sleep(0.1)
+        return live, replayed, second
+
+    live, replayed, second = asyncio.run(scenario())
+    assert replayed == 2
+    assert [message["seq"] for message in queued(second)] == [4, 5, 6]
+    # Reattaching cancelled the grace period
+    assert not live.closed
+
+
+def test_grace_period_expires_without_a_client():
+    async def scenario():
+        live = make_session()
+        outbound = OutboundQueue(FakeWebSocket())
+        live.attach(outbound)
+        live.detach(outbound)
+        await asyncio.sleep(0.1)
+        await live.wait_closed()
+        return live
+
+    live = asyncio.run(scenario())
+    assert live.closed
+    assert live.close_reason == "grace_expired"
+
+
+def test_overflowing_replay_keeps_the_grace_period():
+    async def scenario():
+        live = make_session(replay_size=8)
+        first = OutboundQueue(FakeWebSocket())
+        live.attach(first)
+        for i in range(8):
+            live.put_control({"n": i})
+        live.detach(first)
+
+        small = OutboundQueue(FakeWebSocket(), high_water=2)
+        live.attach(small, resume_from=0)
+        failed = small.failed
+        await asyncio.sleep(0.1)
+        await live.wait_closed()
+        return live, failed
+
+    live, failed = asyncio.run(scenario())
+    assert failed
+    assert live.close_reason == "grace_expired"
+
+
+def test_close_fails_the_attached_connection():
+    async def scenario():
+        live = make_session()
+        outbound = OutboundQueue(FakeWebSocket())
+        live.attach(outbound)
+        live.close("stream_ended")
+        live.close("grace_expired")
+        await live.wait_closed()
+        try:
+            await outbound.run()
+        except LiveSessionClosed:
+            return live, True
+        return live, False
+
+    live, raised = asyncio.run(scenario())
+    assert raised
+    assert live.close_reason == "stream_ended"
+
+
+def test_interruption_drops_buffered_audio():
+    async def scenario():
+        live = make_session()
+        live.put_audio(b"a1")
+        live.put_text({"mime_type": "text/plain", "data": "hi", "role": "model"})
+        live.put_audio(b"a2")
+        live.drop_audio()
+
+        outbound = OutboundQueue(FakeWebSocket())
+        live.attach(outbound, resume_from=0)
+        return outbound
+
+    outbound = asyncio.run(scenario())
+    assert queued(outbound) == [{"mime_type": "text/plain", "data": "hi", "role": "model", "seq": 2}]
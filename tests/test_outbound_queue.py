@@ -0,0 +1,125 @@
+import asyncio
+import json
+
+import pytest
+
+from app.core.outbound_queue import (
+    OVERFLOW_DISCONNECT,
+    OutboundQueue,
+    SlowConsumerError,
+)
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_text(self, text):
+        self.sent.append(json.loads(text))
+
+    async def send_bytes(self, data):
+        self.sent.append(data)
+
+
+def text(data, role="model"):
+    return {"mime_type": "text/plain", "data": data, "role": role}
+
+
+def test_full_queue_drops_oldest_audio():
+    async def scenario():
+        queue = OutboundQueue(FakeWebSocket(), high_water=3)
+        queue.put_audio(b"a1", 1)
+        queue.put_control({"turn_complete": True})
+        queue.put_audio(b"a2", 3)
+        queue.put_audio(b"a3", 4)
+        return queue
+
+    queue = asyncio.run(scenario())
+    assert len(queue) == 3
+    assert queue.dropped_audio == 1
+    assert [item[1].get("seq") for item in queue._items] == [None, 3, 4]
+
+
+def test_full_queue_without_audio_raises():
+    async def scenario():
+        queue = OutboundQueue(FakeWebSocket(), high_water=2)
+        queue.put_control({"turn_complete": True})
+        queue.put_control({"interrupted": True})
+        queue.put_control({"turn_complete": True})
+
+    with pytest.raises(SlowConsumerError):
+        asyncio.run(scenario())
+
+
+def test_disconnect_policy_raises_at_high_water():
+    async def scenario():
+        queue = OutboundQueue(FakeWebSocket(), high_water=1, overflow_policy=OVERFLOW_DISCONNECT)
+        queue.put_audio(b"a1", 1)
+        queue.put_audio(b"a2", 2)
+
+    with pytest.raises(SlowConsumerError):
+        asyncio.run(scenario())
+
+
+def test_consecutive_text_from_one_role_is_merged():
+    async def scenario():
+        queue = OutboundQueue(FakeWebSocket())
+        queue.put_text({**text("Hel"), "seq": 1})
+        queue.put_text({**text("lo"), "seq": 2})
+        queue.put_text({**text("Hi", role="user"), "seq": 3})
+        return queue
+
+    queue = asyncio.run(scenario())
+    assert len(queue) == 2
+    assert queue.coalesced_text == 1
+    assert queue._items[0][1] == {**text("Hello"), "seq": 2}
+
+
+def test_writer_sends_in_order_and_drops_audio_on_interrupt():
+    async def scenario():
+        websocket = FakeWebSocket()
+        queue = OutboundQueue(websocket, text_window_ms=0)
+        queue.put_audio(b"a1", 1)
+        queue.put_audio(b"a2", 2)
+        assert queue.drop_audio() == 2
+        queue.put_control({"interrupted": True, "seq": 3})
+        queue.put_text({**text("ok"), "seq": 4})
+
+        writer = asyncio.create_task(queue.run())
+        while len(websocket.sent) < 2:
+            await asyncio.sleep(0)
+        queue.fail(ConnectionError("closed"))
+        with pytest.raises(ConnectionError):
+            await writer
+        return websocket.sent
+
+    sent = asyncio.run(scenario())
+    assert [message["seq"] for message in sent] == [3, 4]
+
+
+def test_text_after_the_first_is_held_to_coalesce():
+    async def scenario():
+        websocket = FakeWebSocket()
+        queue = OutboundQueue(websocket, text_window_ms=50)
+        writer = asyncio.create_task(queue.run())
+
+        # The first text of a turn goes out at once
+        queue.put_text({**text("a"), "seq": 1})
+        while not websocket.sent:
+            await asyncio.sleep(0)
+        queue.put_text({**text("b"), "seq": 2})
+        await asyncio.sleep(0.01)
+        queue.put_text({**text("c"), "seq": 3})
+        await asyncio.sleep(0.01)
+        held = len(websocket.sent)
+        # Any other message releases the held text
+        queue.put_control({"turn_complete": True, "seq": 4})
+        while len(websocket.sent) < 3:
+            await asyncio.sleep(0.001)
+        writer.cancel()
+        return held, websocket.sent
+
+    held, sent = asyncio.run(scenario())
+    assert held == 1
+    assert [message["data"] for message in sent[:2]] == ["a", "bc"]
+    assert sent[2]["turn_complete"] is True
@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from app.interview_agent.utils.question_bank import QuestionBank
+from app.interview_agent.utils.question_sampler import QuestionSampler
+
+SECTION = "behavioral_questions"
+
+
+def write_bank(path, count):
+    questions = [{"question": f"Question number {i}?"} for i in range(count)]
+    path.write_text(json.dumps({SECTION: {"leadership": questions}}))
+
+
+@pytest.fixture
+def bank_path(tmp_path):
+    path = tmp_path / "question_bank.json"
+    write_bank(path, 8)
+    return path
+
+
+def draw(sampler, bank, count):
+    return [sampler.next(bank, SECTION)["question"] for _ in range(count)]
+
+
+def test_same_seed_draws_same_order(bank_path):
+    bank = QuestionBank(bank_path)
+    assert draw(QuestionSampler("seed"), bank, 8) == draw(QuestionSampler("seed"), bank, 8)
+    assert draw(QuestionSampler("seed"), bank, 8) != draw(QuestionSampler("other"), bank, 8)
+
+
+def test_questions_never_repeat(bank_path):
+    bank = QuestionBank(bank_path)
+    sampler = QuestionSampler("seed")
+    drawn = draw(sampler, bank, 8)
+    assert len(set(drawn)) == 8
+    assert sampler.next(bank, SECTION) is None
+
+
+def test_restored_state_continues_the_order(bank_path):
+    bank = QuestionBank(bank_path)
+    expected = draw(QuestionSampler("seed"), bank, 6)
+
+    first = QuestionSampler("seed")
+    drawn = draw(first, bank, 3)
+    state = json.loads(json.dumps(first.to_dict()))
+    assert "order" not in state["buckets"][f"{SECTION}/*/*"]
+
+    # A new process loads the bank again and rebuilds the order from the state
+    restored = QuestionSampler("ignored", state)
+    drawn += draw(restored, QuestionBank(bank_path), 3)
+    assert drawn == expected
+
+
+def test_changed_bank_reshuffles_undrawn_questions(bank_path):
+    bank = QuestionBank(bank_path, check_interval=0)
+    sampler = QuestionSampler("seed")
+    drawn = draw(sampler, bank, 3)
+
+    write_bank(bank_path, 10)
+    assert bank.reload(force=True)
+    drawn += draw(sampler, bank, 7)
+    assert len(set(drawn)) == 10
+    assert sampler.next(bank, SECTION) is None
+
+
+def test_unchanged_reload_keeps_the_order(bank_path):
+    bank = QuestionBank(bank_path)
+    expected = draw(QuestionSampler("seed"), bank, 8)
+
+    sampler = QuestionSampler("seed")
+    drawn = draw(sampler, bank, 4)
+    assert bank.reload(force=True)
+    drawn += draw(sampler, bank, 4)
+    assert drawn == expected
+
+
+def test_state_with_stored_orders_is_still_readable(bank_path):
+    bank = QuestionBank(bank_path)
+    first = draw(QuestionSampler("seed"), bank, 2)
+    ids = [bank.find(text)["id"] for text in first]
+    state = {"seed": "seed", "drawn": ids,
+             "buckets": {f"{SECTION}/*/*": {"order": ids, "cursor": 2, "size": 8}}}
+
+    rest = draw(QuestionSampler("seed", state), bank, 6)
+    assert sorted(first + rest) == sorted(q["question"] for q in bank.questions(SECTION))
@@ -0,0 +1,69 @@
+import os
+import time
+from datetime import timedelta
+
+from app.interview_agent.utils import serializers
+from app.interview_agent.utils.session_archive import SessionArchive, SessionArchiver
+from app.interview_agent.utils.session_store import JsonFileSessionStore
+
+
+def make_archiver(tmp_path):
+    store = JsonFileSessionStore(tmp_path / "sessions")
+    archive = SessionArchive(tmp_path / "archive", compression=serializers.GZIP)
+    archiver = SessionArchiver(store, archive, completed_after=timedelta(hours=1))
+    return store, archive, archiver
+
+
+def age(store, session_id, seconds):
+    path = store._path(session_id)
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+def test_finished_sessions_are_archived(tmp_path):
+    store, archive, archiver = make_archiver(tmp_path)
+    store.save("done", {"session_id": "done", "session_status": "completed",
+                        "start_time": "2024-05-01T10:00:00"})
+    store.save("live", {"session_id": "live", "session_status": "active"})
+    age(store, "done", 2 * 3600)
+    age(store, "live", 2 * 3600)
+
+    assert archiver.run_once() == 1
+    assert store.load("done") == {}
+    assert store.load("live")["session_status"] == "active"
+    assert archive.contains("done")
+    assert (tmp_path / "archive" / "2024" / "05" / "2024-05-01.bundle").exists()
+    assert archive.load("done")["session_status"] == "completed"
+
+
+def test_rehydrate_restores_version_and_removes_entry(tmp_path):
+    store, archive, archiver = make_archiver(tmp_path)
+    store.save("s1", {"session_id": "s1", "session_status": "completed"})
+    store.append("s1", {"questions_asked": [{"question": "q1"}]})
+    age(store, "s1", 2 * 3600)
+    archiver.run_once()
+
+    data = archiver.rehydrate("s1")
+    assert data["version"] == 2
+    assert store.load("s1")["questions_asked"] == [{"question": "q1"}]
+    assert not archive.contains("s1")
+    # The removal survives reopening the index
+    assert not SessionArchive(tmp_path / "archive").contains("s1")
+
+
+def test_session_archived_again_has_one_entry(tmp_path):
+    store, archive, archiver = make_archiver(tmp_path)
+    store.save("s1", {"session_id": "s1", "session_status": "completed"})
+    age(store, "s1", 2 * 3600)
+    archiver.run_once()
+    archiver.rehydrate("s1")
+    age(store, "s1", 2 * 3600)
+    archiver.run_once()
+
+    entries = SessionArchive(tmp_path / "archive").entries()
+    assert [entry["session_id"] for entry in entries] == ["s1"]
+
+
+def test_rehydrate_unknown_session(tmp_path):
+    _, _, archiver = make_archiver(tmp_path)
+    assert archiver.rehydrate("missing") == {}
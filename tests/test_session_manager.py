@@ -0,0 +1,41 @@
+import asyncio
+
+from google.adk.sessions import InMemorySessionService
+
+from app.core.session_manager import SessionEvictor
+
+
+async def get(service, session_id="s1"):
+    return await service.get_session(app_name="app", user_id="u", session_id=session_id)
+
+
+def test_idle_sessions_are_spilled(tmp_path):
+    async def scenario():
+        service = InMemorySessionService()
+        evictor = SessionEvictor(service, idle_ttl=0, memory_budget_bytes=10**9, spill_dir=tmp_path)
+        session = await service.create_session(app_name="app", user_id="u", session_id="s1")
+        await evictor.mark_idle(session)
+        await evictor.evict_expired()
+        return await get(service)
+
+    assert asyncio.run(scenario()) is None
+    assert [path.name for path in tmp_path.iterdir()] == ["session-s1.json"]
+
+
+def test_session_reacquired_during_spill_is_kept(tmp_path):
+    async def scenario():
+        service = InMemorySessionService()
+        evictor = SessionEvictor(service, idle_ttl=0, memory_budget_bytes=10**9, spill_dir=tmp_path)
+        session = await service.create_session(app_name="app", user_id="u", session_id="s1")
+        await evictor.mark_idle(session)
+        eviction = asyncio.create_task(evictor.evict_expired())
+        # Let the eviction reach the spill write before the client comes back
+        for _ in range(3):
+            await asyncio.sleep(0)
+        assert ("app", "u", "s1") in evictor._evicting
+        evictor.mark_active("app", "u", "s1")
+        await eviction
+        return await get(service)
+
+    assert asyncio.run(scenario()) is not None
+    assert list(tmp_path.iterdir()) == []